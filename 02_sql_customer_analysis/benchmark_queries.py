@@ -0,0 +1,109 @@
+"""
+Customer Analytics Query Benchmark
+Times every query in analysis_queries.sql on generated databases of increasing size
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.build import BuildGraph
+from customer_db import build_database
+from customer_engine import CustomerGenerator
+from query_benchmark import compare, load_report, run_suite, write_report
+from sql_catalog import QUERIES_FILE, SCHEMA_FILE, load_queries
+
+DATA_DIR = Path('bench_data')
+
+parser = argparse.ArgumentParser(description="Benchmark analysis_queries.sql across data sizes")
+parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                    help="Order counts to benchmark (e.g. 1000 10000 100000 1000000 10000000)")
+parser.add_argument('--queries', nargs='+', default=None,
+                    help="Only these queries, by number (e.g. 9 12)")
+parser.add_argument('--repeat', type=int, default=10, help="Timed runs per query and size")
+parser.add_argument('--warmup', type=int, default=1, help="Untimed runs before timing")
+parser.add_argument('--max-seconds', type=float, default=30.0,
+                    help="Stop repeating a query once its runs add up to this many seconds")
+parser.add_argument('--seed', type=int, default=42, help="Random seed for the generated databases")
+parser.add_argument('--output', default='benchmark_report',
+                    help="Report stem: writes <stem>.json and <stem>.csv")
+parser.add_argument('--compare', default=None,
+                    help="Earlier report (.json or .csv) to check for regressions")
+parser.add_argument('--threshold', type=float, default=0.20,
+                    help="p50 slowdown (fraction) counted as a regression (default 0.20)")
+args = parser.parse_args()
+
+print("\n" + "="*70)
+print("CUSTOMER ANALYTICS - QUERY BENCHMARK")
+print("="*70 + "\n")
+
+queries = load_queries(QUERIES_FILE)
+if args.queries:
+    wanted = {f'Query {number}' for number in args.queries}
+    queries = [query for query in queries if query.name in wanted]
+print(f"✅ {len(queries)} queries from {QUERIES_FILE}")
+print(f"✅ Sizes: {', '.join(f'{size:,}' for size in args.sizes)} orders\n")
+
+# Generated databases are reused until the generator, schema or seed change
+DATA_DIR.mkdir(exist_ok=True)
+graph = BuildGraph(manifest=str(DATA_DIR / '.build_manifest.json'))
+generator_code = ['customer_engine.py', 'customer_db.py', 'revenue_cube.py', SCHEMA_FILE]
+databases = {}
+for size in args.sizes:
+    database = str(DATA_DIR / f'customers_{size}.db')
+    generator = CustomerGenerator(seed=args.seed, customers=max(1, size // 3), orders=size)
+    graph.build(database, lambda: build_database(generator, database, SCHEMA_FILE),
+                inputs=generator_code, params={'orders': size, 'seed': args.seed})
+    databases[size] = database
+for line in graph.report():
+    print(f"   {line}")
+print()
+
+print("="*70)
+print("RESULTS")
+print("="*70 + "\n")
+
+results = []
+for size, database in databases.items():
+    print(f"{size:,} orders")
+    print(f"   {'Query':<10} {'Runs':>5} {'p50 ms':>11} {'p95 ms':>11} {'Rows':>9} {'Scanned':>12} {'VM steps':>14}")
+    for row in run_suite(database, size, queries, args.repeat, args.warmup, args.max_seconds):
+        results.append(row)
+        print(f"   {row['query']:<10} {row['runs']:>5} {row['p50_ms']:>11.3f} {row['p95_ms']:>11.3f} "
+              f"{row['rows']:>9,} {row['rows_scanned']:>12,} {row['vm_steps']:>14,}")
+    print()
+
+settings = {'sizes': args.sizes, 'repeat': args.repeat, 'warmup': args.warmup,
+            'max_seconds': args.max_seconds, 'seed': args.seed}
+json_path, csv_path = write_report(args.output, results, settings)
+print(f"✅ Report: {json_path}, {csv_path}")
+
+# Growth per query between the smallest and largest size
+if len(args.sizes) > 1:
+    small, large = min(args.sizes), max(args.sizes)
+    print(f"\nScaling {small:,} -> {large:,} orders ({large / small:,.0f}x data):")
+    by_key = {(row['size'], row['query']): row for row in results}
+    for query in queries:
+        low, high = by_key[(small, query.name)], by_key[(large, query.name)]
+        growth = high['p50_ms'] / low['p50_ms'] if low['p50_ms'] else float('inf')
+        print(f"   {query.name:<10} {growth:>10,.1f}x  {query.title}")
+
+regressions = []
+if args.compare:
+    print(f"\nCompared with {args.compare} (regression: p50 > +{args.threshold:.0%}):")
+    for row, old, ratio, regressed in compare(load_report(args.compare), results, args.threshold):
+        flag = "❌ REGRESSION" if regressed else ""
+        print(f"   {row['size']:>10,} {row['query']:<10} {old['p50_ms']:>11.3f} -> {row['p50_ms']:>11.3f} ms "
+              f"{ratio:>6.2f}x {flag}")
+        if regressed:
+            regressions.append(row)
+
+print("\n" + "="*70)
+if regressions:
+    print(f"❌ {len(regressions)} REGRESSIONS")
+else:
+    print("✅ BENCHMARK COMPLETE!")
+print("="*70 + "\n")
+
+sys.exit(1 if regressions else 0)
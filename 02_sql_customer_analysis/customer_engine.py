@@ -0,0 +1,182 @@
+"""
+Customer Analytics Engine
+Vectorized, reproducible generator for customers, products, orders and order items
+"""
+
+import numpy as np
+
+START_DATE = np.datetime64('2023-01-01')
+END_DATE = np.datetime64('2024-12-31')
+
+SEGMENTS = {
+    # segment: (share of customers, relative order activity)
+    'Premium': (0.30, 2.5),
+    'Standard': (0.45, 1.0),
+    'Basic': (0.25, 0.6),
+}
+COUNTRIES = {'UK': 0.60, 'USA': 0.30, 'Canada': 0.10}
+STATUSES = {'Completed': 0.93, 'Cancelled': 0.05, 'Pending': 0.02}
+
+# The hand-written catalogue from database_setup.sql comes first
+CATALOGUE = [
+    ('Premium Subscription', 'Services', 99.99),
+    ('Basic Subscription', 'Services', 29.99),
+    ('Advanced Analytics', 'Tools', 149.99),
+    ('Data Export Tool', 'Tools', 49.99),
+    ('Custom Reports', 'Reports', 79.99),
+]
+CATEGORIES = ['Services', 'Tools', 'Reports']
+
+FIRST_NAMES = ['John', 'Sarah', 'Michael', 'Emma', 'David', 'Lisa', 'James', 'Sophie', 'Robert',
+               'Emily', 'Oliver', 'Amelia', 'Harry', 'Isla', 'Jack', 'Ava', 'George', 'Mia']
+LAST_NAMES = ['Smith', 'Johnson', 'Brown', 'Wilson', 'Lee', 'Taylor', 'Anderson', 'Martin',
+              'Garcia', 'Clark', 'Jones', 'Williams', 'Davies', 'Evans', 'Thomas', 'Roberts']
+
+ACTIVITY_SIGMA = 1.0       # lognormal spread of per-customer order activity
+PRODUCT_ZIPF = 1.1         # popularity exponent over product rank
+MEAN_EXTRA_ITEMS = 0.3     # items per order = 1 + Poisson(MEAN_EXTRA_ITEMS), at most 5
+
+
+def _pick(rng, choices, n):
+    """n draws from a {label: probability} dict, as an object array of labels"""
+    labels = np.array(list(choices), dtype=object)
+    p = np.array(list(choices.values()), dtype=float)
+    return labels[rng.choice(len(labels), size=n, p=p / p.sum())]
+
+
+def _day_strings(days):
+    """Days since the epoch -> 'YYYY-MM-DD' objects, the format the queries expect"""
+    return days.astype('datetime64[D]').astype(str).astype(object)
+
+
+class CustomerGenerator:
+    """
+    Customers and products are drawn up front (they are small next to the
+    orders); orders and their items are drawn one block at a time. Every
+    table and every order block has its own seed derived from `seed`, so
+    output depends only on seed, the table sizes and block_size.
+
+    Skew: customer activity is lognormal and scaled by segment, so a few
+    customers place most orders and some never order; product popularity
+    is Zipf-like over the catalogue. Order volume grows linearly over the
+    window, and each order goes to a customer who had joined by its date
+    (ids follow join order, as in the sample data).
+    """
+
+    def __init__(self, seed=42, customers=10_000, orders=30_000, products=50, block_size=100_000):
+        if customers < 1 or orders < 0:
+            raise ValueError("need at least one customer and a non-negative order count")
+        if products < 1:
+            raise ValueError("products must be at least 1")
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.seed = seed
+        self.n_customers = customers
+        self.n_orders = orders
+        self.n_products = products
+        self.block_size = block_size
+        self._customers = None
+        self._products = None
+
+    def _rng(self, *key):
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=key))
+
+    def customers(self):
+        """Column arrays for customers, ids 1..n (cached)"""
+        if self._customers is None:
+            rng = self._rng(0)
+            n = self.n_customers
+            ids = np.arange(1, n + 1)
+            span = int((END_DATE - START_DATE).astype(int))
+            join = np.sort(START_DATE.astype(int) + rng.integers(0, span + 1, size=n))
+            join[0] = START_DATE.astype(int)
+            segment = _pick(rng, {s: share for s, (share, _) in SEGMENTS.items()}, n)
+            names = (np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)] + ' '
+                     + np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), n)])
+            activity = rng.lognormal(0.0, ACTIVITY_SIGMA, size=n)
+            activity *= np.array([SEGMENTS[s][1] for s in segment])
+            self._customers = {
+                'customer_id': ids,
+                'customer_name': names,
+                'email': np.char.add(np.char.add('customer', ids.astype(str)), '@example.com').astype(object),
+                'join_date': _day_strings(join),
+                'country': _pick(rng, COUNTRIES, n),
+                'customer_segment': segment,
+                '_join_day': join,
+                '_cumulative_activity': np.cumsum(activity),
+            }
+        return self._customers
+
+    def products(self):
+        """Column arrays for products: the sample catalogue, then generated add-ons (cached)"""
+        if self._products is None:
+            rng = self._rng(1)
+            n = self.n_products
+            names = [name for name, _, _ in CATALOGUE][:n]
+            categories = [category for _, category, _ in CATALOGUE][:n]
+            prices = [price for _, _, price in CATALOGUE][:n]
+            extra = n - len(names)
+            if extra > 0:
+                extra_categories = rng.choice(CATEGORIES, size=extra)
+                categories += extra_categories.tolist()
+                names += [f'{c} Add-on {i}' for i, c in enumerate(extra_categories, start=1)]
+                prices += (np.round(rng.lognormal(np.log(60), 0.6, size=extra), 0) - 0.01).clip(4.99).tolist()
+            weights = 1.0 / np.arange(1, n + 1) ** PRODUCT_ZIPF
+            self._products = {
+                'product_id': np.arange(1, n + 1),
+                'product_name': np.array(names, dtype=object),
+                'category': np.array(categories, dtype=object),
+                'price': np.array(prices),
+                '_cdf': np.cumsum(weights) / weights.sum(),
+            }
+        return self._products
+
+    def iter_order_blocks(self):
+        """
+        Yield (orders, order_items) column dicts, one pair per block of at
+        most block_size orders. total_amount is the sum of the order's
+        items, so the two tables always agree.
+        """
+        customers = self.customers()
+        products = self.products()
+        start_day, end_day = START_DATE.astype(int), END_DATE.astype(int)
+        order_id = item_id = 1
+        for block, start in enumerate(range(0, self.n_orders, self.block_size)):
+            n = min(self.block_size, self.n_orders - start)
+            rng = self._rng(2, block)
+
+            # Linear growth: density of order days rises steadily to end_day
+            day = start_day + np.floor(np.sqrt(rng.random(n)) * (end_day - start_day + 1)).astype(np.int64)
+            day = np.minimum(day, end_day)
+            # Weighted pick among the customers who had joined by that day
+            cumulative = customers['_cumulative_activity']
+            joined = np.searchsorted(customers['_join_day'], day, side='right')
+            customer = np.searchsorted(cumulative, rng.random(n) * cumulative[joined - 1], side='right')
+            customer = np.minimum(customer, joined - 1)
+
+            items = np.minimum(1 + rng.poisson(MEAN_EXTRA_ITEMS, size=n), 5)
+            owner = np.repeat(np.arange(n), items)
+            product = np.searchsorted(products['_cdf'], rng.random(len(owner)), side='right')
+            product = np.minimum(product, self.n_products - 1)
+            quantity = np.minimum(rng.geometric(0.85, size=len(owner)), 5)
+            unit_price = products['price'][product]
+            total = np.round(np.bincount(owner, weights=quantity * unit_price, minlength=n), 2)
+
+            order_ids = np.arange(order_id, order_id + n)
+            orders = {
+                'order_id': order_ids,
+                'customer_id': customers['customer_id'][customer],
+                'order_date': _day_strings(day),
+                'total_amount': total,
+                'status': _pick(rng, STATUSES, n),
+            }
+            order_items = {
+                'order_item_id': np.arange(item_id, item_id + len(owner)),
+                'order_id': order_ids[owner],
+                'product_id': products['product_id'][product],
+                'quantity': quantity,
+                'unit_price': unit_price,
+            }
+            order_id += n
+            item_id += len(owner)
+            yield orders, order_items
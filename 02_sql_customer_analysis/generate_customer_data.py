@@ -0,0 +1,56 @@
+"""
+Customer Analytics - Data Generator
+Fills customers, products, orders and order_items at configurable scale for query benchmarking
+"""
+
+import argparse
+import sqlite3
+
+from customer_db import build_database
+from customer_engine import CustomerGenerator
+from sql_catalog import SCHEMA_FILE
+
+parser = argparse.ArgumentParser(description="Generate customer analytics data into SQLite")
+parser.add_argument('--orders', type=int, default=100_000, help="Number of orders (up to 10^7)")
+parser.add_argument('--customers', type=int, default=None,
+                    help="Number of customers (default: one per three orders)")
+parser.add_argument('--products', type=int, default=50, help="Catalogue size (first 5 are the sample products)")
+parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducibility")
+parser.add_argument('--block-size', type=int, default=100_000,
+                    help="Orders generated and inserted per transaction (default 100,000)")
+parser.add_argument('--database', default='customer_analytics.db', help="SQLite file to (re)create")
+args = parser.parse_args()
+n_customers = args.customers or max(1, args.orders // 3)
+
+print("\n" + "="*70)
+print("CUSTOMER ANALYTICS - DATA GENERATOR")
+print("="*70 + "\n")
+
+generator = CustomerGenerator(seed=args.seed, customers=n_customers, orders=args.orders,
+                              products=args.products, block_size=args.block_size)
+print(f"Generating {n_customers:,} customers, {args.products:,} products and {args.orders:,} orders...")
+
+# One transaction for the dimensions, then one per block of orders and their items
+stats = build_database(generator, args.database, SCHEMA_FILE)
+timings = stats['timings']
+rows = stats['orders'] + stats['order_items']
+print(f"✅ customers + products in {timings['dimensions']:.2f}s")
+print(f"✅ {stats['orders']:,} orders + {stats['order_items']:,} order items in {timings['orders']:.2f}s "
+      f"({rows / max(timings['orders'], 1e-9):,.0f} rows/s)")
+
+conn = sqlite3.connect(args.database)
+buyers, repeat = conn.execute('''
+    SELECT COUNT(*), SUM(CASE WHEN n > 1 THEN 1 ELSE 0 END)
+    FROM (SELECT customer_id, COUNT(*) AS n FROM orders WHERE status = 'Completed' GROUP BY customer_id)
+''').fetchone()
+conn.close()
+
+print(f"✅ Completed revenue: ${stats['revenue']:,.2f}")
+if buyers:
+    print(f"✅ Customers with a completed order: {buyers:,} ({repeat / buyers:.1%} repeat buyers)")
+print(f"✅ Saved to: {args.database}\n")
+
+print("="*70)
+print("✅ DATA GENERATION COMPLETE!")
+print("="*70)
+print("\n💡 Next: python run_queries.py --database " + args.database + "\n")
@@ -0,0 +1,271 @@
+"""
+SQLite Index Advisor
+Reads EXPLAIN QUERY PLAN output, proposes secondary indexes and keeps the ones that remove full scans
+"""
+
+import re
+import sqlite3
+import statistics
+import time
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+JOIN_PAIR = re.compile(r'\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)')
+EQUALITY = re.compile(r"(?:\b(\w+)\.)?\b(\w+)\s*=\s*(?:'[^']*'|\d+(?:\.\d+)?\b)")
+# A candidate is rejected if any query it re-plans runs this much slower
+MAX_SLOWDOWN = 3.0
+SLOWDOWN_SLACK = 0.002  # seconds, so sub-millisecond noise is not a regression
+# ...or if it makes the whole workload slower by more than this fraction (timing noise)
+NOISE_MARGIN = 0.15
+# Timed runs per query (after one warmup run) when judging a candidate
+ADVISE_REPEAT = 3
+SQL_WORDS = {'on', 'where', 'left', 'right', 'inner', 'outer', 'cross', 'join',
+             'group', 'order', 'limit', 'using', 'natural'}
+
+
+class IndexProposal:
+    """A CREATE INDEX the advisor recommends, and the plan problems it removes"""
+
+    def __init__(self, table, columns, removed):
+        self.table = table
+        self.columns = tuple(columns)
+        self.removed = removed
+
+    @property
+    def name(self):
+        return f"idx_{self.table}_{'_'.join(self.columns)}"
+
+    @property
+    def sql(self):
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table} ({', '.join(self.columns)})"
+
+
+def create_index(conn, proposal):
+    """
+    Create a proposed index. When the database has planner statistics the
+    new index is analyzed too, so the planner judges its selectivity
+    instead of assuming every index is worth using.
+    """
+    conn.execute(proposal.sql)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+        conn.execute(f'ANALYZE {proposal.name}')
+
+
+def query_plan(conn, sql):
+    """EXPLAIN QUERY PLAN detail strings, in plan order"""
+    return [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql)]
+
+
+def table_aliases(conn, sql):
+    """{alias or table name: table} for the base tables the query reads"""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        if table not in tables:
+            continue
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_WORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def plan_problems(plan, aliases):
+    """
+    Plan lines that read a whole base table: 'SCAN <table>' (with or
+    without a covering index) and automatic indexes, which SQLite builds
+    from a full scan on every execution.
+    """
+    problems = []
+    for detail in plan:
+        scan = re.match(r'SCAN (\w+)', detail)
+        if (scan and scan.group(1) in aliases) or 'AUTOMATIC' in detail:
+            problems.append(detail)
+    return problems
+
+
+def table_rows(conn):
+    """{table: row count} for every table in the database"""
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    return {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in tables}
+
+
+def scanned_rows(problems, aliases, rows):
+    """
+    Rows read by full scans for a list of plan problems: an automatic index
+    costs a scan of its table as well, so both count the table's size
+    """
+    total = 0
+    for detail in problems:
+        match = re.match(r'(?:SCAN|SEARCH) (\w+)', detail)
+        if match and match.group(1) in aliases:
+            total += rows.get(aliases[match.group(1)], 0)
+    return total
+
+
+def _columns(conn, table):
+    """Column names of table, minus an INTEGER PRIMARY KEY (already the rowid)"""
+    return [name for _, name, kind, _, _, pk in conn.execute(f'PRAGMA table_info({table})')
+            if not (pk and kind.upper() == 'INTEGER')]
+
+
+def candidate_indexes(conn, sql):
+    """
+    {(table, columns)} worth trying for one query: each join column on its
+    own, the equality filters of a table, and those filters followed by
+    each of its join columns.
+    """
+    aliases = table_aliases(conn, sql)
+    columns = {table: _columns(conn, table) for table in set(aliases.values())}
+
+    joins = {table: set() for table in columns}
+    for left, left_col, right, right_col in JOIN_PAIR.findall(sql):
+        for alias, column in ((left, left_col), (right, right_col)):
+            table = aliases.get(alias)
+            if table and column in columns[table]:
+                joins[table].add(column)
+
+    filters = {table: [] for table in columns}
+    for alias, column in EQUALITY.findall(sql):
+        if alias:
+            owners = [aliases[alias]] if alias in aliases else []
+        else:
+            owners = [table for table in columns if column in columns[table]]
+        if len(owners) == 1 and column in columns[owners[0]] and column not in filters[owners[0]]:
+            filters[owners[0]].append(column)
+
+    candidates = set()
+    for table in columns:
+        for column in joins[table]:
+            candidates.add((table, (column,)))
+        if filters[table]:
+            candidates.add((table, tuple(filters[table])))
+            for column in joins[table] - set(filters[table]):
+                candidates.add((table, tuple(filters[table]) + (column,)))
+    return candidates
+
+
+def problem_counts(conn, queries):
+    """{query name: [plan problems]} under the indexes that exist right now"""
+    return {query.name: plan_problems(query_plan(conn, query.sql), table_aliases(conn, query.sql))
+            for query in queries}
+
+
+def run_within(conn, sql, budget):
+    """Seconds to run sql to completion, or None if it was cut off after budget seconds"""
+    deadline = time.perf_counter() + budget
+    conn.set_progress_handler(lambda: time.perf_counter() > deadline, 10_000)
+    try:
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        return time.perf_counter() - start
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.set_progress_handler(None, 0)
+
+
+def median_within(conn, sql, budget, repeat=ADVISE_REPEAT, warmup=1):
+    """
+    Median seconds of repeat runs of sql after warmup untimed runs, or None
+    if any run (warmup included) was cut off after budget seconds
+    """
+    samples = []
+    for i in range(warmup + repeat):
+        seconds = run_within(conn, sql, budget)
+        if seconds is None:
+            return None
+        if i >= warmup:
+            samples.append(seconds)
+    return statistics.median(samples)
+
+
+def advise(conn, queries):
+    """
+    Greedy index selection. Every candidate is created inside a savepoint,
+    the plans are re-read and the index rolled back; the candidate that
+    removes the most full-scan rows across all queries (scans and automatic
+    indexes, weighted by their table's size) is kept and the search
+    repeats until no candidate helps. A fewer-scans plan can still be
+    slower (the planner may loop over a low-selectivity index), so every
+    query whose plan a candidate changes is also timed with and without
+    it (medians after a warmup run). The removed scans are the win, so a
+    candidate is only dropped on a clear regression: one of those queries
+    runs more than MAX_SLOWDOWN times slower, or together they add more
+    than NOISE_MARGIN of the whole workload's time.
+    Returns [IndexProposal]; the database is left as it was.
+    """
+    candidates = set()
+    for query in queries:
+        candidates |= candidate_indexes(conn, query.sql)
+
+    isolation = conn.isolation_level
+    conn.isolation_level = None
+    conn.execute('SAVEPOINT advise')
+    chosen = []
+    try:
+        rows = table_rows(conn)
+        aliases = {query.name: table_aliases(conn, query.sql) for query in queries}
+        plans = {query.name: query_plan(conn, query.sql) for query in queries}
+        current = problem_counts(conn, queries)
+        seconds = {query.name: median_within(conn, query.sql, float('inf')) for query in queries}
+        while candidates:
+            best = None
+            for table, columns in sorted(candidates):
+                proposal = IndexProposal(table, columns, {})
+                conn.execute('SAVEPOINT trial')
+                create_index(conn, proposal)
+                trial = problem_counts(conn, queries)
+                gain = sum(scanned_rows(current[name], aliases[name], rows)
+                           - scanned_rows(trial[name], aliases[name], rows) for name in current)
+                timings = {}
+                if gain > 0:
+                    for query in queries:
+                        if query_plan(conn, query.sql) != plans[query.name]:
+                            budget = seconds[query.name] * MAX_SLOWDOWN + SLOWDOWN_SLACK
+                            timings[query.name] = median_within(conn, query.sql, budget)
+                            if timings[query.name] is None:
+                                break
+                conn.execute('ROLLBACK TO trial')
+                conn.execute('RELEASE trial')
+                if gain <= 0 or None in timings.values():
+                    continue
+                # Re-time the same queries without the index straight away, so
+                # the comparison is not skewed by load that came and went
+                for query in queries:
+                    if query.name in timings:
+                        seconds[query.name] = median_within(conn, query.sql, float('inf'))
+                saved = sum(seconds[name] - t for name, t in timings.items())
+                if -saved > sum(seconds.values()) * NOISE_MARGIN + SLOWDOWN_SLACK:
+                    continue
+                if best is None or (gain, saved) > best[0]:
+                    best = ((gain, saved), proposal, trial, timings)
+            if best is None:
+                break
+            _, proposal, trial, timings = best
+            proposal.removed = {name: [p for p in current[name] if p not in trial[name]]
+                                for name in current
+                                if scanned_rows(trial[name], aliases[name], rows)
+                                < scanned_rows(current[name], aliases[name], rows)}
+            create_index(conn, proposal)
+            chosen.append(proposal)
+            candidates.discard((proposal.table, proposal.columns))
+            plans = {query.name: query_plan(conn, query.sql) for query in queries}
+            current = trial
+            seconds.update(timings)
+    finally:
+        conn.execute('ROLLBACK TO advise')
+        conn.execute('RELEASE advise')
+        conn.isolation_level = isolation
+    return chosen
+
+    """Median wall-clock seconds of running sql to completion repeat times, after warmup runs"""
+def time_query(conn, sql, repeat=50, warmup=3):
+    """Median wall-clock seconds of running sql to completion, repeat times after warmup untimed runs"""
+    for _ in range(warmup):
+        conn.execute(sql).fetchall()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
@@ -0,0 +1,72 @@
+"""
+Customer Analytics Monthly Reports
+Answers the monthly queries from the revenue cube and checks them against the raw tables
+"""
+
+import argparse
+import time
+
+from index_advisor import time_query
+from revenue_cube import CUBE, CUBE_QUERIES, RECOMPUTE, cubes_exist, rebuild_cubes, verify_cube_queries
+from sql_catalog import QUERIES_FILE, SCHEMA_FILE, load_queries, open_database
+
+parser = argparse.ArgumentParser(description="Monthly revenue reports from the pre-aggregated cube")
+parser.add_argument('--database', default='customer_analytics.db',
+                    help="SQLite file (created from database_setup.sql if missing)")
+parser.add_argument('--rebuild', action='store_true',
+                    help="Recompute the cube tables and reinstall their triggers")
+parser.add_argument('--verify', action='store_true',
+                    help="Check every cube table and cube-backed report against the raw tables")
+parser.add_argument('--repeat', type=int, default=5, help="Executions per query for the median latency")
+args = parser.parse_args()
+
+print("\n" + "="*70)
+print("CUSTOMER ANALYTICS - MONTHLY REVENUE CUBE")
+print("="*70 + "\n")
+
+conn = open_database(args.database, SCHEMA_FILE)
+orders = conn.execute('SELECT COUNT(*) FROM orders').fetchone()[0]
+print(f"✅ Database: {args.database} ({orders:,} orders)")
+
+# Rebuilt in one GROUP BY pass; triggers keep it current from then on
+if args.rebuild or not cubes_exist(conn):
+    start = time.perf_counter()
+    rebuild_cubes(conn)
+    print(f"✅ Built cube tables and triggers in {time.perf_counter() - start:.2f}s")
+cells = conn.execute(f'SELECT COUNT(*) FROM {CUBE}').fetchone()[0]
+print(f"✅ {CUBE}: {cells:,} cells (month x segment x country x status)\n")
+
+raw_queries = {query.name: query for query in load_queries(QUERIES_FILE)}
+
+print("="*70)
+print("CUBE vs RAW TABLES (median of {} runs)".format(args.repeat))
+print("="*70 + "\n")
+
+print(f"{'Query':<10} {'Rows':>8} {'Raw ms':>10} {'Cube ms':>10} {'Speedup':>8}  Title")
+for name, sql in CUBE_QUERIES.items():
+    raw = time_query(conn, raw_queries[name].sql, args.repeat)
+    cube = time_query(conn, sql, args.repeat)
+    rows = len(conn.execute(sql).fetchall())
+    print(f"{name:<10} {rows:>8,} {raw*1000:>10.3f} {cube*1000:>10.3f} {raw / cube:>7.1f}x  "
+          f"{raw_queries[name].title}")
+
+# Latest months of the revenue trend, straight from the cube
+print("\nMonthly revenue trend (last 6 months):")
+for month, month_orders, revenue in conn.execute(CUBE_QUERIES['Query 6']).fetchall()[-6:]:
+    print(f"   {month}: {month_orders:>9,} orders  ${revenue:>14,.2f}")
+
+if args.verify:
+    problems = verify_cube_queries(conn, {name: query.sql for name, query in raw_queries.items()})
+    if problems:
+        print(f"\n❌ Cube reports differ from the raw tables ({len(problems)} problems):")
+        for problem in problems[:20]:
+            print(f"   {problem}")
+    else:
+        print(f"\n✅ All {len(RECOMPUTE)} rollup tables and {len(CUBE_QUERIES)} cube reports "
+              "match the raw tables")
+
+conn.close()
+
+print("\n" + "="*70)
+print("✅ MONTHLY REPORTS COMPLETE!")
+print("="*70 + "\n")
@@ -0,0 +1,171 @@
+"""
+Query Benchmark Harness
+Repeated timings, plan-based scan counts and comparable JSON/CSV reports for analysis_queries.sql
+"""
+
+import csv
+import json
+import platform
+import sqlite3
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from index_advisor import query_plan, table_aliases
+
+# One progress-handler callback per this many SQLite VM instructions
+VM_STEP_GRANULARITY = 1_000
+
+FIELDS = ['size', 'query', 'title', 'runs', 'p50_ms', 'p95_ms', 'mean_ms', 'min_ms',
+          'rows', 'rows_scanned', 'vm_steps']
+
+
+def git_revision():
+    """Short hash of HEAD (with '+dirty' for local changes), or 'unknown' outside git"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return revision + ('+dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def rows_scanned(conn, sql, table_rows):
+    """
+    Rows read by the full scans in the query plan: every 'SCAN <table>' and
+    every automatic index (built from a full scan) counts the whole table.
+    Index searches are not counted, so this is a lower bound on work.
+    """
+    aliases = table_aliases(conn, sql)
+    total = 0
+    for detail in query_plan(conn, sql):
+        words = detail.split()
+        target = words[1] if len(words) > 1 and words[0] in ('SCAN', 'SEARCH') else None
+        if target in aliases and (words[0] == 'SCAN' or 'AUTOMATIC' in detail):
+            total += table_rows[aliases[target]]
+    return total
+
+
+def vm_steps(conn, sql):
+    """SQLite virtual-machine instructions to run sql, to VM_STEP_GRANULARITY"""
+    steps = 0
+
+    def tick():
+        nonlocal steps
+        steps += 1
+        return 0
+
+    conn.set_progress_handler(tick, VM_STEP_GRANULARITY)
+    try:
+        conn.execute(sql).fetchall()
+    finally:
+        conn.set_progress_handler(None, 0)
+    return steps * VM_STEP_GRANULARITY
+
+
+def benchmark_query(conn, sql, repeat=10, warmup=1, max_seconds=30.0):
+    """
+    Wall-clock samples (seconds) of running sql to completion. After the
+    warmup runs, repeats until `repeat` samples or until max_seconds have
+    been spent; at least one sample is always taken.
+    Returns (samples, result row count).
+    """
+    for _ in range(warmup):
+        conn.execute(sql).fetchall()
+    samples = []
+    rows = 0
+    while len(samples) < max(repeat, 1):
+        start = time.perf_counter()
+        rows = len(conn.execute(sql).fetchall())
+        samples.append(time.perf_counter() - start)
+        if sum(samples) >= max_seconds:
+            break
+    return samples, rows
+
+
+def summarise(size, query, samples, rows, scanned, steps):
+    """One report row: latency percentiles in milliseconds plus work counters"""
+    ms = np.array(samples) * 1000
+    return {
+        'size': size,
+        'query': query.name,
+        'title': query.title,
+        'runs': len(samples),
+        'p50_ms': round(float(np.percentile(ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(ms, 95)), 4),
+        'mean_ms': round(float(ms.mean()), 4),
+        'min_ms': round(float(ms.min()), 4),
+        'rows': rows,
+        'rows_scanned': scanned,
+        'vm_steps': steps,
+    }
+
+
+def run_suite(database, size, queries, repeat=10, warmup=1, max_seconds=30.0):
+    """Benchmark every query against one database; returns [report row]"""
+    conn = sqlite3.connect(f'file:{database}?mode=ro', uri=True)
+    table_rows = {name: conn.execute(f'SELECT COUNT(*) FROM {name}').fetchone()[0]
+                  for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    results = []
+    for query in queries:
+        samples, rows = benchmark_query(conn, query.sql, repeat, warmup, max_seconds)
+        results.append(summarise(size, query, samples, rows,
+                                 rows_scanned(conn, query.sql, table_rows), vm_steps(conn, query.sql)))
+    conn.close()
+    return results
+
+
+def write_report(stem, results, settings):
+    """Write <stem>.json (metadata + results) and <stem>.csv (results); returns both paths"""
+    meta = {
+        'revision': git_revision(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'machine': platform.machine(),
+        **settings,
+    }
+    json_path, csv_path = f'{stem}.json', f'{stem}.csv'
+    with open(json_path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    return json_path, csv_path
+
+
+def load_report(path):
+    """Results of an earlier report, from its .json or .csv file"""
+    if str(path).endswith('.csv'):
+        with open(path, newline='') as f:
+            return [{**row, 'size': int(row['size']), 'p50_ms': float(row['p50_ms']),
+                     'p95_ms': float(row['p95_ms']), 'min_ms': float(row['min_ms'])}
+                    for row in csv.DictReader(f)]
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(baseline, results, threshold=0.20, min_ms=1.0):
+    """
+    Pair results with the baseline by (size, query) and flag regressions:
+    p50 slower by more than `threshold` (a fraction) and by at least
+    min_ms, with even the fastest new run slower than the baseline p50,
+    so a few noisy samples or sub-millisecond jitter never count.
+    Returns [(row, baseline row, p50 ratio, regressed)].
+    """
+    previous = {(row['size'], row['query']): row for row in baseline}
+    pairs = []
+    for row in results:
+        old = previous.get((row['size'], row['query']))
+        if old is None:
+            continue
+        ratio = row['p50_ms'] / old['p50_ms'] if old['p50_ms'] else float('inf')
+        regressed = (ratio > 1 + threshold and row['p50_ms'] - old['p50_ms'] >= min_ms
+                     and row['min_ms'] > old['p50_ms'])
+        pairs.append((row, old, ratio, regressed))
+    return pairs
@@ -0,0 +1,227 @@
+"""
+Monthly Revenue Cube
+Trigger-maintained monthly rollups of orders and customers, and the reports that read them
+"""
+
+import math
+
+# month x customer_segment x country x status: order count and revenue
+CUBE = 'monthly_revenue_cube'
+# join month x customer_segment x country: new customers (Query 12)
+ACQUISITION = 'monthly_acquisition_cube'
+# customer x month, completed orders only: Query 13 lists revenue per
+# customer, which a segment-level cube cannot answer
+CUSTOMER_MONTHS = 'customer_month_revenue'
+
+MONTH = "strftime('%Y-%m', {})"
+UNKNOWN = "'Unknown'"  # dimension value for orders whose customer row is missing
+
+SCHEMAS = {
+    CUBE: '''CREATE TABLE IF NOT EXISTS monthly_revenue_cube (
+        month TEXT, customer_segment TEXT, country TEXT, status TEXT,
+        orders INTEGER, revenue REAL,
+        PRIMARY KEY (month, customer_segment, country, status))''',
+    ACQUISITION: '''CREATE TABLE IF NOT EXISTS monthly_acquisition_cube (
+        month TEXT, customer_segment TEXT, country TEXT,
+        new_customers INTEGER,
+        PRIMARY KEY (month, customer_segment, country))''',
+    CUSTOMER_MONTHS: '''CREATE TABLE IF NOT EXISTS customer_month_revenue (
+        customer_id INTEGER, month TEXT,
+        orders INTEGER, revenue REAL,
+        PRIMARY KEY (customer_id, month))''',
+}
+
+# Each rollup as one GROUP BY over the raw tables, in the rollup's column order
+RECOMPUTE = {
+    CUBE: f'''
+        SELECT {MONTH.format('o.order_date')}, COALESCE(c.customer_segment, {UNKNOWN}),
+               COALESCE(c.country, {UNKNOWN}), o.status, COUNT(*), SUM(COALESCE(o.total_amount, 0))
+        FROM orders o LEFT JOIN customers c ON c.customer_id = o.customer_id
+        GROUP BY 1, 2, 3, 4''',
+    ACQUISITION: f'''
+        SELECT {MONTH.format('join_date')}, COALESCE(customer_segment, {UNKNOWN}),
+               COALESCE(country, {UNKNOWN}), COUNT(*)
+        FROM customers GROUP BY 1, 2, 3''',
+    CUSTOMER_MONTHS: f'''
+        SELECT customer_id, {MONTH.format('order_date')}, COUNT(*), SUM(COALESCE(total_amount, 0))
+        FROM orders WHERE status = 'Completed' GROUP BY 1, 2''',
+}
+
+# The monthly reports of analysis_queries.sql, answered from the rollups
+CUBE_QUERIES = {
+    'Query 6': '''
+SELECT month, SUM(orders) as orders, SUM(revenue) as revenue
+FROM monthly_revenue_cube
+WHERE status = 'Completed'
+GROUP BY month
+ORDER BY month;''',
+    'Query 12': '''
+SELECT month, SUM(new_customers) as new_customers,
+       SUM(SUM(new_customers)) OVER (ORDER BY month) as cumulative_customers
+FROM monthly_acquisition_cube
+GROUP BY month
+ORDER BY month;''',
+    'Query 13': '''
+SELECT c.customer_name, r.month, r.revenue as monthly_revenue
+FROM customer_month_revenue r
+JOIN customers c ON c.customer_id = r.customer_id
+ORDER BY monthly_revenue DESC;''',
+}
+
+
+def _segment(row):
+    return f'COALESCE((SELECT customer_segment FROM customers WHERE customer_id = {row}.customer_id), {UNKNOWN})'
+
+
+def _country(row):
+    return f'COALESCE((SELECT country FROM customers WHERE customer_id = {row}.customer_id), {UNKNOWN})'
+
+
+def _fold_order_sql(row, sign):
+    """Add (sign=1) or remove (sign=-1) one orders row (NEW or OLD alias)"""
+    amount = f'COALESCE({row}.total_amount, 0)'
+    month = MONTH.format(f'{row}.order_date')
+    cube_key = f'{month}, {_segment(row)}, {_country(row)}, {row}.status'
+    return f'''
+        INSERT INTO monthly_revenue_cube VALUES ({cube_key}, {sign}, {sign} * {amount})
+        ON CONFLICT (month, customer_segment, country, status) DO UPDATE SET
+            orders = orders + excluded.orders, revenue = revenue + excluded.revenue;
+        DELETE FROM monthly_revenue_cube WHERE orders <= 0
+            AND (month, customer_segment, country, status) = ({cube_key});
+        INSERT INTO customer_month_revenue
+            SELECT {row}.customer_id, {month}, {sign}, {sign} * {amount} WHERE {row}.status = 'Completed'
+        ON CONFLICT (customer_id, month) DO UPDATE SET
+            orders = orders + excluded.orders, revenue = revenue + excluded.revenue;
+        DELETE FROM customer_month_revenue WHERE orders <= 0
+            AND customer_id = {row}.customer_id AND month = {month};'''
+
+
+def _fold_customer_orders_sql(row, sign, segment=None, country=None):
+    """
+    Move all of one customer's orders into (sign=1) or out of (sign=-1)
+    the cube cells of that customer's segment and country, or of the given
+    segment/country SQL (the 'Unknown' cells of orders with no customer
+    row). Reads the customer's orders, so a segment/country change costs
+    one lookup of orders by customer_id.
+    """
+    segment = segment or f'COALESCE({row}.customer_segment, {UNKNOWN})'
+    country = country or f'COALESCE({row}.country, {UNKNOWN})'
+    return f'''
+        INSERT INTO monthly_revenue_cube
+            SELECT {MONTH.format('o.order_date')}, {segment}, {country}, o.status,
+                   {sign} * COUNT(*), {sign} * SUM(COALESCE(o.total_amount, 0))
+            FROM orders o WHERE o.customer_id = {row}.customer_id
+            GROUP BY 1, 4
+        ON CONFLICT (month, customer_segment, country, status) DO UPDATE SET
+            orders = orders + excluded.orders, revenue = revenue + excluded.revenue;
+        DELETE FROM monthly_revenue_cube WHERE orders <= 0;'''
+
+
+def _fold_customer_sql(row, sign):
+    """Add or remove one customers row (NEW or OLD alias) in the acquisition cube"""
+    key = (f"{MONTH.format(f'{row}.join_date')}, COALESCE({row}.customer_segment, {UNKNOWN}), "
+           f"COALESCE({row}.country, {UNKNOWN})")
+    return f'''
+        INSERT INTO monthly_acquisition_cube VALUES ({key}, {sign})
+        ON CONFLICT (month, customer_segment, country) DO UPDATE SET
+            new_customers = new_customers + excluded.new_customers;
+        DELETE FROM monthly_acquisition_cube WHERE new_customers <= 0
+            AND (month, customer_segment, country) = ({key});'''
+
+
+TRIGGERS = {
+    'revenue_cube_order_insert': f'''AFTER INSERT ON orders
+        BEGIN {_fold_order_sql('NEW', 1)}
+        END''',
+    'revenue_cube_order_delete': f'''AFTER DELETE ON orders
+        BEGIN {_fold_order_sql('OLD', -1)}
+        END''',
+    'revenue_cube_order_update': f'''AFTER UPDATE OF customer_id, order_date, total_amount, status ON orders
+        BEGIN {_fold_order_sql('OLD', -1)} {_fold_order_sql('NEW', 1)}
+        END''',
+    # Orders loaded before their customer sit in the 'Unknown' cells until
+    # the customer arrives, and go back there when the customer is deleted
+    'revenue_cube_customer_insert': f'''AFTER INSERT ON customers
+        BEGIN {_fold_customer_sql('NEW', 1)}
+            {_fold_customer_orders_sql('NEW', -1, UNKNOWN, UNKNOWN)} {_fold_customer_orders_sql('NEW', 1)}
+        END''',
+    'revenue_cube_customer_delete': f'''AFTER DELETE ON customers
+        BEGIN {_fold_customer_sql('OLD', -1)}
+            {_fold_customer_orders_sql('OLD', -1)} {_fold_customer_orders_sql('OLD', 1, UNKNOWN, UNKNOWN)}
+        END''',
+    'revenue_cube_customer_update': f'''AFTER UPDATE OF join_date, customer_segment, country ON customers
+        BEGIN {_fold_customer_sql('OLD', -1)} {_fold_customer_sql('NEW', 1)}
+        END''',
+    'revenue_cube_customer_move': f'''AFTER UPDATE OF customer_segment, country ON customers
+        WHEN OLD.customer_segment IS NOT NEW.customer_segment OR OLD.country IS NOT NEW.country
+        BEGIN {_fold_customer_orders_sql('OLD', -1)} {_fold_customer_orders_sql('NEW', 1)}
+        END''',
+}
+
+
+def cubes_exist(conn):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return all(table in names for table in SCHEMAS)
+
+
+def rebuild_cubes(conn):
+    """
+    Recompute every rollup in one GROUP BY pass each and (re)install the
+    triggers that keep them current on order and customer inserts,
+    updates and deletes. Used after bulk loads, where per-row triggers
+    would be slower than a rebuild. Also indexes orders by customer_id,
+    which the segment/country triggers look up a customer's orders by.
+    """
+    with conn:
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders (customer_id)')
+        for name in TRIGGERS:
+            conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+        for table, schema in SCHEMAS.items():
+            conn.execute(f'DROP TABLE IF EXISTS {table}')
+            conn.execute(schema)
+            conn.execute(f'INSERT INTO {table} {RECOMPUTE[table]}')
+        for name, body in TRIGGERS.items():
+            conn.execute(f'CREATE TRIGGER {name} {body}')
+
+
+def _same(a, b, rel_tol):
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-6)
+    return a == b
+
+
+def _ordered_key(row):
+    return tuple((v is None, round(v, 6) if isinstance(v, float) else v) for v in row)
+
+
+def _compare(label, got, expected, rel_tol):
+    """Mismatch descriptions for two result sets, matched as sorted multisets"""
+    got = sorted(got, key=_ordered_key)
+    expected = sorted(expected, key=_ordered_key)
+    if len(got) != len(expected):
+        return [f'{label}: {len(got)} rows from the cube, {len(expected)} from the raw tables']
+    for row, other in zip(got, expected):
+        if not all(_same(a, b, rel_tol) for a, b in zip(row, other)):
+            return [f'{label}: cube row {row} != raw row {other}']
+    return []
+
+
+def verify_cube_queries(conn, raw_queries, rel_tol=1e-9):
+    """
+    Compare every rollup table cell by cell with its RECOMPUTE GROUP BY,
+    then run each cube-backed report and its raw-table original and
+    compare the results (the reports sum across cells, so they alone
+    cannot see a misplaced one). Rows are matched as sorted multisets
+    (Query 13 orders by revenue alone, so ties may come back in either
+    order) and floats with a relative tolerance, since incremental sums
+    round differently from one SUM(). Returns a list of mismatch
+    descriptions.
+    """
+    problems = []
+    for table, sql in RECOMPUTE.items():
+        problems += _compare(table, conn.execute(f'SELECT * FROM {table}').fetchall(),
+                             conn.execute(sql).fetchall(), rel_tol)
+    for name, sql in CUBE_QUERIES.items():
+        problems += _compare(name, conn.execute(sql).fetchall(),
+                             conn.execute(raw_queries[name]).fetchall(), rel_tol)
+    return problems
@@ -0,0 +1,102 @@
+"""
+Customer Analytics SQL Runner
+Loads the schema into SQLite, runs every query in analysis_queries.sql with its query plan and advises indexes
+"""
+
+import argparse
+
+from index_advisor import advise, create_index, plan_problems, problem_counts, query_plan, table_aliases, time_query
+from sql_catalog import QUERIES_FILE, SCHEMA_FILE, load_queries, open_database
+
+parser = argparse.ArgumentParser(description="Run the customer analytics queries on SQLite with an index advisor")
+parser.add_argument('--database', default=None,
+                    help="SQLite file to query (created from database_setup.sql if missing; default: in memory)")
+parser.add_argument('--create-indexes', action='store_true',
+                    help="Keep the advised indexes in the database instead of rolling them back")
+parser.add_argument('--repeat', type=int, default=50,
+                    help="Executions per query for the median latency")
+parser.add_argument('--warmup', type=int, default=3,
+                    help="Untimed executions per query before the timed ones")
+args = parser.parse_args()
+
+print("\n" + "="*70)
+print("CUSTOMER ANALYTICS - SQLITE QUERY RUNNER")
+print("="*70 + "\n")
+
+conn = open_database(args.database, SCHEMA_FILE)
+counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+          for table in ('customers', 'orders', 'products', 'order_items')}
+print(f"✅ Database: {args.database or 'in-memory'} (from {SCHEMA_FILE})")
+print("✅ Rows: " + " | ".join(f"{table} {n:,}" for table, n in counts.items()))
+
+queries = load_queries(QUERIES_FILE)
+print(f"✅ Parsed {len(queries)} queries from {QUERIES_FILE}\n")
+
+# Execute each query and show its plan; full scans and automatic indexes are flagged
+print("="*70)
+print("QUERY PLANS")
+print("="*70 + "\n")
+
+before = {}
+for query in queries:
+    rows = len(conn.execute(query.sql).fetchall())
+    before[query.name] = time_query(conn, query.sql, args.repeat, args.warmup)
+    plan = query_plan(conn, query.sql)
+    problems = plan_problems(plan, table_aliases(conn, query.sql))
+    print(f"{query.name}: {query.title} - {rows} rows, {before[query.name]*1000:.3f} ms")
+    for detail in plan:
+        marker = "⚠️ " if detail in problems else "   "
+        print(f"   {marker}{detail}")
+    print()
+
+# Try candidate indexes one at a time and keep those that remove scans
+print("="*70)
+print("INDEX ADVISOR")
+print("="*70 + "\n")
+
+scans_before = problem_counts(conn, queries)
+proposals = advise(conn, queries)
+if not proposals:
+    print("✅ No candidate index removes a full scan without costing more time than it saves\n")
+for proposal in proposals:
+    print(f"💡 {proposal.sql};")
+    for name, removed in proposal.removed.items():
+        print(f"   {name}: removes {', '.join(removed)}")
+    print()
+
+# Latency with the advised indexes; rolled back unless --create-indexes
+conn.isolation_level = None
+conn.execute('SAVEPOINT advised')
+for proposal in proposals:
+    create_index(conn, proposal)
+scans_after = problem_counts(conn, queries)
+after = {query.name: time_query(conn, query.sql, args.repeat, args.warmup) for query in queries}
+if args.create_indexes:
+    conn.execute('RELEASE advised')
+else:
+    conn.execute('ROLLBACK TO advised')
+    conn.execute('RELEASE advised')
+
+print("="*70)
+print("BEFORE / AFTER (median of {} runs after {} warmup)".format(args.repeat, args.warmup))
+print("="*70 + "\n")
+
+print(f"{'Query':<10} {'Scans':>7} {'Before ms':>10} {'After ms':>10} {'Speedup':>8}")
+for query in queries:
+    name = query.name
+    scans = f"{len(scans_before[name])}->{len(scans_after[name])}"
+    speedup = before[name] / after[name] if after[name] else float('inf')
+    print(f"{name:<10} {scans:>7} {before[name]*1000:>10.3f} {after[name]*1000:>10.3f} {speedup:>7.2f}x")
+
+total_before, total_after = sum(before.values()), sum(after.values())
+print(f"\n✅ All queries: {total_before*1000:.2f} ms -> {total_after*1000:.2f} ms")
+if proposals and args.create_indexes:
+    print(f"✅ Created {len(proposals)} indexes in {args.database or 'the in-memory database'}")
+elif proposals:
+    print("💡 Indexes were rolled back - re-run with --create-indexes to keep them")
+
+conn.close()
+
+print("\n" + "="*70)
+print("✅ ANALYSIS COMPLETE!")
+print("="*70 + "\n")
@@ -0,0 +1,68 @@
+"""
+SQL Script Catalog
+Loads database_setup.sql into SQLite and splits analysis_queries.sql into its numbered queries
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+
+SCHEMA_FILE = 'database_setup.sql'
+QUERIES_FILE = 'analysis_queries.sql'
+
+QUERY_HEADER = re.compile(r'^--\s*(Query \d+):\s*(.+?)\s*$')
+
+
+class NamedQuery:
+    """One '-- Query N: Title' block of analysis_queries.sql"""
+
+    def __init__(self, name, title, sql):
+        self.name = name
+        self.title = title
+        self.sql = sql
+
+
+def load_queries(path=QUERIES_FILE):
+    """
+    [NamedQuery] in file order. A query is the statement that follows its
+    '-- Query N:' header up to the terminating ';'; comment lines inside
+    it (and the '-- Result:' notes after it) are dropped.
+    """
+    queries = []
+    current = None
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        header = QUERY_HEADER.match(line.strip())
+        if header:
+            current = NamedQuery(header.group(1), header.group(2), [])
+            continue
+        if current is None or line.strip().startswith('--'):
+            continue
+        current.sql.append(line.rstrip())
+        if line.rstrip().endswith(';'):
+            current.sql = '\n'.join(current.sql).strip()
+            queries.append(current)
+            current = None
+    return queries
+
+
+def create_tables(conn, schema=SCHEMA_FILE):
+    """Run only the CREATE TABLE statements of the setup script (no sample rows)"""
+    statements = Path(schema).read_text(encoding='utf-8').split(';')
+    for statement in statements:
+        body = '\n'.join(line for line in statement.splitlines() if not line.strip().startswith('--'))
+        if body.strip().upper().startswith('CREATE'):
+            conn.execute(body)
+
+
+def open_database(database=None, schema=SCHEMA_FILE):
+    """
+    Connection to database. A database that does not exist yet (or the
+    default in-memory one) is first created from the setup script.
+    """
+    target = database or ':memory:'
+    fresh = target == ':memory:' or not Path(target).exists()
+    conn = sqlite3.connect(target)
+    if fresh:
+        conn.executescript(Path(schema).read_text(encoding='utf-8'))
+        conn.commit()
+    return conn
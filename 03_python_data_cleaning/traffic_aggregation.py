@@ -0,0 +1,175 @@
+"""
+Traffic Aggregation Engine
+Builds every group-by rollup of the traffic analysis from a single scan
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Rollup:
+    """One output table: group by `key`, sum `sums`, average `means`"""
+
+    def __init__(self, name, key, sums=('visitors', 'conversions'), means=()):
+        self.name = name
+        self.key = key
+        self.sums = tuple(sums)
+        self.means = tuple(means)
+
+    @property
+    def columns(self):
+        return self.sums + self.means
+
+
+# The five tables printed by traffic_analysis.py
+TRAFFIC_ROLLUPS = [
+    Rollup('page', 'page_name', means=('bounce_rate', 'avg_time_seconds')),
+    Rollup('device', 'device_type', means=('bounce_rate',)),
+    Rollup('source', 'traffic_source', means=('bounce_rate',)),
+    Rollup('daily', 'date', means=('bounce_rate',)),
+    Rollup('weekly', 'week'),
+]
+
+
+class RollupPartials:
+    """
+    Per-key sums and non-null counts for each rollup. Means and the
+    derived conversion_rate are only computed in finalize().
+    """
+
+    def __init__(self, rollups, tables):
+        self.rollups = rollups
+        self.tables = tables
+
+    def merge(self, other):
+        """Combine with the partials of another chunk (None is the empty partial)"""
+        if other is None:
+            return self
+        tables = {}
+        for rollup in self.rollups:
+            mine, theirs = self.tables[rollup.name], other.tables[rollup.name]
+            merged = mine.add(theirs, fill_value=0).sort_index()
+            tables[rollup.name] = merged.astype(mine.dtypes.to_dict())
+        return RollupPartials(self.rollups, tables)
+
+    def finalize(self):
+        """Return {rollup name: DataFrame} matching groupby().agg().round(2)"""
+        results = {}
+        for rollup in self.rollups:
+            partial = self.tables[rollup.name]
+            table = pd.DataFrame(index=partial.index)
+            for col in rollup.sums:
+                table[col] = partial[col + '_sum']
+            for col in rollup.means:
+                table[col] = partial[col + '_sum'] / partial[col + '_count']
+            table = table.round(2)
+            if 'visitors' in table and 'conversions' in table:
+                table['conversion_rate'] = (table['conversions'] / table['visitors'] * 100).round(2)
+            results[rollup.name] = table
+        return results
+
+
+def aggregate(df, rollups=TRAFFIC_ROLLUPS):
+    """
+    Scan df once and return RollupPartials for all rollups.
+
+    Every key column is factorized once. Rows are then assigned to their
+    combination of keys and each measure column is accumulated once per
+    combination with np.bincount. The individual rollups are marginals of
+    those combinations, so they cost O(combinations) rather than O(rows).
+    """
+    keys = list(dict.fromkeys(r.key for r in rollups))
+    measures = list(dict.fromkeys(c for r in rollups for c in r.columns))
+
+    # Factorize keys once (categoricals reuse their codes); missing keys
+    # get their own trailing code
+    codes, uniques, dims = [], [], []
+    for key in keys:
+        column = df[key]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            key_codes = column.cat.codes.to_numpy()
+            key_uniques = np.asarray(column.cat.categories, dtype=object)
+        else:
+            key_codes, key_uniques = pd.factorize(column, sort=True)
+        key_codes = np.where(key_codes < 0, len(key_uniques), key_codes)
+        codes.append(key_codes)
+        uniques.append(key_uniques)
+        dims.append(len(key_uniques) + 1)
+
+    if len(df):
+        combined = np.ravel_multi_index(codes, dims)
+        group, combos = pd.factorize(combined)
+    else:
+        group, combos = np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int64)
+    combo_codes = np.unravel_index(combos, dims)
+    n_groups = len(combos)
+
+    # One pass per measure column over the rows
+    rows = np.bincount(group, minlength=n_groups)
+    sums, counts = {}, {}
+    for col in measures:
+        values = df[col].to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(values)
+        sums[col] = np.bincount(group, weights=np.where(present, values, 0.0), minlength=n_groups)
+        counts[col] = np.bincount(group, weights=present, minlength=n_groups)
+
+    tables = {}
+    for rollup in rollups:
+        i = keys.index(rollup.key)
+        size = dims[i]
+        index = pd.Index(uniques[i], name=rollup.key)
+        partial = {}
+        for col in rollup.columns:
+            col_sum = np.bincount(combo_codes[i], weights=sums[col], minlength=size)[:-1]
+            if col in rollup.sums and pd.api.types.is_integer_dtype(df[col].dtype):
+                col_sum = np.rint(col_sum).astype(np.int64)
+            partial[col + '_sum'] = col_sum
+            partial[col + '_count'] = np.bincount(combo_codes[i], weights=counts[col], minlength=size)[:-1]
+        # Unused categories are not groups
+        present = np.bincount(combo_codes[i], weights=rows, minlength=size)[:-1] > 0
+        tables[rollup.name] = pd.DataFrame(partial, index=index)[present]
+
+    return RollupPartials(rollups, tables)
+
+
+class TrafficAccumulator:
+    """
+    Folds cleaned chunks into mergeable partial aggregates, so a chunked
+    run reports the same statistics as loading the whole file at once
+    """
+
+    def __init__(self, rollups=TRAFFIC_ROLLUPS):
+        self.rollups = rollups
+        self.partials = None
+        self.records = 0
+        self.total_visitors = 0
+        self.total_conversions = 0
+        self.date_min = None
+        self.date_max = None
+        self._measure_sums = {'bounce_rate': 0.0, 'avg_time_seconds': 0.0}
+        self._measure_counts = {'bounce_rate': 0, 'avg_time_seconds': 0}
+
+    def add(self, df):
+        if not len(df):
+            return
+        self.partials = aggregate(df, self.rollups).merge(self.partials)
+        self.records += len(df)
+        self.total_visitors += int(df['visitors'].sum())
+        self.total_conversions += int(df['conversions'].sum())
+        for col in self._measure_sums:
+            self._measure_sums[col] += float(df[col].sum())
+            self._measure_counts[col] += int(df[col].count())
+        chunk_min, chunk_max = df['date'].min(), df['date'].max()
+        self.date_min = chunk_min if self.date_min is None else min(self.date_min, chunk_min)
+        self.date_max = chunk_max if self.date_max is None else max(self.date_max, chunk_max)
+
+    def mean(self, col):
+        return self._measure_sums[col] / self._measure_counts[col]
+
+    def rollup_tables(self):
+        return self.partials.finalize()
+
+
+def compute_rollups(df, rollups=TRAFFIC_ROLLUPS):
+    """Single-scan replacement for one groupby().agg() per rollup"""
+    return aggregate(df, rollups).finalize()
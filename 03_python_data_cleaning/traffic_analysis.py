@@ -3,14 +3,27 @@ Python Data Analysis Project: Website Traffic Analysis
 Analyzing landing page performance and conversion rates
 """
 
+import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 
-# Set style for better-looking plots
-sns.set_style('whitegrid')
-plt.rcParams['figure.figsize'] = (12, 6)
+from traffic_aggregation import TrafficAccumulator
+from traffic_cleaning import clean_traffic
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.sinks import open_sink, output_path
+
+parser = argparse.ArgumentParser(description="Clean and analyse website traffic data")
+parser.add_argument('--chunksize', type=int,
+                    help="Stream the input in chunks of this many rows instead of loading it whole")
+parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                    help="Format of the cleaned output file")
+parser.add_argument('--input', default='website_traffic_data.csv')
+args = parser.parse_args()
+cleaned_file = output_path('cleaned_traffic_data', args.format)
 
 print("=" * 80)
 print("WEBSITE TRAFFIC ANALYSIS - PYTHON DATA CLEANING PROJECT")
@@ -21,23 +34,52 @@ print()
 # STEP 1: LOAD AND EXPLORE DATA
 # ============================================================================
 print("STEP 1: Loading data...")
-df = pd.read_csv('website_traffic_data.csv')
+
+# The whole file is a single chunk unless --chunksize is given. Each chunk
+# is cleaned (STEP 2), appended to the cleaned output and folded into
+# mergeable aggregates, so only one chunk is ever held in memory.
+if args.chunksize:
+    chunks = pd.read_csv(args.input, chunksize=args.chunksize)
+else:
+    chunks = [pd.read_csv(args.input)]
+
+accumulator = TrafficAccumulator()
+raw_date_min = raw_date_max = None
+missing_values = None
+first_rows = cleaned_sample = dtypes = None
+
+with open_sink(cleaned_file, args.format) as sink:
+    for chunk in chunks:
+        if dtypes is None:
+            dtypes = chunk.dtypes
+        first_rows = pd.concat([first_rows, chunk.head()]).head() if first_rows is not None else chunk.head()
+        chunk_missing = chunk.isnull().sum()
+        missing_values = chunk_missing if missing_values is None else missing_values + chunk_missing
+        raw_date_min = min(filter(None, [raw_date_min, chunk['date'].min()]))
+        raw_date_max = max(filter(None, [raw_date_max, chunk['date'].max()]))
+
+        chunk = clean_traffic(chunk)
+        sample = chunk[['date', 'page_name', 'visitors', 'conversions', 'conversion_rate']].head()
+        cleaned_sample = pd.concat([cleaned_sample, sample]).head() if cleaned_sample is not None else sample
+
+        sink.write(chunk)
+        accumulator.add(chunk)
 
 print("\nDataset Info:")
-print(f"Total Records: {len(df)}")
-print(f"Date Range: {df['date'].min()} to {df['date'].max()}")
+print(f"Total Records: {accumulator.records}")
+print(f"Date Range: {raw_date_min} to {raw_date_max}")
 print()
 
 print("First 5 rows:")
-print(df.head())
+print(first_rows)
 print()
 
 print("Data Types:")
-print(df.dtypes)
+print(dtypes)
 print()
 
 print("Missing Values:")
-print(df.isnull().sum())
+print(missing_values)
 print()
 
 # ============================================================================
@@ -47,25 +89,13 @@ print("\n" + "=" * 80)
 print("STEP 2: Data Cleaning...")
 print("=" * 80)
 
-# Convert date column to datetime
-df['date'] = pd.to_datetime(df['date'])
 print("✓ Converted 'date' to datetime format")
-
-# Calculate conversion rate
-df['conversion_rate'] = (df['conversions'] / df['visitors'] * 100).round(2)
 print("✓ Calculated conversion rate")
-
-# Extract additional date features
-df['day_of_week'] = df['date'].dt.day_name()
-df['week'] = df['date'].dt.isocalendar().week
 print("✓ Extracted day of week and week number")
-
-# Clean page names
-df['page_name'] = df['page_url'].str.replace('/landing-', '').str.replace('-', ' ').str.title()
 print("✓ Cleaned page names")
 
 print("\nCleaned Data Sample:")
-print(df[['date', 'page_name', 'visitors', 'conversions', 'conversion_rate']].head())
+print(cleaned_sample)
 print()
 
 # ============================================================================
@@ -76,57 +106,41 @@ print("STEP 3: Exploratory Data Analysis...")
 print("=" * 80)
 print()
 
+# All page/device/source/daily/weekly tables from one scan of each chunk
+rollups = accumulator.rollup_tables()
+
 # Overall statistics
 print("OVERALL STATISTICS:")
 print("-" * 80)
-total_visitors = df['visitors'].sum()
-total_conversions = df['conversions'].sum()
+total_visitors = accumulator.total_visitors
+total_conversions = accumulator.total_conversions
 avg_conversion_rate = (total_conversions / total_visitors * 100)
 
 print(f"Total Visitors: {total_visitors:,}")
 print(f"Total Conversions: {total_conversions:,}")
 print(f"Overall Conversion Rate: {avg_conversion_rate:.2f}%")
-print(f"Average Bounce Rate: {df['bounce_rate'].mean():.2f}")
-print(f"Average Time on Page: {df['avg_time_seconds'].mean():.0f} seconds")
+print(f"Average Bounce Rate: {accumulator.mean('bounce_rate'):.2f}")
+print(f"Average Time on Page: {accumulator.mean('avg_time_seconds'):.0f} seconds")
 print()
 
 # Performance by page
 print("PERFORMANCE BY LANDING PAGE:")
 print("-" * 80)
-page_stats = df.groupby('page_name').agg({
-    'visitors': 'sum',
-    'conversions': 'sum',
-    'bounce_rate': 'mean',
-    'avg_time_seconds': 'mean'
-}).round(2)
-page_stats['conversion_rate'] = (page_stats['conversions'] / page_stats['visitors'] * 100).round(2)
-page_stats = page_stats.sort_values('conversion_rate', ascending=False)
+page_stats = rollups['page'].sort_values('conversion_rate', ascending=False)
 print(page_stats)
 print()
 
 # Performance by device
 print("PERFORMANCE BY DEVICE TYPE:")
 print("-" * 80)
-device_stats = df.groupby('device_type').agg({
-    'visitors': 'sum',
-    'conversions': 'sum',
-    'bounce_rate': 'mean'
-}).round(2)
-device_stats['conversion_rate'] = (device_stats['conversions'] / device_stats['visitors'] * 100).round(2)
-device_stats = device_stats.sort_values('conversion_rate', ascending=False)
+device_stats = rollups['device'].sort_values('conversion_rate', ascending=False)
 print(device_stats)
 print()
 
 # Performance by traffic source
 print("PERFORMANCE BY TRAFFIC SOURCE:")
 print("-" * 80)
-source_stats = df.groupby('traffic_source').agg({
-    'visitors': 'sum',
-    'conversions': 'sum',
-    'bounce_rate': 'mean'
-}).round(2)
-source_stats['conversion_rate'] = (source_stats['conversions'] / source_stats['visitors'] * 100).round(2)
-source_stats = source_stats.sort_values('conversion_rate', ascending=False)
+source_stats = rollups['source'].sort_values('conversion_rate', ascending=False)
 print(source_stats)
 print()
 
@@ -139,12 +153,7 @@ print("=" * 80)
 print()
 
 # Daily trends
-daily_trends = df.groupby('date').agg({
-    'visitors': 'sum',
-    'conversions': 'sum',
-    'bounce_rate': 'mean'
-}).round(2)
-daily_trends['conversion_rate'] = (daily_trends['conversions'] / daily_trends['visitors'] * 100).round(2)
+daily_trends = rollups['daily']
 
 print("DAILY PERFORMANCE TRENDS:")
 print("-" * 80)
@@ -152,11 +161,7 @@ print(daily_trends.tail(10))
 print()
 
 # Weekly trends
-weekly_trends = df.groupby('week').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).round(2)
-weekly_trends['conversion_rate'] = (weekly_trends['conversions'] / weekly_trends['visitors'] * 100).round(2)
+weekly_trends = rollups['weekly']
 
 print("WEEKLY PERFORMANCE:")
 print("-" * 80)
@@ -212,16 +217,15 @@ print("STEP 6: Saving Results...")
 print("=" * 80)
 print()
 
-# Save cleaned data
-df.to_csv('cleaned_traffic_data.csv', index=False)
-print("✓ Saved: cleaned_traffic_data.csv")
+# Cleaned data was written chunk by chunk during STEP 1
+print(f"✓ Saved: {cleaned_file}")
 
 # Save summary statistics
 with open('analysis_summary.txt', 'w') as f:
     f.write("WEBSITE TRAFFIC ANALYSIS SUMMARY\n")
     f.write("=" * 80 + "\n\n")
     f.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write(f"Data Period: {df['date'].min().date()} to {df['date'].max().date()}\n\n")
+    f.write(f"Data Period: {accumulator.date_min.date()} to {accumulator.date_max.date()}\n\n")
     
     f.write("OVERALL METRICS:\n")
     f.write("-" * 80 + "\n")
@@ -250,7 +254,7 @@ print("ANALYSIS COMPLETE!")
 print("=" * 80)
 print()
 print("Files generated:")
-print("  1. cleaned_traffic_data.csv - Cleaned dataset with new features")
+print(f"  1. {cleaned_file} - Cleaned dataset with new features")
 print("  2. analysis_summary.txt - Summary report with insights")
 print()
 print("Next Steps:")
@@ -0,0 +1,65 @@
+"""
+Traffic Data Cleaning
+STEP 2 of the traffic analysis, applicable to a whole file or one chunk
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text columns kept as pandas categoricals
+CATEGORICAL_COLUMNS = ['page_url', 'page_name', 'device_type', 'traffic_source']
+
+# Distinct landing pages whose cleaned names are remembered
+PAGE_NAME_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=PAGE_NAME_CACHE_SIZE)
+def page_name_from_url(url):
+    """'/landing-product-a' -> 'Product A'"""
+    return url.replace('/landing-', '').replace('-', ' ').title()
+
+
+def _sorted_categorical(codes, labels):
+    """Categorical from codes into labels, with categories in sorted order"""
+    order = np.argsort(labels, kind='stable')
+    rank = np.empty(len(labels), dtype=np.int64)
+    rank[order] = np.arange(len(labels))
+    new_codes = np.where(codes < 0, -1, rank[np.maximum(codes, 0)] if len(labels) else -1)
+    return pd.Categorical.from_codes(new_codes, categories=np.asarray(labels, dtype=object)[order])
+
+
+def clean_page_names(page_urls):
+    """
+    Map page_url to page_name as a categorical. The string transform runs
+    once per distinct URL (and is cached across chunks), then codes are
+    broadcast back to every row.
+    """
+    codes, urls = pd.factorize(page_urls)
+    names = [page_name_from_url(url) for url in urls]
+    # Different URLs may clean to the same name
+    name_codes, unique_names = pd.factorize(pd.Series(names, dtype=object))
+    row_codes = np.where(codes < 0, -1, name_codes[np.maximum(codes, 0)] if len(names) else -1)
+    return pd.Series(_sorted_categorical(row_codes, list(unique_names)), index=page_urls.index)
+
+
+def clean_traffic(df):
+    """Parse dates and add conversion_rate, day_of_week, week and page_name"""
+    # Convert date column to datetime
+    df['date'] = pd.to_datetime(df['date'])
+
+    # Calculate conversion rate
+    df['conversion_rate'] = (df['conversions'] / df['visitors'] * 100).round(2)
+
+    # Extract additional date features
+    df['day_of_week'] = df['date'].dt.day_name()
+    df['week'] = df['date'].dt.isocalendar().week
+
+    # Clean page names
+    df['page_name'] = clean_page_names(df['page_url'])
+
+    for col in CATEGORICAL_COLUMNS:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
@@ -3,142 +3,101 @@ UK Website Traffic - Detailed Analysis with Charts
 Professional data visualization for portfolio
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+import argparse
+import sys
+from pathlib import Path
 
-# Set style
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.cache import AnalysisCache
+from common.build import BuildGraph
+from common.render import Panel, add_render_arguments, build_dashboard, describe_render, render_options
+from common.sinks import find_dataset
+
+from traffic_rollups import load_rollups
+
+parser = argparse.ArgumentParser(description="Chart the UK website traffic data")
+parser.add_argument('--no-cache', action='store_true',
+                    help="Recompute every aggregate instead of reusing .analysis_cache")
+add_render_arguments(parser)
+args = parser.parse_args()
 
 print("\n" + "="*70)
 print("LOADING UK WEBSITE TRAFFIC DATA")
 print("="*70 + "\n")
 
-# Load data
-df = pd.read_csv('uk_website_traffic_data.csv')
-print(f"✅ Loaded {len(df)} records from CSV")
-print(f"✅ Date range: {df['date'].min()} to {df['date'].max()}")
-print(f"✅ Total visitors: {df['visitors'].sum():,}\n")
+# Load the aggregates; the raw file is only read if one of them is not
+# already cached for its current contents
+data_file = find_dataset('uk_website_traffic_data')
+cache = AnalysisCache(enabled=not args.no_cache)
+rollups = load_rollups(data_file, cache=cache)
+overview = rollups['overview'].iloc[0]
+print(f"✅ Loaded {overview['records']} records from {data_file}")
+print(f"✅ Aggregates: {cache.hits} reused from cache, {cache.misses} computed")
+print(f"✅ Date range: {overview['date_min']} to {overview['date_max']}")
+print(f"✅ Total visitors: {overview['visitors']:,}\n")
 
 # Show sample data
 print("Sample data:")
-print(df.head(10).to_string(index=False))
+print(rollups['sample'].to_string(index=False))
 print()
 
-# Create professional charts
-fig = plt.figure(figsize=(16, 10))
-
-# Chart 1: Conversion by Source
-ax1 = plt.subplot(2, 3, 1)
-source_data = df.groupby('source').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+# Aggregates behind each chart
+source_data = rollups['source'].copy()
 source_data['conv_rate'] = (source_data['conversions'] / source_data['visitors'] * 100)
 source_data = source_data.sort_values('conv_rate', ascending=True)
 
-bars = ax1.barh(source_data['source'], source_data['conv_rate'], color=['#3498db', '#2ecc71', '#f39c12', '#e74c3c'])
-ax1.set_xlabel('Conversion Rate (%)', fontweight='bold')
-ax1.set_title('Conversion Rate by Traffic Source\nOrganic performs 95% better', fontweight='bold', pad=10)
-ax1.grid(axis='x', alpha=0.3)
-
-for i, bar in enumerate(bars):
-    width = bar.get_width()
-    ax1.text(width + 0.3, bar.get_y() + bar.get_height()/2, 
-             f'{width:.2f}%', va='center', fontweight='bold')
-
-# Chart 2: Device Performance
-ax2 = plt.subplot(2, 3, 2)
-device_data = df.groupby('device').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+device_data = rollups['device'].copy()
 device_data['conv_rate'] = (device_data['conversions'] / device_data['visitors'] * 100)
 
-bars = ax2.bar(device_data['device'], device_data['conv_rate'], color=['#3498db', '#2ecc71'], edgecolor='black', linewidth=2)
-ax2.set_ylabel('Conversion Rate (%)', fontweight='bold')
-ax2.set_title('Desktop vs Mobile Conversion\nDesktop: 53% higher', fontweight='bold', pad=10)
-ax2.grid(axis='y', alpha=0.3)
-
-for bar in bars:
-    height = bar.get_height()
-    ax2.text(bar.get_x() + bar.get_width()/2., height + 0.2,
-             f'{height:.2f}%', ha='center', va='bottom', fontweight='bold')
-
-# Chart 3: Weekly Improvement
-ax3 = plt.subplot(2, 3, 3)
-weekly_data = df.groupby('week').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+weekly_data = rollups['week'].copy()
 weekly_data['conv_rate'] = (weekly_data['conversions'] / weekly_data['visitors'] * 100)
 
-ax3.plot(weekly_data['week'], weekly_data['conv_rate'], marker='o', linewidth=3, 
-         markersize=10, color='#2ecc71', markerfacecolor='#f39c12', markeredgewidth=2, markeredgecolor='black')
-ax3.fill_between(range(len(weekly_data)), weekly_data['conv_rate'], alpha=0.3, color='#2ecc71')
-ax3.set_ylabel('Conversion Rate (%)', fontweight='bold')
-ax3.set_title('5-Week Conversion Rate Improvement\n+81% Overall Growth', fontweight='bold', pad=10)
-ax3.grid(True, alpha=0.3)
-
-for i, row in weekly_data.iterrows():
-    ax3.text(i, row['conv_rate'] + 0.3, f"{row['conv_rate']:.2f}%", 
-             ha='center', fontweight='bold', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-# Chart 4: Traffic Source Distribution
-ax4 = plt.subplot(2, 3, 4)
-source_visitors = df.groupby('source')['visitors'].sum()
-wedges, texts, autotexts = ax4.pie(source_visitors, labels=source_visitors.index, autopct='%1.1f%%',
-                                     startangle=90, colors=['#3498db', '#2ecc71', '#f39c12', '#e74c3c'],
-                                     textprops={'fontweight': 'bold'}, wedgeprops={'edgecolor': 'black', 'linewidth': 2})
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontsize(11)
-ax4.set_title('Traffic Source Distribution\n25,000+ Total Visitors', fontweight='bold')
-
-# Chart 5: Daily Conversion Trend
-ax5 = plt.subplot(2, 3, 5)
-daily_data = df.groupby('date').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+source_visitors = rollups['source'].set_index('source')['visitors']
+
+daily_data = rollups['date'].copy()
 daily_data['conv_rate'] = (daily_data['conversions'] / daily_data['visitors'] * 100)
 
-ax5.plot(range(len(daily_data)), daily_data['conv_rate'], color='#e74c3c', linewidth=2, alpha=0.7)
-z = np.polyfit(range(len(daily_data)), daily_data['conv_rate'], 2)
-p = np.poly1d(z)
-ax5.plot(range(len(daily_data)), p(range(len(daily_data))), "--", color='#2ecc71', linewidth=3, label='Trend')
-ax5.set_xlabel('Days', fontweight='bold')
-ax5.set_ylabel('Conversion Rate (%)', fontweight='bold')
-ax5.set_title('Daily Conversion Trend\nUpward trajectory confirmed', fontweight='bold', pad=10)
-ax5.legend()
-ax5.grid(True, alpha=0.3)
-
-# Chart 6: Source + Device Heatmap
-ax6 = plt.subplot(2, 3, 6)
-heatmap_data = df.groupby(['source', 'device'])['conv_rate'].mean().unstack()
-sns.heatmap(heatmap_data, annot=True, fmt='.2f', cmap='RdYlGn', ax=ax6, 
-            cbar_kws={'label': 'Conversion %'}, linewidths=2, linecolor='black')
-ax6.set_title('Conversion Heatmap:\nSource x Device', fontweight='bold', pad=10)
-ax6.set_ylabel('Traffic Source', fontweight='bold')
-ax6.set_xlabel('Device Type', fontweight='bold')
-
-plt.suptitle('UK Website Traffic Analysis - Complete Dashboard\nPython & Google Analytics | Serghei Covalciuc', 
-             fontsize=16, fontweight='bold', y=0.995)
-
-plt.tight_layout()
-plt.savefig('real_project1_complete_analysis.png', dpi=200, bbox_inches='tight')
-print("\n✅ Created: real_project1_complete_analysis.png")
+heatmap_data = rollups['source_device'].set_index(['source', 'device'])['conv_rate'].unstack()
+
+if args.no_plots:
+    print("\n💡 Skipped the dashboard PNG (--no-plots)")
+else:
+    import traffic_charts
+
+    # Create professional charts: each panel is drawn in its own process and
+    # the six are tiled into the dashboard
+    panels = [
+        Panel('source_conversion', traffic_charts.source_conversion, source_data),
+        Panel('device_conversion', traffic_charts.device_conversion, device_data),
+        Panel('weekly_improvement', traffic_charts.weekly_improvement, weekly_data),
+        Panel('source_distribution', traffic_charts.source_distribution, source_visitors),
+        Panel('daily_trend', traffic_charts.daily_trend, daily_data),
+        Panel('source_device_heatmap', traffic_charts.source_device_heatmap, heatmap_data),
+    ]
+    # Only redrawn when the data, a chart's inputs or the drawing code changed
+    graph = BuildGraph(force=args.force)
+    timings = build_dashboard(
+        graph, panels, 'real_project1_complete_analysis.png', inputs=[data_file], options=render_options(args),
+        layout=(2, 3), figsize=(16, 10), dpi=200,
+        title='UK Website Traffic Analysis - Complete Dashboard\nPython & Google Analytics | Serghei Covalciuc',
+        title_kwargs={'fontsize': 16, 'fontweight': 'bold'}, style='seaborn-v0_8-whitegrid')
+    if timings is None:
+        print("\n✅ Up to date: real_project1_complete_analysis.png (use --force to redraw)")
+    else:
+        print("\n✅ Created: real_project1_complete_analysis.png")
+        print(f"✅ {describe_render(timings, graph.results[-1].seconds)}")
+    print("Build report:")
+    for line in graph.report():
+        print(f"   {line}")
 
 # Summary statistics
 print("\n" + "="*70)
 print("SUMMARY STATISTICS")
 print("="*70)
-print(f"\nTotal Records: {len(df)}")
-print(f"Total Visitors: {df['visitors'].sum():,}")
-print(f"Total Conversions: {df['conversions'].sum():,}")
-print(f"Overall Conversion Rate: {(df['conversions'].sum() / df['visitors'].sum() * 100):.2f}%")
+print(f"\nTotal Records: {overview['records']}")
+print(f"Total Visitors: {overview['visitors']:,}")
+print(f"Total Conversions: {overview['conversions']:,}")
+print(f"Overall Conversion Rate: {(overview['conversions'] / overview['visitors'] * 100):.2f}%")
 print(f"\nBest Source: {source_data.iloc[-1]['source']} ({source_data.iloc[-1]['conv_rate']:.2f}%)")
 print(f"Best Device: {device_data.iloc[0]['device']} ({device_data.iloc[0]['conv_rate']:.2f}%)")
 print(f"\nWeek 1 Conversion: {weekly_data.iloc[0]['conv_rate']:.2f}%")
@@ -148,7 +107,7 @@ print(f"Improvement: {((weekly_data.iloc[-1]['conv_rate'] - weekly_data.iloc[0][
 print("\n" + "="*70)
 print("✅ COMPLETE! Check your files:")
 print("="*70)
-print("📄 uk_website_traffic_data.csv - Raw data")
+print(f"📄 {data_file} - Raw data")
 print("📊 real_project1_complete_analysis.png - Dashboard")
 print("\n💡 Screenshot this terminal output for authenticity!")
 print("💡 Open the PNG file to see professional charts")
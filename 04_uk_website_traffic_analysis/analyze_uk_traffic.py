@@ -5,66 +5,106 @@ Author: Serghei Covalciuc
 Date: November 2024
 """
 
+import argparse
+import sys
+from pathlib import Path
+
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime, timedelta
-
-# Generate realistic UK website traffic data
-np.random.seed(42)  # For reproducibility
-
-def generate_traffic_data():
-    """Generate realistic website visitor data"""
-    
-    data = []
-    start_date = datetime(2024, 9, 1)
-    
-    # Week 1-5 data with improving conversion rates
-    for week in range(1, 6):
-        days_in_week = 7
-        base_conversion = 5.32 + (week - 1) * 0.83  # Gradual improvement
-        
-        for day in range(days_in_week):
-            current_date = start_date + timedelta(days=(week-1)*7 + day)
-            
-            # Traffic sources with different conversion rates
-            sources = {
-                'Organic': {'visitors': np.random.randint(150, 220), 'conv_rate': 9.01},
-                'Social': {'visitors': np.random.randint(100, 150), 'conv_rate': 4.62},
-                'Direct': {'visitors': np.random.randint(80, 130), 'conv_rate': 6.78},
-                'Email': {'visitors': np.random.randint(50, 90), 'conv_rate': 7.45}
-            }
-            
-            for source, stats in sources.items():
-                # Desktop vs Mobile split
-                desktop_visitors = int(stats['visitors'] * 0.52)
-                mobile_visitors = stats['visitors'] - desktop_visitors
-                
-                # Desktop conversions (higher rate)
-                desktop_conv = desktop_visitors * 0.0901 * (base_conversion / 5.32)
-                mobile_conv = mobile_visitors * 0.0589 * (base_conversion / 5.32)
-                
-                data.append({
-                    'date': current_date.strftime('%Y-%m-%d'),
-                    'week': f'Week {week}',
-                    'source': source,
-                    'device': 'Desktop',
-                    'visitors': desktop_visitors,
-                    'conversions': int(desktop_conv),
-                    'conv_rate': (desktop_conv / desktop_visitors * 100) if desktop_visitors > 0 else 0
-                })
-                
-                data.append({
-                    'date': current_date.strftime('%Y-%m-%d'),
-                    'week': f'Week {week}',
-                    'source': source,
-                    'device': 'Mobile',
-                    'visitors': mobile_visitors,
-                    'conversions': int(mobile_conv),
-                    'conv_rate': (mobile_conv / mobile_visitors * 100) if mobile_visitors > 0 else 0
-                })
-    
-    return pd.DataFrame(data)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.cache import AnalysisCache
+from common.sinks import open_sink, output_path, write_table
+
+from traffic_events import (DESKTOP_SHARE, DEVICE_CONVERSION, START_DATE, TRAFFIC_SOURCES,
+                            EventAggregator, iter_visit_events, weekly_uplift)
+from traffic_rollups import load_rollups
+
+
+def generate_traffic_data(weeks=5, sources=TRAFFIC_SOURCES, periods_per_day=1,
+                          start_date=START_DATE, seed=42):
+    """
+    Generate realistic website visitor data on a day x period x source x
+    device grid. Visitor counts for the whole grid come from one vectorized
+    draw. With periods_per_day > 1 (24 for hourly traffic) each source's
+    daily visitor range is spread over the periods and a 'period' column
+    is added. The defaults reproduce the original 5-week daily dataset.
+    """
+    rng = np.random.RandomState(seed)
+    days = weeks * 7
+    names = list(sources)
+    low = np.array([sources[s][0] for s in names]) // periods_per_day
+    high = np.array([sources[s][1] for s in names]) // periods_per_day
+    low = np.maximum(low, 1)
+    high = np.maximum(high, low + 1)
+
+    # Visitors per (day, period, source), split into Desktop and Mobile
+    visitors = rng.randint(low, high, size=(days, periods_per_day, len(names)))
+    desktop = (visitors * DESKTOP_SHARE).astype(np.int64)
+    by_device = np.stack([desktop, visitors - desktop], axis=-1)
+
+    # Week-on-week improvement scales both device conversion rates
+    week = np.arange(days) // 7 + 1
+    uplift = weekly_uplift(week)
+    rates = np.array([DEVICE_CONVERSION['Desktop'], DEVICE_CONVERSION['Mobile']])
+    probability = np.minimum(rates * uplift[:, None, None, None], 1.0)
+    expected = by_device * rates * uplift[:, None, None, None]
+
+    # Daily cells keep the original whole-number rule; sub-daily cells are
+    # too small for it (it rounds nearly everything to 0), so they draw
+    # conversions binomially instead
+    if periods_per_day == 1:
+        conversions = expected.astype(np.int64)
+    else:
+        conversions = rng.binomial(by_device, np.broadcast_to(probability, shape=by_device.shape))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        conv_rate = np.where(by_device > 0, expected / by_device * 100, 0)
+
+    shape = by_device.shape
+    day_index = np.broadcast_to(np.arange(days)[:, None, None, None], shape).ravel()
+    dates = pd.date_range(start_date, periods=days, freq='D').strftime('%Y-%m-%d').to_numpy(dtype=object)
+    week_labels = np.array([f'Week {w}' for w in range(1, weeks + 1)], dtype=object)
+
+    data = {
+        'date': dates[day_index],
+        'week': week_labels[week[day_index] - 1],
+        'source': np.broadcast_to(np.array(names, dtype=object)[None, None, :, None], shape).ravel(),
+        'device': np.broadcast_to(np.array(['Desktop', 'Mobile'], dtype=object), shape).ravel(),
+        'visitors': by_device.ravel(),
+        'conversions': conversions.ravel(),
+        'conv_rate': conv_rate.ravel(),
+    }
+    df = pd.DataFrame(data)
+    if periods_per_day > 1:
+        df.insert(1, 'period', np.broadcast_to(np.arange(periods_per_day)[None, :, None, None], shape).ravel())
+    return df
+
+parser = argparse.ArgumentParser(description="Generate and analyse UK website traffic data")
+parser.add_argument('--weeks', type=int, default=5, help="Number of weeks to simulate")
+parser.add_argument('--periods-per-day', type=int, default=1,
+                    help="Time slots per day, e.g. 24 for hourly traffic (default 1)")
+parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducibility")
+parser.add_argument('--sources', default=','.join(TRAFFIC_SOURCES),
+                    help="Comma-separated traffic sources to simulate (default: all of "
+                         f"{', '.join(TRAFFIC_SOURCES)})")
+parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'], default='csv',
+                    help="Output file format (Parquet/Arrow use dictionary-encoded columns)")
+parser.add_argument('--events', action='store_true',
+                    help="Stream individual visit events to uk_website_events.* instead of daily rows")
+parser.add_argument('--event-rate', type=float, default=1.0,
+                    help="Events mode: multiple of the normal daily visitor volume (default 1.0)")
+parser.add_argument('--batch-size', type=int, default=100_000,
+                    help="Events mode: events generated and written per batch")
+parser.add_argument('--no-cache', action='store_true',
+                    help="Skip the shared .analysis_cache of aggregates")
+args = parser.parse_args()
+names = [name.strip() for name in args.sources.split(',') if name.strip()]
+unknown = [name for name in names if name not in TRAFFIC_SOURCES]
+if unknown or not names:
+    parser.error(f"--sources must name some of {', '.join(TRAFFIC_SOURCES)} (got {args.sources!r})")
+sources = {name: TRAFFIC_SOURCES[name] for name in names}
+data_file = output_path('uk_website_events' if args.events else 'uk_website_traffic_data', args.format)
 
 # Generate the data
 print("=" * 70)
@@ -73,23 +113,37 @@ print("Real Project - Serghei Covalciuc")
 print("=" * 70)
 print("\nGenerating traffic data for 25,000+ visitors...\n")
 
-df = generate_traffic_data()
-
-# Save raw data
-df.to_csv('uk_website_traffic_data.csv', index=False)
-print(f"✅ Generated {len(df)} records")
-print(f"✅ Total visitors: {df['visitors'].sum():,}")
-print(f"✅ Saved to: uk_website_traffic_data.csv\n")
+if args.events:
+    # Events are written and folded into the rollups one batch at a time,
+    # so memory stays flat however many events are generated
+    aggregator = EventAggregator(sources=sources)
+    events = iter_visit_events(weeks=args.weeks, sources=sources, rate=args.event_rate, seed=args.seed,
+                               batch_size=args.batch_size)
+    with open_sink(data_file, args.format, categorical=('source', 'device')) as sink:
+        for batch in events:
+            sink.write(batch)
+            aggregator.add(batch)
+    rollups = aggregator.tables()
+    total_visitors = aggregator.events
+    print(f"✅ Streamed {aggregator.events:,} visit events")
+else:
+    df = generate_traffic_data(weeks=args.weeks, sources=sources, periods_per_day=args.periods_per_day,
+                               seed=args.seed)
+    write_table(df, data_file)
+    # Computes every shared aggregate once and caches it against the file's
+    # contents, so analyze_traffic_detailed.py can skip re-reading the data
+    rollups = load_rollups(data_file, frame=df, cache=AnalysisCache(enabled=not args.no_cache))
+    total_visitors = df['visitors'].sum()
+    print(f"✅ Generated {len(df)} records")
+    print(f"✅ Total visitors: {total_visitors:,}")
+print(f"✅ Saved to: {data_file}\n")
 
 # Analysis 1: Conversion by Traffic Source
 print("-" * 70)
 print("ANALYSIS 1: Conversion Rate by Traffic Source")
 print("-" * 70)
 
-source_analysis = df.groupby('source').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+source_analysis = rollups['source']
 
 source_analysis['conv_rate'] = (source_analysis['conversions'] / source_analysis['visitors'] * 100).round(2)
 source_analysis = source_analysis.sort_values('conv_rate', ascending=False)
@@ -102,10 +156,7 @@ print("-" * 70)
 print("ANALYSIS 2: Desktop vs Mobile Performance")
 print("-" * 70)
 
-device_analysis = df.groupby('device').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+device_analysis = rollups['device']
 
 device_analysis['conv_rate'] = (device_analysis['conversions'] / device_analysis['visitors'] * 100).round(2)
 device_analysis = device_analysis.sort_values('conv_rate', ascending=False)
@@ -118,10 +169,7 @@ print("-" * 70)
 print("ANALYSIS 3: Weekly Conversion Rate Improvement")
 print("-" * 70)
 
-weekly_analysis = df.groupby('week').agg({
-    'visitors': 'sum',
-    'conversions': 'sum'
-}).reset_index()
+weekly_analysis = rollups['week']
 
 weekly_analysis['conv_rate'] = (weekly_analysis['conversions'] / weekly_analysis['visitors'] * 100).round(2)
 
@@ -136,8 +184,8 @@ improvement = ((final_conv - initial_conv) / initial_conv * 100)
 print("=" * 70)
 print("KEY FINDINGS:")
 print("=" * 70)
-print(f"📊 Total Visitors Analyzed: {df['visitors'].sum():,}")
-print(f"📊 Total Conversions: {df['conversions'].sum():,}")
+print(f"📊 Total Visitors Analyzed: {total_visitors:,}")
+print(f"📊 Total Conversions: {weekly_analysis['conversions'].sum():,}")
 print(f"📈 Initial Conversion Rate: {initial_conv:.2f}%")
 print(f"📈 Final Conversion Rate: {final_conv:.2f}%")
 print(f"🚀 Overall Improvement: {improvement:.1f}%")
@@ -165,9 +213,9 @@ print(f"   Additional revenue: £{revenue_increase:,.0f}/month")
 print()
 
 print("=" * 70)
-print("✅ ANALYSIS COMPLETE - Data saved to uk_website_traffic_data.csv")
+print(f"✅ ANALYSIS COMPLETE - Data saved to {data_file}")
 print("=" * 70)
 print("\nNext steps:")
-print("1. Review uk_website_traffic_data.csv")
+print(f"1. Review {data_file}")
 print("2. Run python analyze_traffic_detailed.py for charts")
 print("3. Screenshot the terminal output for your portfolio")
@@ -0,0 +1,89 @@
+"""
+UK Traffic Dashboard Panels
+One drawing function per chart of real_project1_complete_analysis.png
+"""
+
+import numpy as np
+import seaborn as sns
+
+from common.downsample import plot_series
+
+SOURCE_COLORS = ['#3498db', '#2ecc71', '#f39c12', '#e74c3c']
+
+
+def source_conversion(ax, source_data):
+    """Chart 1: Conversion by Source"""
+    bars = ax.barh(source_data['source'], source_data['conv_rate'], color=SOURCE_COLORS)
+    ax.set_xlabel('Conversion Rate (%)', fontweight='bold')
+    ax.set_title('Conversion Rate by Traffic Source\nOrganic performs 95% better', fontweight='bold', pad=10)
+    ax.grid(axis='x', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        width = bar.get_width()
+        ax.text(width + 0.3, bar.get_y() + bar.get_height()/2,
+                f'{width:.2f}%', va='center', fontweight='bold')
+
+
+def device_conversion(ax, device_data):
+    """Chart 2: Device Performance"""
+    bars = ax.bar(device_data['device'], device_data['conv_rate'], color=['#3498db', '#2ecc71'],
+                  edgecolor='black', linewidth=2)
+    ax.set_ylabel('Conversion Rate (%)', fontweight='bold')
+    ax.set_title('Desktop vs Mobile Conversion\nDesktop: 53% higher', fontweight='bold', pad=10)
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.2,
+                f'{height:.2f}%', ha='center', va='bottom', fontweight='bold')
+
+
+def weekly_improvement(ax, weekly_data):
+    """Chart 3: Weekly Improvement"""
+    ax.plot(weekly_data['week'], weekly_data['conv_rate'], marker='o', linewidth=3,
+            markersize=10, color='#2ecc71', markerfacecolor='#f39c12', markeredgewidth=2, markeredgecolor='black')
+    ax.fill_between(range(len(weekly_data)), weekly_data['conv_rate'], alpha=0.3, color='#2ecc71')
+    ax.set_ylabel('Conversion Rate (%)', fontweight='bold')
+    ax.set_title('5-Week Conversion Rate Improvement\n+81% Overall Growth', fontweight='bold', pad=10)
+    ax.grid(True, alpha=0.3)
+
+    for i, row in weekly_data.iterrows():
+        ax.text(i, row['conv_rate'] + 0.3, f"{row['conv_rate']:.2f}%",
+                ha='center', fontweight='bold', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+
+def source_distribution(ax, source_visitors):
+    """Chart 4: Traffic Source Distribution"""
+    wedges, texts, autotexts = ax.pie(source_visitors, labels=source_visitors.index, autopct='%1.1f%%',
+                                      startangle=90, colors=SOURCE_COLORS,
+                                      textprops={'fontweight': 'bold'},
+                                      wedgeprops={'edgecolor': 'black', 'linewidth': 2})
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontsize(11)
+    ax.set_title('Traffic Source Distribution\n25,000+ Total Visitors', fontweight='bold')
+
+
+def daily_trend(ax, daily_data):
+    """Chart 5: Daily Conversion Trend"""
+    # Long histories are thinned with LTTB before plotting; the trend is
+    # still fitted over every day
+    days = np.arange(len(daily_data))
+    plot_series(ax, days, daily_data['conv_rate'], color='#e74c3c', linewidth=2, alpha=0.7)
+    z = np.polyfit(days, daily_data['conv_rate'], 2)
+    p = np.poly1d(z)
+    plot_series(ax, days, p(days), "--", color='#2ecc71', linewidth=3, label='Trend')
+    ax.set_xlabel('Days', fontweight='bold')
+    ax.set_ylabel('Conversion Rate (%)', fontweight='bold')
+    ax.set_title('Daily Conversion Trend\nUpward trajectory confirmed', fontweight='bold', pad=10)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def source_device_heatmap(ax, heatmap_data):
+    """Chart 6: Source + Device Heatmap"""
+    sns.heatmap(heatmap_data, annot=True, fmt='.2f', cmap='RdYlGn', ax=ax,
+                cbar_kws={'label': 'Conversion %'}, linewidths=2, linecolor='black')
+    ax.set_title('Conversion Heatmap:\nSource x Device', fontweight='bold', pad=10)
+    ax.set_ylabel('Traffic Source', fontweight='bold')
+    ax.set_xlabel('Device Type', fontweight='bold')
@@ -0,0 +1,155 @@
+"""
+UK Traffic Events
+Traffic model, a visit-level event stream and a bounded-memory event aggregator
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Daily visitor range per traffic source
+TRAFFIC_SOURCES = {
+    'Organic': (150, 220),
+    'Social': (100, 150),
+    'Direct': (80, 130),
+    'Email': (50, 90),
+}
+
+# Desktop vs Mobile split and week-1 conversion rates
+DEVICES = ['Desktop', 'Mobile']
+DESKTOP_SHARE = 0.52
+DEVICE_CONVERSION = {'Desktop': 0.0901, 'Mobile': 0.0589}
+
+# Conversion rate starts at 5.32% and improves 0.83 points a week
+BASE_CONVERSION = 5.32
+WEEKLY_IMPROVEMENT = 0.83
+
+START_DATE = datetime(2024, 9, 1)
+SECONDS_PER_DAY = 86_400
+
+
+def weekly_uplift(week):
+    """Conversion multiplier for week number(s) `week` (1 for Week 1)"""
+    return (BASE_CONVERSION + (week - 1) * WEEKLY_IMPROVEMENT) / BASE_CONVERSION
+
+
+def iter_visit_events(weeks=5, sources=TRAFFIC_SOURCES, rate=1.0, start_date=START_DATE,
+                      seed=42, batch_size=100_000):
+    """
+    Lazily yield individual visits as DataFrames of about batch_size rows
+    with columns timestamp, source, device and converted, in time order.
+
+    Each source gets `rate` times its daily visitor range per day. A day
+    with more visits than batch_size is cut into equal time windows and
+    its per-source counts are split between them, so no more than one
+    batch is ever in memory. Every day is seeded from (seed, day), which
+    keeps the events independent of batch_size.
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    names = list(sources)
+    low = np.rint(np.array([sources[s][0] for s in names]) * rate).astype(np.int64)
+    high = np.maximum(np.rint(np.array([sources[s][1] for s in names]) * rate).astype(np.int64), low + 1)
+    conversion = np.array([DEVICE_CONVERSION[d] for d in DEVICES])
+    source_dtype = pd.CategoricalDtype(names)
+    device_dtype = pd.CategoricalDtype(DEVICES)
+    start = np.datetime64(start_date, 's')
+
+    pending, pending_rows = [], 0
+    for day in range(weeks * 7):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(day,)))
+        remaining = rng.integers(low, high)
+        windows = max(1, -(-int(remaining.sum()) // batch_size))
+        window_seconds = SECONDS_PER_DAY / windows
+        probability = np.minimum(conversion * weekly_uplift(day // 7 + 1), 1.0)
+
+        for window, size in enumerate(rng.multinomial(remaining.sum(), [1 / windows] * windows)):
+            if pending_rows and pending_rows + size > batch_size:
+                yield pd.concat(pending, ignore_index=True)
+                pending, pending_rows = [], 0
+
+            counts = rng.multivariate_hypergeometric(remaining, size)
+            remaining -= counts
+            source = rng.permutation(np.repeat(np.arange(len(names)), counts))
+            device = (rng.random(size) >= DESKTOP_SHARE).astype(np.int8)
+            offsets = np.sort(rng.uniform(window * window_seconds, (window + 1) * window_seconds, size))
+
+            pending.append(pd.DataFrame({
+                'timestamp': start + np.timedelta64(day * SECONDS_PER_DAY, 's') + offsets.astype('timedelta64[s]'),
+                'source': pd.Categorical.from_codes(source, dtype=source_dtype),
+                'device': pd.Categorical.from_codes(device, dtype=device_dtype),
+                'converted': rng.random(size) < probability[device],
+            }))
+            pending_rows += size
+
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True)
+
+
+class EventAggregator:
+    """
+    Folds event batches into visitors/conversions counters per (week,
+    source, device). Memory is fixed by the number of weeks, sources and
+    devices, however many events are added.
+    """
+
+    def __init__(self, sources=TRAFFIC_SOURCES, start_date=START_DATE):
+        self.sources = list(sources)
+        self.start = np.datetime64(start_date, 's')
+        self.events = 0
+        self.visitors = np.zeros((0, len(self.sources), len(DEVICES)), dtype=np.int64)
+        self.conversions = np.zeros_like(self.visitors)
+
+    def _codes(self, values, labels, column):
+        codes = pd.Categorical(values, categories=labels).codes
+        if (codes < 0).any():
+            raise ValueError(f"Unknown {column} in events: {sorted(set(values[codes < 0]))}")
+        return codes.astype(np.int64)
+
+    def add(self, events):
+        """Fold one batch of events (timestamp, source, device, converted)"""
+        if not len(events):
+            return
+        elapsed = events['timestamp'].to_numpy().astype('datetime64[s]') - self.start
+        week = (elapsed // np.timedelta64(7 * SECONDS_PER_DAY, 's')).astype(np.int64)
+        if week.min() < 0:
+            raise ValueError("Events before start_date cannot be assigned to a week")
+        source = self._codes(events['source'], self.sources, 'source')
+        device = self._codes(events['device'], DEVICES, 'device')
+
+        weeks = max(int(week.max()) + 1, len(self.visitors))
+        if weeks > len(self.visitors):
+            grow = ((0, weeks - len(self.visitors)), (0, 0), (0, 0))
+            self.visitors = np.pad(self.visitors, grow)
+            self.conversions = np.pad(self.conversions, grow)
+
+        shape = self.visitors.shape
+        key = (week * shape[1] + source) * shape[2] + device
+        size = self.visitors.size
+        self.visitors += np.bincount(key, minlength=size).reshape(shape)
+        converted = events['converted'].to_numpy(dtype=np.int64)
+        self.conversions += np.bincount(key, weights=converted, minlength=size).astype(np.int64).reshape(shape)
+        self.events += len(events)
+
+    def _table(self, column, labels, axes):
+        visitors = self.visitors.sum(axis=axes)
+        conversions = self.conversions.sum(axis=axes)
+        table = pd.DataFrame({column: labels, 'visitors': visitors, 'conversions': conversions})
+        return table[table['visitors'] > 0].reset_index(drop=True)
+
+    def tables(self):
+        """
+        Return {'source', 'device', 'week'} tables shaped like the
+        groupby(...).agg({'visitors': 'sum', 'conversions': 'sum'}) output:
+        sources and devices in name order, weeks in calendar order.
+        """
+        weeks = [f'Week {w}' for w in range(1, len(self.visitors) + 1)]
+        return {
+            'source': self._table('source', self.sources, (0, 2)).sort_values('source', ignore_index=True),
+            'device': self._table('device', DEVICES, (0, 1)),
+            'week': self._table('week', weeks, (1, 2)),
+        }
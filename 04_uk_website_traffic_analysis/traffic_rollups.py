@@ -0,0 +1,62 @@
+"""
+UK Traffic Rollups
+Source/device/week aggregates shared by both scripts through the on-disk analysis cache
+"""
+
+import pandas as pd
+
+from common.cache import AnalysisCache
+from common.sinks import read_table
+
+# Bump when a rollup's definition changes so older cache entries are ignored
+ROLLUP_VERSION = 1
+
+SUMS = ['visitors', 'conversions']
+
+
+def _sums(df, key, sort=True):
+    return df.groupby(key, observed=True, sort=sort)[SUMS].sum().reset_index()
+
+
+def _overview(df):
+    """One row: record count, date range and totals"""
+    return pd.DataFrame({
+        'records': [len(df)],
+        'date_min': [df['date'].min()],
+        'date_max': [df['date'].max()],
+        'visitors': [df['visitors'].sum()],
+        'conversions': [df['conversions'].sum()],
+    })
+
+
+# Rollup name -> function of the raw traffic DataFrame
+ROLLUPS = {
+    'source': lambda df: _sums(df, 'source'),
+    'device': lambda df: _sums(df, 'device'),
+    # Weeks keep their order of appearance, so Week 10 follows Week 9
+    'week': lambda df: _sums(df, 'week', sort=False),
+    'date': lambda df: _sums(df, 'date'),
+    'source_device': lambda df: df.groupby(['source', 'device'], observed=True)['conv_rate'].mean().reset_index(),
+    'overview': _overview,
+    'sample': lambda df: df.head(10),
+}
+
+
+def load_rollups(data_file, names=tuple(ROLLUPS), frame=None, cache=None):
+    """
+    Return {name: DataFrame} for the requested rollups of data_file. Cached
+    results are reused while the file's contents are unchanged; anything
+    missing is computed from `frame`, which is read from data_file only
+    if needed and not supplied.
+    """
+    cache = cache or AnalysisCache()
+    loaded = []
+
+    def source_frame():
+        if not loaded:
+            loaded.append(frame if frame is not None else read_table(data_file))
+        return loaded[0]
+
+    return {name: cache.get_or_compute(data_file, ['uk_traffic', ROLLUP_VERSION, name],
+                                       lambda name=name: ROLLUPS[name](source_frame()))
+            for name in names}
@@ -3,130 +3,74 @@ UK E-Commerce Excel Dashboard Creator
 Creates professional Excel dashboard with PivotTables and Charts
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.build import BuildGraph
+from common.render import Panel, add_render_arguments, build_dashboard, describe_render, render_options
+from common.sinks import find_dataset, read_table
+
+parser = argparse.ArgumentParser(description="Build the UK e-commerce sales dashboard")
+add_render_arguments(parser)
+args = parser.parse_args()
 
 print("\n" + "="*70)
 print("UK E-COMMERCE DASHBOARD GENERATOR")
 print("="*70 + "\n")
 
 # Load data
-df = pd.read_csv('uk_ecommerce_sales_data.csv')
-print(f"✅ Loaded {len(df)} sales records")
+data_file = find_dataset('uk_ecommerce_sales_data')
+df = read_table(data_file)
+print(f"✅ Loaded {len(df)} sales records from {data_file}")
 print(f"✅ Total revenue: £{df['Total_Sales'].sum():,.2f}\n")
 
-# Set style
-plt.style.use('seaborn-v0_8-whitegrid')
-colors = ['#2563eb', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
-
-# Create professional dashboard
-fig = plt.figure(figsize=(16, 10))
-
-# Chart 1: Revenue by Category (Horizontal Bar)
-ax1 = plt.subplot(2, 3, 1)
-category_data = df.groupby('Category')['Total_Sales'].sum().sort_values()
-bars = ax1.barh(category_data.index, category_data.values / 1000, color=colors)
-ax1.set_xlabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
-ax1.set_title('Revenue by Category\nElectronics leads at 46.7%', fontweight='bold', fontsize=12, pad=10)
-ax1.grid(axis='x', alpha=0.3)
+# Aggregates behind each chart
+category_data = df.groupby('Category', observed=True)['Total_Sales'].sum().sort_values()
+region_data = df.groupby('Region', observed=True)['Total_Sales'].sum().sort_values(ascending=False)
 
-for i, bar in enumerate(bars):
-    width = bar.get_width()
-    percentage = (category_data.iloc[i] / category_data.sum()) * 100
-    ax1.text(width + 1, bar.get_y() + bar.get_height()/2, 
-             f'£{width:.1f}k ({percentage:.1f}%)', 
-             va='center', fontweight='bold', fontsize=9)
-
-# Chart 2: Regional Sales (Bar Chart)
-ax2 = plt.subplot(2, 3, 2)
-region_data = df.groupby('Region')['Total_Sales'].sum().sort_values(ascending=False)
-bars = ax2.bar(range(len(region_data)), region_data.values / 1000, color=colors)
-ax2.set_xticks(range(len(region_data)))
-ax2.set_xticklabels(region_data.index, rotation=45, ha='right')
-ax2.set_ylabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
-ax2.set_title('Sales by Region\nLondon: 30% of total revenue', fontweight='bold', fontsize=12, pad=10)
-ax2.grid(axis='y', alpha=0.3)
-
-for i, bar in enumerate(bars):
-    height = bar.get_height()
-    ax2.text(bar.get_x() + bar.get_width()/2., height + 1,
-             f'£{height:.1f}k', ha='center', va='bottom', fontweight='bold', fontsize=9)
-
-# Chart 3: Monthly Growth Trend
-ax3 = plt.subplot(2, 3, 3)
 month_order = ['January', 'February', 'March', 'April', 'May', 'June']
 monthly_data = df.groupby('Month')['Total_Sales'].sum().reindex(month_order)
-
-ax3.plot(range(len(monthly_data)), monthly_data.values / 1000, 
-         marker='o', linewidth=3, markersize=10, color='#10b981', 
-         markerfacecolor='#f59e0b', markeredgewidth=2, markeredgecolor='black')
-ax3.fill_between(range(len(monthly_data)), monthly_data.values / 1000, alpha=0.3, color='#10b981')
-ax3.set_xticks(range(len(monthly_data)))
-ax3.set_xticklabels([m[:3] for m in month_order], fontweight='bold')
-ax3.set_ylabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
-ax3.set_title('Monthly Revenue Trend\n+53% growth (Jan-Jun)', fontweight='bold', fontsize=12, pad=10)
-ax3.grid(True, alpha=0.3)
-
-# Add growth percentage
 jan_val = monthly_data.iloc[0]
 jun_val = monthly_data.iloc[-1]
 growth = ((jun_val - jan_val) / jan_val) * 100
-ax3.annotate(f'+{growth:.1f}%', 
-             xy=(5, jun_val/1000), xytext=(4, jun_val/1000 + 5),
-             fontweight='bold', fontsize=11, color='#10b981',
-             bbox=dict(boxstyle='round', facecolor='white', edgecolor='#10b981', linewidth=2),
-             arrowprops=dict(arrowstyle='->', color='#10b981', linewidth=2))
 
-# Chart 4: Top Products (Horizontal Bar)
-ax4 = plt.subplot(2, 3, 4)
 product_data = df.groupby('Product')['Total_Sales'].sum().sort_values(ascending=True).tail(8)
-bars = ax4.barh(product_data.index, product_data.values / 1000, color='#2563eb', edgecolor='black', linewidth=1)
-ax4.set_xlabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
-ax4.set_title('Top 8 Products by Revenue', fontweight='bold', fontsize=12, pad=10)
-ax4.grid(axis='x', alpha=0.3)
-
-for i, bar in enumerate(bars):
-    width = bar.get_width()
-    ax4.text(width + 0.5, bar.get_y() + bar.get_height()/2, 
-             f'£{width:.1f}k', va='center', fontweight='bold', fontsize=9)
-
-# Chart 5: Category Distribution (Pie)
-ax5 = plt.subplot(2, 3, 5)
-category_pie = df.groupby('Category')['Total_Sales'].sum()
-explode = [0.1 if cat == 'Electronics' else 0 for cat in category_pie.index]
-wedges, texts, autotexts = ax5.pie(category_pie, labels=category_pie.index, autopct='%1.1f%%',
-                                     startangle=90, colors=colors, explode=explode,
-                                     textprops={'fontweight': 'bold', 'fontsize': 10},
-                                     wedgeprops={'edgecolor': 'black', 'linewidth': 2})
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontsize(11)
-ax5.set_title('Category Distribution\nElectronics dominates', fontweight='bold', fontsize=12)
-
-# Chart 6: Average Order Value by Region
-ax6 = plt.subplot(2, 3, 6)
-aov_data = df.groupby('Region')['Total_Sales'].mean().sort_values(ascending=False)
-bars = ax6.bar(range(len(aov_data)), aov_data.values, color=colors, edgecolor='black', linewidth=2)
-ax6.set_xticks(range(len(aov_data)))
-ax6.set_xticklabels(aov_data.index, rotation=45, ha='right', fontweight='bold')
-ax6.set_ylabel('Average Order Value (£)', fontweight='bold', fontsize=11)
-ax6.set_title('Average Order Value by Region\nLondon leads at £{:.2f}'.format(aov_data.iloc[0]), 
-              fontweight='bold', fontsize=12, pad=10)
-ax6.grid(axis='y', alpha=0.3)
-
-for i, bar in enumerate(bars):
-    height = bar.get_height()
-    ax6.text(bar.get_x() + bar.get_width()/2., height + 1,
-             f'£{height:.0f}', ha='center', va='bottom', fontweight='bold', fontsize=9)
-
-plt.suptitle('UK E-Commerce Sales Dashboard (Jan-Jun 2024)\nExcel Data Analysis | Serghei Covalciuc', 
-             fontsize=16, fontweight='bold', y=0.995)
-
-plt.tight_layout()
-plt.savefig('real_project2_ecommerce_dashboard.png', dpi=200, bbox_inches='tight')
-print("✅ Created: real_project2_ecommerce_dashboard.png\n")
+category_pie = df.groupby('Category', observed=True)['Total_Sales'].sum()
+aov_data = df.groupby('Region', observed=True)['Total_Sales'].mean().sort_values(ascending=False)
+
+if args.no_plots:
+    print("💡 Skipped the dashboard PNG (--no-plots)\n")
+else:
+    import ecommerce_charts
+
+    # Create professional dashboard: each panel is drawn in its own process
+    # and the six are tiled into one PNG
+    panels = [
+        Panel('category_revenue', ecommerce_charts.category_revenue, category_data),
+        Panel('regional_sales', ecommerce_charts.regional_sales, region_data),
+        Panel('monthly_trend', ecommerce_charts.monthly_trend, monthly_data, growth),
+        Panel('top_products', ecommerce_charts.top_products, product_data),
+        Panel('category_distribution', ecommerce_charts.category_distribution, category_pie),
+        Panel('order_value_by_region', ecommerce_charts.order_value_by_region, aov_data),
+    ]
+    # Only redrawn when the data, a chart's inputs or the drawing code changed
+    graph = BuildGraph(force=args.force)
+    timings = build_dashboard(
+        graph, panels, 'real_project2_ecommerce_dashboard.png', inputs=[data_file], options=render_options(args),
+        layout=(2, 3), figsize=(16, 10), dpi=200,
+        title='UK E-Commerce Sales Dashboard (Jan-Jun 2024)\nExcel Data Analysis | Serghei Covalciuc',
+        title_kwargs={'fontsize': 16, 'fontweight': 'bold'}, style='seaborn-v0_8-whitegrid')
+    if timings is None:
+        print("✅ Up to date: real_project2_ecommerce_dashboard.png (use --force to redraw)")
+    else:
+        print("✅ Created: real_project2_ecommerce_dashboard.png")
+        print(f"✅ {describe_render(timings, graph.results[-1].seconds)}")
+    print("Build report:")
+    for line in graph.report():
+        print(f"   {line}")
+    print()
 
 # Print summary
 print("="*70)
@@ -152,8 +96,9 @@ print("\n" + "="*70)
 print("✅ DASHBOARD COMPLETE!")
 print("="*70)
 print("\nFiles created:")
-print("📄 uk_ecommerce_sales_data.csv - Raw sales data")
-print("📊 real_project2_ecommerce_dashboard.png - Visual dashboard")
-print("\n💡 Open the PNG to see all 6 professional charts!")
+print(f"📄 {data_file} - Raw sales data")
+if not args.no_plots:
+    print("📊 real_project2_ecommerce_dashboard.png - Visual dashboard")
+    print("\n💡 Open the PNG to see all 6 professional charts!")
 print("💡 Import CSV to Excel for PivotTable analysis")
 print("="*70 + "\n")
@@ -0,0 +1,100 @@
+"""
+UK E-Commerce Dashboard Panels
+One drawing function per chart of real_project2_ecommerce_dashboard.png
+"""
+
+COLORS = ['#2563eb', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
+
+
+def category_revenue(ax, category_data):
+    """Chart 1: Revenue by Category (Horizontal Bar)"""
+    bars = ax.barh(category_data.index, category_data.values / 1000, color=COLORS)
+    ax.set_xlabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
+    ax.set_title('Revenue by Category\nElectronics leads at 46.7%', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(axis='x', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        width = bar.get_width()
+        percentage = (category_data.iloc[i] / category_data.sum()) * 100
+        ax.text(width + 1, bar.get_y() + bar.get_height()/2,
+                f'£{width:.1f}k ({percentage:.1f}%)',
+                va='center', fontweight='bold', fontsize=9)
+
+
+def regional_sales(ax, region_data):
+    """Chart 2: Regional Sales (Bar Chart)"""
+    bars = ax.bar(range(len(region_data)), region_data.values / 1000, color=COLORS)
+    ax.set_xticks(range(len(region_data)))
+    ax.set_xticklabels(region_data.index, rotation=45, ha='right')
+    ax.set_ylabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
+    ax.set_title('Sales by Region\nLondon: 30% of total revenue', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'£{height:.1f}k', ha='center', va='bottom', fontweight='bold', fontsize=9)
+
+
+def monthly_trend(ax, monthly_data, growth):
+    """Chart 3: Monthly Growth Trend"""
+    ax.plot(range(len(monthly_data)), monthly_data.values / 1000,
+            marker='o', linewidth=3, markersize=10, color='#10b981',
+            markerfacecolor='#f59e0b', markeredgewidth=2, markeredgecolor='black')
+    ax.fill_between(range(len(monthly_data)), monthly_data.values / 1000, alpha=0.3, color='#10b981')
+    ax.set_xticks(range(len(monthly_data)))
+    ax.set_xticklabels([m[:3] for m in monthly_data.index], fontweight='bold')
+    ax.set_ylabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
+    ax.set_title('Monthly Revenue Trend\n+53% growth (Jan-Jun)', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(True, alpha=0.3)
+
+    # Add growth percentage
+    last = len(monthly_data) - 1
+    end_val = monthly_data.iloc[-1]
+    ax.annotate(f'+{growth:.1f}%',
+                xy=(last, end_val/1000), xytext=(last - 1, end_val/1000 + 5),
+                fontweight='bold', fontsize=11, color='#10b981',
+                bbox=dict(boxstyle='round', facecolor='white', edgecolor='#10b981', linewidth=2),
+                arrowprops=dict(arrowstyle='->', color='#10b981', linewidth=2))
+
+
+def top_products(ax, product_data):
+    """Chart 4: Top Products (Horizontal Bar)"""
+    bars = ax.barh(product_data.index, product_data.values / 1000, color='#2563eb', edgecolor='black', linewidth=1)
+    ax.set_xlabel('Revenue (£ thousands)', fontweight='bold', fontsize=11)
+    ax.set_title('Top 8 Products by Revenue', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(axis='x', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        width = bar.get_width()
+        ax.text(width + 0.5, bar.get_y() + bar.get_height()/2,
+                f'£{width:.1f}k', va='center', fontweight='bold', fontsize=9)
+
+
+def category_distribution(ax, category_pie):
+    """Chart 5: Category Distribution (Pie)"""
+    explode = [0.1 if cat == 'Electronics' else 0 for cat in category_pie.index]
+    wedges, texts, autotexts = ax.pie(category_pie, labels=category_pie.index, autopct='%1.1f%%',
+                                      startangle=90, colors=COLORS, explode=explode,
+                                      textprops={'fontweight': 'bold', 'fontsize': 10},
+                                      wedgeprops={'edgecolor': 'black', 'linewidth': 2})
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontsize(11)
+    ax.set_title('Category Distribution\nElectronics dominates', fontweight='bold', fontsize=12)
+
+
+def order_value_by_region(ax, aov_data):
+    """Chart 6: Average Order Value by Region"""
+    bars = ax.bar(range(len(aov_data)), aov_data.values, color=COLORS, edgecolor='black', linewidth=2)
+    ax.set_xticks(range(len(aov_data)))
+    ax.set_xticklabels(aov_data.index, rotation=45, ha='right', fontweight='bold')
+    ax.set_ylabel('Average Order Value (£)', fontweight='bold', fontsize=11)
+    ax.set_title('Average Order Value by Region\nLondon leads at £{:.2f}'.format(aov_data.iloc[0]),
+                 fontweight='bold', fontsize=12, pad=10)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'£{height:.0f}', ha='center', va='bottom', fontweight='bold', fontsize=9)
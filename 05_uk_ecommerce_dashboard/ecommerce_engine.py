@@ -0,0 +1,172 @@
+"""
+UK E-Commerce Order Engine
+Vectorized, chunked order generator backed by numpy.random.Generator
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Product categories with realistic UK pricing
+CATEGORIES = {
+    'Electronics': {
+        'products': ['Laptop', 'Smartphone', 'Tablet', 'Headphones', 'Smart Watch'],
+        'price_range': (50, 1200),
+        'volume_weight': 3.0  # Higher sales volume
+    },
+    'Home & Garden': {
+        'products': ['Coffee Maker', 'Vacuum Cleaner', 'Bedding Set', 'Garden Tools', 'Storage Box'],
+        'price_range': (20, 300),
+        'volume_weight': 2.5
+    },
+    'Fashion': {
+        'products': ['Jacket', 'Trainers', 'Dress', 'Jeans', 'Handbag'],
+        'price_range': (25, 250),
+        'volume_weight': 2.0
+    },
+    'Sports': {
+        'products': ['Yoga Mat', 'Dumbbells', 'Running Shoes', 'Gym Bag', 'Protein Powder'],
+        'price_range': (15, 180),
+        'volume_weight': 1.5
+    }
+}
+
+# UK regions with different market sizes
+REGIONS = {
+    'London': 0.30,      # 30% of sales
+    'South East': 0.25,  # 25% of sales
+    'North West': 0.20,  # 20% of sales
+    'Scotland': 0.15,    # 15% of sales
+    'Wales': 0.10        # 10% of sales
+}
+
+# Quantity (most orders are 1-2 items)
+QUANTITIES = {1: 0.7, 2: 0.25, 3: 0.05}
+
+COLUMNS = ['Order_ID', 'Date', 'Month', 'Category', 'Product', 'Region',
+           'Unit_Price', 'Quantity', 'Total_Sales']
+
+
+def _normalise(weights):
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+class OrderGenerator:
+    """
+    Draws whole batches of orders (one day or one month at a time) as
+    arrays and yields them as fixed-size DataFrame chunks.
+
+    Every random draw is made per batch, so the same seed produces the
+    same orders whatever chunk_size is used.
+    """
+
+    def __init__(self, seed=42, start_date=datetime(2024, 1, 1), months=6,
+                 base_orders=15, monthly_growth=None, weekend_uplift=1.3,
+                 chunk_size=250_000, batch='day', first_order_id=1000):
+        if batch not in ('day', 'month'):
+            raise ValueError(f"batch must be 'day' or 'month', got {batch!r}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.seed = seed
+        self.start_date = start_date
+        self.months = months
+        self.base_orders = base_orders
+        # Growth scales with base_orders so raising volume keeps the same trend (15 -> +3/month)
+        self.monthly_growth = base_orders / 5 if monthly_growth is None else monthly_growth
+        self.weekend_uplift = weekend_uplift
+        self.chunk_size = chunk_size
+        self.batch = batch
+        self.first_order_id = first_order_id
+
+        names = list(CATEGORIES)
+        self._category_names = np.array(names, dtype=object)
+        self._category_p = _normalise([CATEGORIES[c]['volume_weight'] for c in names])
+        self._products = np.array([CATEGORIES[c]['products'] for c in names], dtype=object)
+        self._price_low = np.array([CATEGORIES[c]['price_range'][0] for c in names], dtype=float)
+        self._price_high = np.array([CATEGORIES[c]['price_range'][1] for c in names], dtype=float)
+        self._region_names = np.array(list(REGIONS), dtype=object)
+        self._region_p = _normalise(list(REGIONS.values()))
+        self._quantities = np.array(list(QUANTITIES), dtype=np.int64)
+        self._quantity_p = _normalise(list(QUANTITIES.values()))
+
+    def month_schedule(self):
+        """Return a list of (dates, daily_order_counts) per generated month"""
+        schedule = []
+        for month in range(self.months):
+            current_month = self.start_date + timedelta(days=30*month)
+            days_in_month = 31 if month in [0, 2, 4] else 30
+
+            # Base orders per day increases over time (growth trend)
+            base = int(self.base_orders + month * self.monthly_growth)
+
+            dates = [current_month + timedelta(days=day) for day in range(days_in_month)]
+            # Weekends get more orders (realistic pattern)
+            counts = [int(base * self.weekend_uplift) if d.weekday() >= 5 else base
+                      for d in dates]
+            schedule.append((dates, np.array(counts, dtype=np.int64)))
+        return schedule
+
+    def total_orders(self):
+        return int(sum(counts.sum() for _, counts in self.month_schedule()))
+
+    def _batches(self):
+        for dates, counts in self.month_schedule():
+            if self.batch == 'month':
+                yield dates, counts
+            else:
+                for date, count in zip(dates, counts):
+                    yield [date], np.array([count], dtype=np.int64)
+
+    def _draw(self, rng, dates, counts, first_id):
+        n = int(counts.sum())
+        category = rng.choice(len(self._category_names), size=n, p=self._category_p)
+        product = rng.integers(0, self._products.shape[1], size=n)
+        unit_price = np.round(rng.uniform(self._price_low[category], self._price_high[category]), 2)
+        quantity = rng.choice(self._quantities, size=n, p=self._quantity_p)
+        region = rng.choice(len(self._region_names), size=n, p=self._region_p)
+
+        date_labels = np.array([d.strftime('%Y-%m-%d') for d in dates], dtype=object)
+        month_labels = np.array([d.strftime('%B') for d in dates], dtype=object)
+        order_ids = np.arange(first_id, first_id + n)
+
+        return pd.DataFrame({
+            'Order_ID': pd.Series(order_ids).astype(str).str.zfill(5).radd('ORD').to_numpy(),
+            'Date': np.repeat(date_labels, counts),
+            'Month': np.repeat(month_labels, counts),
+            'Category': self._category_names[category],
+            'Product': self._products[category, product],
+            'Region': self._region_names[region],
+            'Unit_Price': unit_price,
+            'Quantity': quantity,
+            'Total_Sales': np.round(unit_price * quantity, 2),
+        }, columns=COLUMNS)
+
+    def iter_chunks(self):
+        """Yield DataFrames of exactly chunk_size rows (the last may be shorter)"""
+        rng = np.random.default_rng(self.seed)
+        order_id = self.first_order_id
+        pending = []
+        pending_rows = 0
+
+        for dates, counts in self._batches():
+            batch = self._draw(rng, dates, counts, order_id)
+            order_id += len(batch)
+            pending.append(batch)
+            pending_rows += len(batch)
+
+            while pending_rows >= self.chunk_size:
+                combined = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+                yield combined.iloc[:self.chunk_size].reset_index(drop=True)
+                rest = combined.iloc[self.chunk_size:]
+                pending = [rest] if len(rest) else []
+                pending_rows = len(rest)
+
+        if pending_rows:
+            yield pd.concat(pending, ignore_index=True)
+
+    def generate(self):
+        """Materialise every chunk into one DataFrame (small volumes only)"""
+        return pd.concat(list(self.iter_chunks()), ignore_index=True)
@@ -3,92 +3,105 @@ London Property Rental SQL Analysis
 Creates SQLite database and runs SQL queries for analysis
 """
 
-import pandas as pd
-import sqlite3
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.build import BuildGraph
+from common.render import Panel, add_render_arguments, build_dashboard, describe_render, render_options
+from common.sinks import find_dataset, read_table
+from property_db import INDEXES, connect, is_legacy_table, load_properties, upsert_properties
+from property_summaries import verify_summaries
+from query_runner import QueryRunner
+
+parser = argparse.ArgumentParser(description="London property rental SQL analysis")
+parser.add_argument('--full-reload', action='store_true',
+                    help="Drop and reload the whole table instead of upserting changed rows")
+parser.add_argument('--verify-summaries', action='store_true',
+                    help="Check the materialized summary tables against a full recompute")
+add_render_arguments(parser)
+args = parser.parse_args()
 
 print("\n" + "="*70)
 print("LONDON PROPERTY RENTAL - SQL ANALYSIS")
 print("="*70 + "\n")
 
-# Load CSV data
-df = pd.read_csv('london_property_rentals.csv')
-print(f"✅ Loaded {len(df)} property records\n")
-
-# Create SQLite database
-conn = sqlite3.connect('london_properties.db')
-cursor = conn.cursor()
-
-# Create table
-cursor.execute('DROP TABLE IF EXISTS properties')
-cursor.execute('''
-CREATE TABLE properties (
-    Property_ID TEXT PRIMARY KEY,
-    Postcode TEXT,
-    Zone INTEGER,
-    Property_Type TEXT,
-    Bedrooms INTEGER,
-    Monthly_Rent REAL,
-    Amenities TEXT,
-    Listed_Date TEXT,
-    Is_Occupied TEXT,
-    ROI_Potential REAL
-)
-''')
-
-# Insert data
-df.to_sql('properties', conn, if_exists='replace', index=False)
-print("✅ Created SQLite database: london_properties.db")
-print("✅ Imported data into 'properties' table\n")
+# Load generated data (CSV, Parquet or Arrow - whichever is newest)
+data_file = find_dataset('london_property_rentals')
+df = read_table(data_file)
+print(f"✅ Loaded {len(df)} property records from {data_file}\n")
+
+# Load into SQLite with the declared schema and covering indexes
+conn = connect('london_properties.db')
+full_reload = args.full_reload
+if not full_reload and is_legacy_table(conn):
+    # Tables written by the old to_sql load have no key to upsert against
+    print("💡 'properties' has no Property_ID primary key (legacy load) - rebuilding with a full reload")
+    full_reload = True
+if full_reload:
+    load_seconds = load_properties(conn, df)
+    print("✅ Created SQLite database: london_properties.db")
+    print(f"✅ Imported {len(df)} rows into 'properties' table in {load_seconds:.2f}s")
+    print(f"✅ Built {len(INDEXES)} covering indexes and ran ANALYZE\n")
+else:
+    # Incremental ingest keyed on Property_ID: only new or changed rows are written
+    ingest = upsert_properties(conn, df)
+    timings = ingest['timings']
+    print("✅ Updated SQLite database: london_properties.db")
+    print(f"✅ Inserted {ingest['inserted']:,} | Updated {ingest['updated']:,} | "
+          f"Unchanged {ingest['unchanged']:,}")
+    if ingest['duplicates']:
+        print(f"💡 {ingest['duplicates']:,} repeated Property_IDs in the batch (last copy kept)")
+    print(f"✅ Listed_Date high-water mark: {ingest['previous_hwm']} -> {ingest['high_water_mark']}")
+    print(f"✅ Timings: stage {timings['stage']:.2f}s | diff {timings['diff']:.2f}s | "
+          f"upsert {timings['upsert']:.2f}s | index {timings['index']:.2f}s | "
+          f"total {timings['total']:.2f}s\n")
 
 # Run SQL queries
 print("="*70)
 print("SQL QUERY EXECUTION")
 print("="*70 + "\n")
 
+if args.verify_summaries:
+    problems = verify_summaries(conn)
+    if problems:
+        print(f"❌ Summary tables differ from a full recompute ({len(problems)} problems):")
+        for problem in problems[:20]:
+            print(f"   {problem}")
+        print()
+    else:
+        print("✅ Summary tables match a full recompute\n")
+
+# Report queries are independent read-only aggregates. Queries 1, 2 and 4
+# read the materialized summaries (O(groups)); 3 and 5 filter raw rows.
 # Query 1: Zone statistics
-print("QUERY 1: Rent Statistics by Zone")
-print("-" * 70)
 query1 = """
 SELECT 
     Zone,
-    COUNT(*) as Property_Count,
-    ROUND(AVG(Monthly_Rent), 2) as Avg_Rent,
-    ROUND(MIN(Monthly_Rent), 2) as Min_Rent,
-    ROUND(MAX(Monthly_Rent), 2) as Max_Rent,
-    ROUND(AVG(ROI_Potential), 2) as Avg_ROI
-FROM properties
-GROUP BY Zone
+    Property_Count,
+    ROUND(Rent_Sum / Property_Count, 2) as Avg_Rent,
+    ROUND(Rent_Min, 2) as Min_Rent,
+    ROUND(Rent_Max, 2) as Max_Rent,
+    ROUND(ROI_Sum / Property_Count, 2) as Avg_ROI
+FROM zone_summary
 ORDER BY Zone;
 """
-result1 = pd.read_sql_query(query1, conn)
-print(result1.to_string(index=False))
 
 # Query 2: Best investment postcodes
-print("\n" + "-" * 70)
-print("QUERY 2: Top 5 Postcodes for Investment (Highest ROI)")
-print("-" * 70)
 query2 = """
 SELECT 
     Postcode,
     Zone,
-    COUNT(*) as Properties,
-    ROUND(AVG(Monthly_Rent), 2) as Avg_Rent,
-    ROUND(AVG(ROI_Potential), 2) as Avg_ROI
-FROM properties
-GROUP BY Postcode, Zone
-ORDER BY Avg_ROI DESC
+    Property_Count as Properties,
+    ROUND(Rent_Sum / Property_Count, 2) as Avg_Rent,
+    ROUND(ROI_Sum / Property_Count, 2) as Avg_ROI
+FROM postcode_summary
+ORDER BY Avg_ROI DESC, Postcode
 LIMIT 5;
 """
-result2 = pd.read_sql_query(query2, conn)
-print(result2.to_string(index=False))
 
 # Query 3: Undervalued properties (Zone 3 with high ROI)
-print("\n" + "-" * 70)
-print("QUERY 3: Undervalued Investment Opportunities (Zone 3, ROI > 10%)")
-print("-" * 70)
 query3 = """
 SELECT 
     Postcode,
@@ -101,155 +114,128 @@ WHERE Zone = 3 AND ROI_Potential > 10.0
 GROUP BY Postcode
 ORDER BY Avg_ROI DESC;
 """
-result3 = pd.read_sql_query(query3, conn)
-print(result3.to_string(index=False))
 
 # Query 4: Property type analysis
-print("\n" + "-" * 70)
-print("QUERY 4: Property Type Analysis with Occupancy")
-print("-" * 70)
 query4 = """
 SELECT 
     Property_Type,
-    COUNT(*) as Total_Properties,
-    SUM(CASE WHEN Is_Occupied = 'Yes' THEN 1 ELSE 0 END) as Occupied,
-    ROUND(AVG(Monthly_Rent), 2) as Avg_Rent,
-    ROUND(AVG(ROI_Potential), 2) as Avg_ROI
-FROM properties
-GROUP BY Property_Type
-ORDER BY Total_Properties DESC;
+    Property_Count as Total_Properties,
+    Occupied,
+    ROUND(Rent_Sum / Property_Count, 2) as Avg_Rent,
+    ROUND(ROI_Sum / Property_Count, 2) as Avg_ROI
+FROM type_summary
+ORDER BY Total_Properties DESC, Property_Type;
 """
-result4 = pd.read_sql_query(query4, conn)
-result4['Occupancy_Rate'] = (result4['Occupied'] / result4['Total_Properties'] * 100).round(1)
-print(result4.to_string(index=False))
 
-# Query 5: Recent listings (last 30 days)
-print("\n" + "-" * 70)
-print("QUERY 5: Recent Listings (Last 30 Days) by Postcode")
-print("-" * 70)
+# Query 5: Recent listings (within 30 days of the newest listing, day 30 included)
 query5 = """
 SELECT 
     Postcode,
     COUNT(*) as New_Listings,
     ROUND(AVG(Monthly_Rent), 2) as Avg_Rent
 FROM properties
-WHERE julianday('now') - julianday(Listed_Date) <= 30
+WHERE Listed_Date >= date((SELECT MAX(Listed_Date) FROM properties), '-30 days')
 GROUP BY Postcode
 HAVING COUNT(*) >= 3
-ORDER BY New_Listings DESC
+ORDER BY New_Listings DESC, Postcode
 LIMIT 5;
 """
-result5 = pd.read_sql_query(query5, conn)
-print(result5.to_string(index=False))
 
-# Close database
+# Close the writer before the read-only connections open
 conn.close()
 
-# Create visualizations
-print("\n" + "="*70)
-print("CREATING VISUALIZATIONS")
-print("="*70 + "\n")
+# Start all five queries at once; each section below only waits for its own result
+runner = QueryRunner('london_properties.db', workers=4)
+pending = runner.submit({
+    'query1': query1,
+    'query2': query2,
+    'query3': query3,
+    'query4': query4,
+    'query5': query5,
+})
+latency = {}
+
+
+def report_result(name):
+    result = pending[name].result()
+    latency[name] = result.seconds
+    return result.frame
 
-plt.style.use('seaborn-v0_8-whitegrid')
-colors = ['#2563eb', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
-
-fig = plt.figure(figsize=(16, 10))
-
-# Chart 1: Average Rent by Zone
-ax1 = plt.subplot(2, 3, 1)
-bars = ax1.bar(result1['Zone'], result1['Avg_Rent'], color=colors[:3], edgecolor='black', linewidth=2)
-ax1.set_xlabel('Zone', fontweight='bold', fontsize=11)
-ax1.set_ylabel('Average Monthly Rent (£)', fontweight='bold', fontsize=11)
-ax1.set_title('Average Rent by Zone\nZone 1: £2,800 | Zone 3: £1,470', fontweight='bold', fontsize=12, pad=10)
-ax1.set_xticks(result1['Zone'])
-ax1.grid(axis='y', alpha=0.3)
-
-for bar in bars:
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height + 50,
-             f'£{height:.0f}', ha='center', va='bottom', fontweight='bold', fontsize=10)
-
-# Chart 2: ROI Potential by Postcode
-ax2 = plt.subplot(2, 3, 2)
-bars = ax2.barh(result2['Postcode'], result2['Avg_ROI'], color='#10b981', edgecolor='black', linewidth=1.5)
-ax2.set_xlabel('Average ROI (%)', fontweight='bold', fontsize=11)
-ax2.set_title('Top 5 Postcodes by ROI\nSE15 & E17 offer best returns', fontweight='bold', fontsize=12, pad=10)
-ax2.grid(axis='x', alpha=0.3)
-
-for i, bar in enumerate(bars):
-    width = bar.get_width()
-    ax2.text(width + 0.2, bar.get_y() + bar.get_height()/2, 
-             f'{width:.1f}%', va='center', fontweight='bold', fontsize=9)
-
-# Chart 3: Property Type Distribution
-ax3 = plt.subplot(2, 3, 3)
-explode = [0.05 if pt == '1-Bed Flat' else 0 for pt in result4['Property_Type']]
-wedges, texts, autotexts = ax3.pie(result4['Total_Properties'], labels=result4['Property_Type'], 
-                                     autopct='%1.1f%%', startangle=90, colors=colors,
-                                     explode=explode, textprops={'fontweight': 'bold', 'fontsize': 10},
-                                     wedgeprops={'edgecolor': 'black', 'linewidth': 2})
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontsize(11)
-ax3.set_title('Property Type Distribution\n1-Bed Flats most common', fontweight='bold', fontsize=12)
-
-# Chart 4: Undervalued Areas (Zone 3)
-ax4 = plt.subplot(2, 3, 4)
-bars = ax4.bar(range(len(result3)), result3['Avg_ROI'], color=colors, edgecolor='black', linewidth=2)
-ax4.set_xticks(range(len(result3)))
-ax4.set_xticklabels(result3['Postcode'], fontweight='bold')
-ax4.set_ylabel('Average ROI (%)', fontweight='bold', fontsize=11)
-ax4.set_title('Undervalued Investment Areas\nZone 3 properties with 10%+ ROI', fontweight='bold', fontsize=12, pad=10)
-ax4.grid(axis='y', alpha=0.3)
-
-for i, bar in enumerate(bars):
-    height = bar.get_height()
-    ax4.text(bar.get_x() + bar.get_width()/2., height + 0.2,
-             f'{height:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=9)
-
-# Chart 5: Zone ROI Comparison
-ax5 = plt.subplot(2, 3, 5)
-zones = result1['Zone'].values
-roi_values = result1['Avg_ROI'].values
-bar_colors = ['#ef4444', '#f59e0b', '#10b981']
-bars = ax5.bar(zones, roi_values, color=bar_colors, edgecolor='black', linewidth=2)
-ax5.set_xlabel('Zone', fontweight='bold', fontsize=11)
-ax5.set_ylabel('Average ROI (%)', fontweight='bold', fontsize=11)
-ax5.set_title('ROI Potential by Zone\nZone 3: 114% higher ROI than Zone 1', fontweight='bold', fontsize=12, pad=10)
-ax5.set_xticks(zones)
-ax5.grid(axis='y', alpha=0.3)
-
-for bar in bars:
-    height = bar.get_height()
-    ax5.text(bar.get_x() + bar.get_width()/2., height + 0.2,
-             f'{height:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=10)
-
-# Chart 6: Rent vs ROI Scatter (Zone 3 only)
-ax6 = plt.subplot(2, 3, 6)
-zone3_data = df[df['Zone'] == 3]
-scatter = ax6.scatter(zone3_data['Monthly_Rent'], zone3_data['ROI_Potential'], 
-                      c=zone3_data['ROI_Potential'], cmap='RdYlGn', 
-                      s=100, alpha=0.6, edgecolors='black', linewidth=1)
-ax6.set_xlabel('Monthly Rent (£)', fontweight='bold', fontsize=11)
-ax6.set_ylabel('ROI Potential (%)', fontweight='bold', fontsize=11)
-ax6.set_title('Zone 3: Rent vs ROI\nLower rent = Higher ROI', fontweight='bold', fontsize=12, pad=10)
-ax6.grid(True, alpha=0.3)
-plt.colorbar(scatter, ax=ax6, label='ROI %')
-
-# Add trend line
-z = np.polyfit(zone3_data['Monthly_Rent'], zone3_data['ROI_Potential'], 1)
-p = np.poly1d(z)
-ax6.plot(zone3_data['Monthly_Rent'].sort_values(), 
-         p(zone3_data['Monthly_Rent'].sort_values()), 
-         "--", color='#ef4444', linewidth=2, alpha=0.8, label='Trend')
-ax6.legend()
-
-plt.suptitle('London Property Rental Analysis - SQL Database Queries\nSerghei Covalciuc', 
-             fontsize=16, fontweight='bold', y=0.995)
-
-plt.tight_layout()
-plt.savefig('real_project3_property_analysis.png', dpi=200, bbox_inches='tight')
-print("✅ Created: real_project3_property_analysis.png\n")
+
+print("QUERY 1: Rent Statistics by Zone")
+print("-" * 70)
+result1 = report_result('query1')
+print(result1.to_string(index=False))
+
+print("\n" + "-" * 70)
+print("QUERY 2: Top 5 Postcodes for Investment (Highest ROI)")
+print("-" * 70)
+result2 = report_result('query2')
+print(result2.to_string(index=False))
+
+print("\n" + "-" * 70)
+print("QUERY 3: Undervalued Investment Opportunities (Zone 3, ROI > 10%)")
+print("-" * 70)
+result3 = report_result('query3')
+print(result3.to_string(index=False))
+
+print("\n" + "-" * 70)
+print("QUERY 4: Property Type Analysis with Occupancy")
+print("-" * 70)
+result4 = report_result('query4')
+result4['Occupancy_Rate'] = (result4['Occupied'] / result4['Total_Properties'] * 100).round(1)
+print(result4.to_string(index=False))
+
+print("\n" + "-" * 70)
+print("QUERY 5: Recent Listings (Last 30 Days) by Postcode")
+print("-" * 70)
+result5 = report_result('query5')
+print(result5.to_string(index=False))
+
+runner.close()
+
+print("\n" + "-" * 70)
+print("QUERY LATENCY (concurrent, read-only connections):")
+print("-" * 70)
+for name, seconds in latency.items():
+    print(f"{name:10s} {seconds * 1000:8.1f} ms")
+
+# Create visualizations
+if args.no_plots:
+    print("\n💡 Skipped the dashboard PNG (--no-plots)\n")
+else:
+    import property_charts
+
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATIONS")
+    print("="*70 + "\n")
+
+    # Each panel is drawn in its own process and the six are tiled into one PNG
+    zone3_data = df.loc[df['Zone'] == 3, ['Monthly_Rent', 'ROI_Potential']]
+    panels = [
+        Panel('rent_by_zone', property_charts.rent_by_zone, result1),
+        Panel('roi_by_postcode', property_charts.roi_by_postcode, result2),
+        Panel('property_types', property_charts.property_types, result4),
+        Panel('undervalued_areas', property_charts.undervalued_areas, result3),
+        Panel('roi_by_zone', property_charts.roi_by_zone, result1),
+        Panel('zone3_rent_vs_roi', property_charts.zone3_rent_vs_roi, zone3_data),
+    ]
+    # Only redrawn when a query result, the data or the drawing code changed
+    graph = BuildGraph(force=args.force)
+    timings = build_dashboard(
+        graph, panels, 'real_project3_property_analysis.png', inputs=[data_file], options=render_options(args),
+        layout=(2, 3), figsize=(16, 10), dpi=200,
+        title='London Property Rental Analysis - SQL Database Queries\nSerghei Covalciuc',
+        title_kwargs={'fontsize': 16, 'fontweight': 'bold'}, style='seaborn-v0_8-whitegrid')
+    if timings is None:
+        print("✅ Up to date: real_project3_property_analysis.png (use --force to redraw)")
+    else:
+        print("✅ Created: real_project3_property_analysis.png")
+        print(f"✅ {describe_render(timings, graph.results[-1].seconds)}")
+    print("Build report:")
+    for line in graph.report():
+        print(f"   {line}")
+    print()
 
 # Summary
 print("="*70)
@@ -273,9 +259,11 @@ print("\n" + "="*70)
 print("✅ SQL ANALYSIS COMPLETE!")
 print("="*70)
 print("\nFiles created:")
-print("📄 london_property_rentals.csv - Raw property data")
+print(f"📄 {data_file} - Raw property data")
 print("💾 london_properties.db - SQLite database")
-print("📊 real_project3_property_analysis.png - 6-chart dashboard")
+if not args.no_plots:
+    print("📊 real_project3_property_analysis.png - 6-chart dashboard")
 print("💡 Open the database with any SQL client to run custom queries!")
-print("💡 View the PNG for professional visualizations")
+if not args.no_plots:
+    print("💡 View the PNG for professional visualizations")
 print("="*70 + "\n")
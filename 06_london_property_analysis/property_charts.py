@@ -0,0 +1,104 @@
+"""
+London Property Dashboard Panels
+One drawing function per chart of real_project3_property_analysis.png
+"""
+
+import numpy as np
+
+from common.downsample import plot_scatter
+
+COLORS = ['#2563eb', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
+
+
+def rent_by_zone(ax, result1):
+    """Chart 1: Average Rent by Zone"""
+    bars = ax.bar(result1['Zone'], result1['Avg_Rent'], color=COLORS[:3], edgecolor='black', linewidth=2)
+    ax.set_xlabel('Zone', fontweight='bold', fontsize=11)
+    ax.set_ylabel('Average Monthly Rent (£)', fontweight='bold', fontsize=11)
+    ax.set_title('Average Rent by Zone\nZone 1: £2,800 | Zone 3: £1,470', fontweight='bold', fontsize=12, pad=10)
+    ax.set_xticks(result1['Zone'])
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 50,
+                f'£{height:.0f}', ha='center', va='bottom', fontweight='bold', fontsize=10)
+
+
+def roi_by_postcode(ax, result2):
+    """Chart 2: ROI Potential by Postcode"""
+    bars = ax.barh(result2['Postcode'], result2['Avg_ROI'], color='#10b981', edgecolor='black', linewidth=1.5)
+    ax.set_xlabel('Average ROI (%)', fontweight='bold', fontsize=11)
+    ax.set_title('Top 5 Postcodes by ROI\nSE15 & E17 offer best returns', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(axis='x', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        width = bar.get_width()
+        ax.text(width + 0.2, bar.get_y() + bar.get_height()/2,
+                f'{width:.1f}%', va='center', fontweight='bold', fontsize=9)
+
+
+def property_types(ax, result4):
+    """Chart 3: Property Type Distribution"""
+    explode = [0.05 if pt == '1-Bed Flat' else 0 for pt in result4['Property_Type']]
+    wedges, texts, autotexts = ax.pie(result4['Total_Properties'], labels=result4['Property_Type'],
+                                      autopct='%1.1f%%', startangle=90, colors=COLORS,
+                                      explode=explode, textprops={'fontweight': 'bold', 'fontsize': 10},
+                                      wedgeprops={'edgecolor': 'black', 'linewidth': 2})
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontsize(11)
+    ax.set_title('Property Type Distribution\n1-Bed Flats most common', fontweight='bold', fontsize=12)
+
+
+def undervalued_areas(ax, result3):
+    """Chart 4: Undervalued Areas (Zone 3)"""
+    bars = ax.bar(range(len(result3)), result3['Avg_ROI'], color=COLORS, edgecolor='black', linewidth=2)
+    ax.set_xticks(range(len(result3)))
+    ax.set_xticklabels(result3['Postcode'], fontweight='bold')
+    ax.set_ylabel('Average ROI (%)', fontweight='bold', fontsize=11)
+    ax.set_title('Undervalued Investment Areas\nZone 3 properties with 10%+ ROI', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(axis='y', alpha=0.3)
+
+    for i, bar in enumerate(bars):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.2,
+                f'{height:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=9)
+
+
+def roi_by_zone(ax, result1):
+    """Chart 5: Zone ROI Comparison"""
+    zones = result1['Zone'].values
+    roi_values = result1['Avg_ROI'].values
+    bar_colors = ['#ef4444', '#f59e0b', '#10b981']
+    bars = ax.bar(zones, roi_values, color=bar_colors, edgecolor='black', linewidth=2)
+    ax.set_xlabel('Zone', fontweight='bold', fontsize=11)
+    ax.set_ylabel('Average ROI (%)', fontweight='bold', fontsize=11)
+    ax.set_title('ROI Potential by Zone\nZone 3: 114% higher ROI than Zone 1', fontweight='bold', fontsize=12, pad=10)
+    ax.set_xticks(zones)
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.2,
+                f'{height:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=10)
+
+
+def zone3_rent_vs_roi(ax, zone3_data):
+    """Chart 6: Rent vs ROI Scatter (Zone 3 only)"""
+    # Past SCATTER_POINT_LIMIT listings this becomes a hexbin of mean ROI
+    scatter = plot_scatter(ax, zone3_data['Monthly_Rent'], zone3_data['ROI_Potential'],
+                           c=zone3_data['ROI_Potential'], cmap='RdYlGn',
+                           s=100, alpha=0.6, edgecolors='black', linewidth=1)
+    ax.set_xlabel('Monthly Rent (£)', fontweight='bold', fontsize=11)
+    ax.set_ylabel('ROI Potential (%)', fontweight='bold', fontsize=11)
+    ax.set_title('Zone 3: Rent vs ROI\nLower rent = Higher ROI', fontweight='bold', fontsize=12, pad=10)
+    ax.grid(True, alpha=0.3)
+    ax.figure.colorbar(scatter, ax=ax, label='ROI %')
+
+    # Add trend line (a straight line only needs its two end points)
+    z = np.polyfit(zone3_data['Monthly_Rent'], zone3_data['ROI_Potential'], 1)
+    p = np.poly1d(z)
+    ends = np.array([zone3_data['Monthly_Rent'].min(), zone3_data['Monthly_Rent'].max()])
+    ax.plot(ends, p(ends), "--", color='#ef4444', linewidth=2, alpha=0.8, label='Trend')
+    ax.legend()
@@ -0,0 +1,204 @@
+"""
+London Property Database
+Schema, tuned bulk loading and covering indexes for london_properties.db
+"""
+
+import sqlite3
+import time
+
+from property_summaries import rebuild_summaries, summaries_exist
+
+COLUMNS = [
+    'Property_ID', 'Postcode', 'Zone', 'Property_Type', 'Bedrooms',
+    'Monthly_Rent', 'Amenities', 'Listed_Date', 'Is_Occupied', 'ROI_Potential',
+]
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    Property_ID TEXT PRIMARY KEY,
+    Postcode TEXT,
+    Zone INTEGER,
+    Property_Type TEXT,
+    Bedrooms INTEGER,
+    Monthly_Rent REAL,
+    Amenities TEXT,
+    Listed_Date TEXT,
+    Is_Occupied TEXT,
+    ROI_Potential REAL
+)
+'''
+
+META_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS ingest_meta (
+    Key TEXT PRIMARY KEY,
+    Value TEXT
+)
+'''
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,  # 64 MB page cache
+    'temp_store': 'MEMORY',
+}
+
+# Covering indexes for the report queries in create_sql_analysis.py
+INDEXES = {
+    # Query 1 (GROUP BY Zone) and Query 3 (Zone = 3 AND ROI > 10, GROUP BY Postcode)
+    'idx_properties_zone_postcode': '(Zone, Postcode, ROI_Potential, Monthly_Rent)',
+    # Query 2 (GROUP BY Postcode, Zone)
+    'idx_properties_postcode_zone': '(Postcode, Zone, ROI_Potential, Monthly_Rent)',
+    # Query 4 (GROUP BY Property_Type with occupancy)
+    'idx_properties_type': '(Property_Type, Is_Occupied, Monthly_Rent, ROI_Potential)',
+    # Query 5 (Listed_Date window, GROUP BY Postcode)
+    'idx_properties_listed': '(Listed_Date, Postcode, Monthly_Rent)',
+}
+
+
+def connect(path='london_properties.db'):
+    """Open the database with the tuned pragmas applied"""
+    conn = sqlite3.connect(path)
+    for name, value in PRAGMAS.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def create_schema(conn, drop=False):
+    if drop:
+        conn.execute('DROP TABLE IF EXISTS properties')
+    conn.execute(SCHEMA.format(table='properties'))
+
+
+def build_indexes(conn, analyze=True):
+    """
+    Create the covering indexes and refresh planner statistics. A full
+    ANALYZE follows bulk loads; incremental runs use PRAGMA optimize,
+    which only re-analyzes when the table has changed enough.
+    """
+    with conn:
+        for name, columns in INDEXES.items():
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON properties {columns}')
+    conn.execute('ANALYZE' if analyze else 'PRAGMA optimize')
+
+
+def _insert_sql(table, verb='INSERT'):
+    return (f'{verb} INTO {table} ({", ".join(COLUMNS)}) '
+            f'VALUES ({", ".join("?" * len(COLUMNS))})')
+
+
+def rows_from_frame(df):
+    """Plain Python tuples in schema column order, ready for executemany"""
+    return df[COLUMNS].itertuples(index=False, name=None)
+
+
+def load_properties(conn, df):
+    """
+    Replace the contents of properties with df: drop the table, bulk insert
+    with executemany in a single transaction, then rebuild the indexes and
+    the materialized summaries.
+    Returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    create_schema(conn, drop=True)
+    with conn:
+        conn.executemany(_insert_sql('properties'), rows_from_frame(df))
+        conn.execute(META_SCHEMA)
+        hwm = conn.execute('SELECT MAX(Listed_Date) FROM properties').fetchone()[0]
+        conn.execute("INSERT OR REPLACE INTO ingest_meta (Key, Value) VALUES ('listed_date_hwm', ?)", (hwm,))
+    build_indexes(conn)
+    rebuild_summaries(conn)
+    return time.perf_counter() - start
+
+
+def get_high_water_mark(conn):
+    """Latest Listed_Date ingested so far, or None for an empty database"""
+    conn.execute(META_SCHEMA)
+    row = conn.execute("SELECT Value FROM ingest_meta WHERE Key = 'listed_date_hwm'").fetchone()
+    return row[0] if row else None
+
+
+def is_legacy_table(conn):
+    """
+    True if properties exists without a Property_ID primary key, as left by
+    the old pandas to_sql load; such a table cannot be upserted into
+    """
+    columns = conn.execute('PRAGMA table_info(properties)').fetchall()
+    return bool(columns) and not any(name == 'Property_ID' and pk for _, name, _, _, _, pk in columns)
+
+
+def upsert_properties(conn, df):
+    """
+    Incrementally ingest a batch keyed on Property_ID. The batch is staged
+    in a temp table and diffed against properties. Only new or changed
+    rows are written (INSERT ... ON CONFLICT DO UPDATE ... WHERE changed),
+    then the Listed_Date high-water mark is advanced. Triggers fold the
+    written rows into the materialized summaries. A legacy keyless table
+    (see is_legacy_table) must be replaced with load_properties first.
+
+    Returns a dict of inserted/updated/unchanged counts (per distinct
+    Property_ID), the rows dropped as repeats within the batch, the
+    high-water mark and per-phase timings in seconds.
+    """
+    timings = {}
+    start = time.perf_counter()
+    create_schema(conn)
+    conn.execute(META_SCHEMA)
+    previous_hwm = get_high_water_mark(conn)
+    # Existing summary tables are kept current by their triggers
+    maintained = summaries_exist(conn)
+
+    others = [c for c in COLUMNS if c != 'Property_ID']
+    changed = ' OR '.join(f'p.{c} IS NOT i.{c}' for c in others)
+
+    with conn:
+        conn.execute('DROP TABLE IF EXISTS temp.incoming_properties')
+        # Keyed like properties, so a batch that repeats a Property_ID
+        # stages it once (the last copy wins, as the upsert would)
+        conn.execute(SCHEMA.format(table='temp.incoming_properties'))
+        conn.executemany(_insert_sql('temp.incoming_properties', 'INSERT OR REPLACE'), rows_from_frame(df))
+        staged = conn.execute('SELECT COUNT(*) FROM temp.incoming_properties').fetchone()[0]
+        timings['stage'] = time.perf_counter() - start
+
+        phase = time.perf_counter()
+        inserted, updated = conn.execute(f'''
+            SELECT
+                SUM(CASE WHEN p.Property_ID IS NULL THEN 1 ELSE 0 END),
+                SUM(CASE WHEN p.Property_ID IS NOT NULL AND ({changed}) THEN 1 ELSE 0 END)
+            FROM temp.incoming_properties i
+            LEFT JOIN properties p ON p.Property_ID = i.Property_ID
+        ''').fetchone()
+        inserted, updated = inserted or 0, updated or 0
+        timings['diff'] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        conn.execute(f'''
+            INSERT INTO properties ({", ".join(COLUMNS)})
+            SELECT {", ".join(COLUMNS)} FROM temp.incoming_properties WHERE true
+            ON CONFLICT(Property_ID) DO UPDATE SET
+                {", ".join(f"{c} = excluded.{c}" for c in others)}
+            WHERE {" OR ".join(f"properties.{c} IS NOT excluded.{c}" for c in others)}
+        ''')
+        timings['upsert'] = time.perf_counter() - phase
+
+        batch_hwm = conn.execute('SELECT MAX(Listed_Date) FROM temp.incoming_properties').fetchone()[0]
+        hwm = max(filter(None, [previous_hwm, batch_hwm]), default=None)
+        if hwm is not None:
+            conn.execute("INSERT OR REPLACE INTO ingest_meta (Key, Value) VALUES ('listed_date_hwm', ?)", (hwm,))
+        conn.execute('DROP TABLE temp.incoming_properties')
+
+    phase = time.perf_counter()
+    build_indexes(conn, analyze=previous_hwm is None)
+    if not maintained:
+        rebuild_summaries(conn)
+    timings['index'] = time.perf_counter() - phase
+    timings['total'] = time.perf_counter() - start
+
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': staged - inserted - updated,
+        'duplicates': len(df) - staged,
+        'previous_hwm': previous_hwm,
+        'high_water_mark': hwm,
+        'timings': timings,
+    }
@@ -0,0 +1,141 @@
+"""
+London Property Engine
+Vectorized, reproducible generator for synthetic rental listings
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# London postcodes with average rent characteristics
+POSTCODES = {
+    # Central London (expensive)
+    'SW1': {'zone': 1, 'avg_rent': 2800, 'variance': 500},
+    'WC1': {'zone': 1, 'avg_rent': 2650, 'variance': 450},
+    'EC1': {'zone': 1, 'avg_rent': 2900, 'variance': 550},
+
+    # Inner London (moderate-high)
+    'N1': {'zone': 2, 'avg_rent': 2100, 'variance': 400},
+    'E1': {'zone': 2, 'avg_rent': 1950, 'variance': 350},
+    'SW9': {'zone': 2, 'avg_rent': 1850, 'variance': 300},
+    'SE1': {'zone': 2, 'avg_rent': 2000, 'variance': 380},
+
+    # Outer London (affordable)
+    'SE15': {'zone': 3, 'avg_rent': 1450, 'variance': 250},  # UNDERVALUED
+    'E17': {'zone': 3, 'avg_rent': 1380, 'variance': 220},   # UNDERVALUED
+    'N22': {'zone': 3, 'avg_rent': 1500, 'variance': 240},
+    'SW16': {'zone': 3, 'avg_rent': 1520, 'variance': 260},
+    'SE23': {'zone': 3, 'avg_rent': 1480, 'variance': 230},
+}
+
+# Property types
+PROPERTY_TYPES = {
+    'Studio': {'beds': 0, 'rent_multiplier': 0.65, 'weight': 2},
+    '1-Bed Flat': {'beds': 1, 'rent_multiplier': 1.0, 'weight': 4},
+    '2-Bed Flat': {'beds': 2, 'rent_multiplier': 1.4, 'weight': 3},
+    '3-Bed House': {'beds': 3, 'rent_multiplier': 1.8, 'weight': 1},
+}
+
+# Amenities affecting price, stored per property as a bitmask
+AMENITIES = ['Furnished', 'Parking', 'Garden', 'Balcony', 'Recently Renovated']
+AMENITY_BONUS = 50
+
+# ROI potential band (min, max) per zone
+ROI_BANDS = {
+    1: (3.5, 5.0),    # Central London
+    2: (5.5, 7.5),    # Inner London
+    3: (8.0, 12.0),   # Outer London (BEST ROI)
+}
+
+LISTING_WINDOW_DAYS = 180
+OCCUPANCY_RATE = 0.90
+REFERENCE_DATE = date(2024, 12, 1)
+
+COLUMNS = ['Property_ID', 'Postcode', 'Zone', 'Property_Type', 'Bedrooms', 'Monthly_Rent',
+           'Amenities', 'Listed_Date', 'Is_Occupied', 'ROI_Potential']
+
+
+def amenity_labels(masks):
+    """Turn amenity bitmasks into the 'Furnished, Parking' text used in the CSV"""
+    lookup = np.array([', '.join(a for bit, a in enumerate(AMENITIES) if m >> bit & 1)
+                       for m in range(1 << len(AMENITIES))], dtype=object)
+    return lookup[masks]
+
+
+class PropertyGenerator:
+    """
+    Draws listings one block at a time as numpy arrays. Every (postcode,
+    block) pair has its own seed derived from `seed`, so output depends
+    only on seed, scale, block_size and reference_date.
+    """
+
+    def __init__(self, seed=42, scale=1.0, reference_date=REFERENCE_DATE, block_size=100_000):
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.seed = seed
+        self.scale = scale
+        self.reference_date = np.datetime64(reference_date, 'D')
+        self.block_size = block_size
+
+        type_names = list(PROPERTY_TYPES)
+        self._type_names = np.array(type_names, dtype=object)
+        weights = np.array([PROPERTY_TYPES[t]['weight'] for t in type_names], dtype=float)
+        self._type_p = weights / weights.sum()
+        self._beds = np.array([PROPERTY_TYPES[t]['beds'] for t in type_names])
+        self._multiplier = np.array([PROPERTY_TYPES[t]['rent_multiplier'] for t in type_names])
+        self._bit_values = 1 << np.arange(len(AMENITIES))
+
+    def postcode_counts(self):
+        """Listings per postcode: 35-55 at scale 1, multiplied by scale"""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(0,)))
+        base = rng.integers(35, 56, size=len(POSTCODES))
+        return dict(zip(POSTCODES, np.maximum(1, np.rint(base * self.scale)).astype(np.int64)))
+
+    def total_properties(self):
+        return int(sum(self.postcode_counts().values()))
+
+    def _draw(self, postcode, details, n, rng):
+        prop_type = rng.choice(len(self._type_names), size=n, p=self._type_p)
+
+        # Pick 1-3 distinct amenities: the k smallest of 5 random keys
+        k = rng.integers(1, 4, size=n)
+        ranks = rng.random((n, len(AMENITIES))).argsort(axis=1).argsort(axis=1)
+        masks = (ranks < k[:, None]) @ self._bit_values
+
+        rent = (details['avg_rent'] * self._multiplier[prop_type]
+                + rng.normal(0, details['variance'], size=n)
+                + k * AMENITY_BONUS)
+        days_ago = rng.integers(0, LISTING_WINDOW_DAYS + 1, size=n)
+        is_occupied = rng.random(n) < OCCUPANCY_RATE
+        roi_low, roi_high = ROI_BANDS[details['zone']]
+        roi = rng.uniform(roi_low, roi_high, size=n)
+
+        return {
+            'Postcode': np.full(n, postcode, dtype=object),
+            'Zone': np.full(n, details['zone']),
+            'Property_Type': self._type_names[prop_type],
+            'Bedrooms': self._beds[prop_type],
+            'Monthly_Rent': np.round(rent, 2),
+            'Amenity_Mask': masks,
+            'Listed_Date': (self.reference_date - days_ago).astype(str).astype(object),
+            'Is_Occupied': np.where(is_occupied, 'Yes', 'No').astype(object),
+            'ROI_Potential': np.round(roi, 2),
+        }
+
+    def iter_chunks(self):
+        """Yield one DataFrame per block; at most block_size rows each"""
+        property_id = 1
+        for i, (postcode, count) in enumerate(self.postcode_counts().items()):
+            details = POSTCODES[postcode]
+            for block, start in enumerate(range(0, count, self.block_size)):
+                n = min(self.block_size, count - start)
+                rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(1, i, block)))
+                columns = self._draw(postcode, details, n, rng)
+                ids = pd.Series(np.arange(property_id, property_id + n)).astype(str).str.zfill(4)
+                columns['Property_ID'] = ids.radd('PROP').to_numpy()
+                columns['Amenities'] = amenity_labels(columns.pop('Amenity_Mask'))
+                property_id += n
+                yield pd.DataFrame(columns, columns=COLUMNS)
@@ -0,0 +1,159 @@
+"""
+Materialized Property Summaries
+Per-Zone, per-Postcode+Zone and per-Property_Type rollups kept in london_properties.db
+"""
+
+import math
+
+# Summary table -> grouping columns
+SUMMARIES = {
+    'zone_summary': ('Zone',),
+    'postcode_summary': ('Postcode', 'Zone'),
+    'type_summary': ('Property_Type',),
+}
+
+# Running aggregates held for every group. Monthly_Rent and ROI_Potential
+# are assumed to be non-null, as they are in every generated dataset.
+MEASURES = {
+    'Property_Count': 'COUNT(*)',
+    'Occupied': "SUM(CASE WHEN Is_Occupied = 'Yes' THEN 1 ELSE 0 END)",
+    'Rent_Sum': 'SUM(Monthly_Rent)',
+    'Rent_Min': 'MIN(Monthly_Rent)',
+    'Rent_Max': 'MAX(Monthly_Rent)',
+    'ROI_Sum': 'SUM(ROI_Potential)',
+    'ROI_Min': 'MIN(ROI_Potential)',
+    'ROI_Max': 'MAX(ROI_Potential)',
+}
+
+# Columns whose change moves a row between groups or alters a measure
+TRACKED_COLUMNS = ('Zone', 'Postcode', 'Property_Type', 'Monthly_Rent', 'ROI_Potential', 'Is_Occupied')
+
+
+def _create_table_sql(table, keys):
+    key_types = {'Zone': 'INTEGER', 'Postcode': 'TEXT', 'Property_Type': 'TEXT'}
+    columns = [f'{k} {key_types[k]}' for k in keys]
+    columns += [f'{m} {"INTEGER" if m in ("Property_Count", "Occupied") else "REAL"}' for m in MEASURES]
+    return f'CREATE TABLE IF NOT EXISTS {table} ({", ".join(columns)}, PRIMARY KEY ({", ".join(keys)}))'
+
+
+def _recompute_sql(table, keys):
+    return (f'INSERT INTO {table} ({", ".join(keys)}, {", ".join(MEASURES)}) '
+            f'SELECT {", ".join(keys)}, {", ".join(MEASURES.values())} '
+            f'FROM properties GROUP BY {", ".join(keys)}')
+
+
+def _add_row_sql(table, keys, row):
+    """Fold one properties row (NEW or OLD alias) into its group"""
+    occupied = f"CASE WHEN {row}.Is_Occupied = 'Yes' THEN 1 ELSE 0 END"
+    return f'''
+        INSERT INTO {table} ({", ".join(keys)}, {", ".join(MEASURES)})
+        VALUES ({", ".join(f"{row}.{k}" for k in keys)}, 1, {occupied},
+                {row}.Monthly_Rent, {row}.Monthly_Rent, {row}.Monthly_Rent,
+                {row}.ROI_Potential, {row}.ROI_Potential, {row}.ROI_Potential)
+        ON CONFLICT ({", ".join(keys)}) DO UPDATE SET
+            Property_Count = Property_Count + 1,
+            Occupied = Occupied + excluded.Occupied,
+            Rent_Sum = Rent_Sum + excluded.Rent_Sum,
+            Rent_Min = MIN(Rent_Min, excluded.Rent_Min),
+            Rent_Max = MAX(Rent_Max, excluded.Rent_Max),
+            ROI_Sum = ROI_Sum + excluded.ROI_Sum,
+            ROI_Min = MIN(ROI_Min, excluded.ROI_Min),
+            ROI_Max = MAX(ROI_Max, excluded.ROI_Max);'''
+
+
+def _remove_row_sql(table, keys, row):
+    """
+    Take one properties row (OLD alias) out of its group. Counts and sums
+    are decremented; min/max are re-read from properties only when the
+    removed value sat on the boundary, and empty groups are deleted.
+    """
+    match = ' AND '.join(f'{k} = {row}.{k}' for k in keys)
+    base_match = ' AND '.join(f'p.{k} = {row}.{k}' for k in keys)
+    return f'''
+        UPDATE {table} SET
+            Property_Count = Property_Count - 1,
+            Occupied = Occupied - (CASE WHEN {row}.Is_Occupied = 'Yes' THEN 1 ELSE 0 END),
+            Rent_Sum = Rent_Sum - {row}.Monthly_Rent,
+            ROI_Sum = ROI_Sum - {row}.ROI_Potential
+        WHERE {match};
+        UPDATE {table} SET
+            Rent_Min = (SELECT MIN(p.Monthly_Rent) FROM properties p WHERE {base_match}),
+            Rent_Max = (SELECT MAX(p.Monthly_Rent) FROM properties p WHERE {base_match}),
+            ROI_Min = (SELECT MIN(p.ROI_Potential) FROM properties p WHERE {base_match}),
+            ROI_Max = (SELECT MAX(p.ROI_Potential) FROM properties p WHERE {base_match})
+        WHERE {match} AND Property_Count > 0 AND (
+            {row}.Monthly_Rent <= Rent_Min OR {row}.Monthly_Rent >= Rent_Max OR
+            {row}.ROI_Potential <= ROI_Min OR {row}.ROI_Potential >= ROI_Max);
+        DELETE FROM {table} WHERE {match} AND Property_Count <= 0;'''
+
+
+def _trigger_sql(table, keys):
+    return [
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON properties
+        BEGIN {_add_row_sql(table, keys, 'NEW')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON properties
+        BEGIN {_remove_row_sql(table, keys, 'OLD')}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {table}_update
+        AFTER UPDATE OF {", ".join(TRACKED_COLUMNS)} ON properties
+        BEGIN {_remove_row_sql(table, keys, 'OLD')} {_add_row_sql(table, keys, 'NEW')}
+        END''',
+    ]
+
+
+def summaries_exist(conn):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return all(table in names for table in SUMMARIES)
+
+
+def drop_triggers(conn):
+    for table in SUMMARIES:
+        for event in ('insert', 'delete', 'update'):
+            conn.execute(f'DROP TRIGGER IF EXISTS {table}_{event}')
+
+
+def rebuild_summaries(conn):
+    """
+    Recompute every summary from properties in one GROUP BY pass each and
+    (re)install the triggers that keep them current afterwards. Used after
+    bulk loads, where per-row triggers would be slower than a rebuild.
+    """
+    with conn:
+        drop_triggers(conn)
+        for table, keys in SUMMARIES.items():
+            conn.execute(f'DROP TABLE IF EXISTS {table}')
+            conn.execute(_create_table_sql(table, keys))
+            conn.execute(_recompute_sql(table, keys))
+            for sql in _trigger_sql(table, keys):
+                conn.execute(sql)
+
+
+def verify_summaries(conn, rel_tol=1e-9):
+    """
+    Compare every materialized summary against a full recompute from
+    properties. Returns a list of mismatch descriptions (empty when
+    consistent). Sums are compared with a relative tolerance because
+    incremental add/subtract rounds differently from one SUM().
+    """
+    problems = []
+    for table, keys in SUMMARIES.items():
+        columns = list(keys) + list(MEASURES)
+        stored = {row[:len(keys)]: row[len(keys):]
+                  for row in conn.execute(f'SELECT {", ".join(columns)} FROM {table}')}
+        fresh = {row[:len(keys)]: row[len(keys):]
+                 for row in conn.execute(f'SELECT {", ".join(keys)}, {", ".join(MEASURES.values())} '
+                                         f'FROM properties GROUP BY {", ".join(keys)}')}
+
+        for group in sorted(set(stored) | set(fresh), key=repr):
+            if group not in stored or group not in fresh:
+                problems.append(f'{table} {group}: group only in {"summary" if group in stored else "properties"}')
+                continue
+            for name, got, expected in zip(MEASURES, stored[group], fresh[group]):
+                if name.endswith('_Sum'):
+                    ok = math.isclose(got, expected, rel_tol=rel_tol, abs_tol=1e-6)
+                else:
+                    ok = got == expected
+                if not ok:
+                    problems.append(f'{table} {group}: {name} is {got}, recompute gives {expected}')
+    return problems
@@ -0,0 +1,73 @@
+"""
+Concurrent Read-Only Query Runner
+Runs independent report queries in parallel on a pool of read-only SQLite connections
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+
+class QueryResult:
+    """A query's DataFrame and how long it took to run"""
+
+    def __init__(self, name, frame, seconds):
+        self.name = name
+        self.frame = frame
+        self.seconds = seconds
+
+
+class QueryRunner:
+    """
+    Thread pool where each worker owns one read-only connection
+    (URI mode=ro). sqlite3 releases the GIL while a statement runs and WAL
+    lets readers proceed side by side, so independent aggregates overlap.
+    """
+
+    def __init__(self, path='london_properties.db', workers=4):
+        self.uri = Path(path).resolve().as_uri() + '?mode=ro'
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sql-reader')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+            conn.execute('PRAGMA query_only = ON')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _run(self, name, sql):
+        start = time.perf_counter()
+        frame = pd.read_sql_query(sql, self._connection())
+        return QueryResult(name, frame, time.perf_counter() - start)
+
+    def submit(self, queries):
+        """Start every query now; returns {name: Future[QueryResult]}"""
+        return {name: self._pool.submit(self._run, name, sql) for name, sql in queries.items()}
+
+    def run(self, queries):
+        """Run all queries concurrently and wait; returns {name: QueryResult}"""
+        futures = self.submit(queries)
+        return {name: future.result() for name, future in futures.items()}
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
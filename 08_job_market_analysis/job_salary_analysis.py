@@ -1,17 +1,46 @@
-import pandas as pd
+import argparse
+import sys
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import statsmodels.api as sm
+import pandas as pd
 
-# Extract and clean data from academic project
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.build import BuildGraph
+from common.cache import AnalysisCache
+from common.render import Panel, add_render_arguments, build_dashboard, describe_render, render_options
+from common.workbook import read_sheet
+
+from regression import OnlineOLS
+from resampling import bootstrap, permutation_test
+
+parser = argparse.ArgumentParser(description="Salary vs stress tolerance regression analysis")
+parser.add_argument('--no-cache', action='store_true',
+                    help="Re-read the workbook instead of the sheet cached in .analysis_cache")
+parser.add_argument('--full-summary', action='store_true',
+                    help="Also fit with statsmodels and print its full OLS summary (slow to import)")
+parser.add_argument('--resamples', type=int, default=10_000,
+                    help="Bootstrap and permutation resamples for the slope/correlation (0 to skip)")
+parser.add_argument('--resample-workers', type=int, default=0,
+                    help="Processes for resampling (0: in-process, -1: one per CPU)")
+parser.add_argument('--seed', type=int, default=42, help="Random seed for resampling")
+add_render_arguments(parser)
+args = parser.parse_args()
+if args.resamples < 0:
+    parser.error("--resamples must be 0 (skip) or a positive count")
+
+DATA_FILE = '9408_Serghei_Covalciuc_BSU_MD_Test_1_to_8_Cohort_7_Resubmission_55231_656397023.xlsx'
+
+# Extract and clean data from academic project. The sheet is streamed out
+# of the workbook once and cached as Feather until the workbook changes;
+# only its first three columns are read back
 print("Loading job salary and stress data...")
-df = pd.read_excel('9408_Serghei_Covalciuc_BSU_MD_Test_1_to_8_Cohort_7_Resubmission_55231_656397023.xlsx', 
-                   sheet_name='Test 8')
+cache = AnalysisCache(enabled=not args.no_cache)
+df = read_sheet(DATA_FILE, 'Test 8', columns=[0, 1, 2], cache=cache)
+print(f"✓ Sheet 'Test 8': {'cached copy' if cache.hits else 'read from workbook'}")
 
 # Clean the data - keep only the first 10 valid rows
-df_clean = df.iloc[:10, [0, 1, 2]].copy()
+df_clean = df.iloc[:10].copy()
 df_clean.columns = ['Job', 'Salary', 'Stress_Tolerance']
 df_clean = df_clean.dropna()
 
@@ -38,109 +67,92 @@ print(df_clean[['Salary', 'Stress_Tolerance']].describe())
 correlation = df_clean['Salary'].corr(df_clean['Stress_Tolerance'])
 print(f"\nCorrelation coefficient: {correlation:.4f}")
 
-# Linear regression
-X = df_clean['Stress_Tolerance'].values.reshape(-1, 1)
-y = df_clean['Salary'].values
-
-# Using statsmodels for detailed stats
-X_sm = sm.add_constant(X)
-model = sm.OLS(y, X_sm)
-results = model.fit()
+# Linear regression, closed form from running sums of the data
+regression = OnlineOLS().update(df_clean['Stress_Tolerance'], df_clean['Salary']).result()
 
 print("\n" + "="*80)
 print("REGRESSION RESULTS")
 print("="*80)
-print(results.summary())
+for line in regression.summary_lines('Stress_Tolerance', 'Salary'):
+    print(line)
+
+# statsmodels only for the complete diagnostic table
+if args.full_summary:
+    import statsmodels.api as sm
+    X_sm = sm.add_constant(df_clean['Stress_Tolerance'].values.reshape(-1, 1))
+    print()
+    print(sm.OLS(df_clean['Salary'].values, X_sm).fit().summary())
 
 # Extract coefficients
-intercept = results.params[0]
-slope = results.params[1]
-r_squared = results.rsquared
+intercept = regression.intercept
+slope = regression.slope
+r_squared = regression.r_squared
 
 print(f"\nRegression Equation:")
 print(f"Salary = {intercept:.2f} + {slope:.2f} × Stress_Tolerance")
 print(f"R² = {r_squared:.4f}")
 
-# Create professional visualizations
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-fig.suptitle('Job Market Analysis: Salary vs Stress Tolerance', fontsize=16, fontweight='bold')
-
-# 1. Scatter plot with regression line
-axes[0, 0].scatter(df_clean['Stress_Tolerance'], df_clean['Salary'], 
-                   alpha=0.7, s=100, color='#2E86AB', edgecolor='black', linewidth=1.5)
-axes[0, 0].plot(df_clean['Stress_Tolerance'], results.fittedvalues, 
-                color='#A23B72', linewidth=2.5, label=f'y = {intercept:.1f} + {slope:.1f}x')
-axes[0, 0].set_xlabel('Stress Tolerance', fontsize=11, fontweight='bold')
-axes[0, 0].set_ylabel('Average Annual Salary ($1000s)', fontsize=11, fontweight='bold')
-axes[0, 0].set_title(f'Salary vs Stress Tolerance\nR² = {r_squared:.4f}', fontsize=12, fontweight='bold')
-axes[0, 0].legend(fontsize=10)
-axes[0, 0].grid(True, alpha=0.3)
-
-# 2. Residual plot
-residuals = results.resid
-axes[0, 1].scatter(results.fittedvalues, residuals, alpha=0.7, s=100, 
-                   color='#F18F01', edgecolor='black', linewidth=1.5)
-axes[0, 1].axhline(y=0, color='red', linestyle='--', linewidth=2)
-axes[0, 1].set_xlabel('Fitted Values', fontsize=11, fontweight='bold')
-axes[0, 1].set_ylabel('Residuals', fontsize=11, fontweight='bold')
-axes[0, 1].set_title('Residual Plot', fontsize=12, fontweight='bold')
-axes[0, 1].grid(True, alpha=0.3)
-
-# 3. Bar chart of salaries
-df_sorted = df_clean.sort_values('Salary', ascending=True)
-colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(df_sorted)))
-axes[1, 0].barh(df_sorted['Job'], df_sorted['Salary'], color=colors, edgecolor='black', linewidth=1)
-axes[1, 0].set_xlabel('Average Annual Salary ($1000s)', fontsize=11, fontweight='bold')
-axes[1, 0].set_title('Average Salaries by Job Title', fontsize=12, fontweight='bold')
-axes[1, 0].grid(axis='x', alpha=0.3)
-
-# 4. Stress tolerance comparison
-df_sorted_stress = df_clean.sort_values('Stress_Tolerance', ascending=True)
-colors2 = plt.cm.coolwarm(np.linspace(0.2, 0.8, len(df_sorted_stress)))
-axes[1, 1].barh(df_sorted_stress['Job'], df_sorted_stress['Stress_Tolerance'], 
-                color=colors2, edgecolor='black', linewidth=1)
-axes[1, 1].set_xlabel('Stress Tolerance Score', fontsize=11, fontweight='bold')
-axes[1, 1].set_title('Stress Tolerance by Job Title', fontsize=12, fontweight='bold')
-axes[1, 1].grid(axis='x', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('job_salary_stress_analysis.png', dpi=300, bbox_inches='tight')
-print("\n✓ Visualization saved: job_salary_stress_analysis.png")
-
-# Create a second detailed plot
-fig2, ax = plt.subplots(figsize=(12, 8))
-
-# Enhanced scatter plot with labels
-scatter = ax.scatter(df_clean['Stress_Tolerance'], df_clean['Salary'], 
-                     s=200, alpha=0.6, c=df_clean['Salary'], cmap='RdYlGn',
-                     edgecolor='black', linewidth=2)
-
-# Add regression line
-ax.plot(df_clean['Stress_Tolerance'], results.fittedvalues, 
-        color='darkblue', linewidth=3, label=f'Linear fit: R² = {r_squared:.3f}', linestyle='--')
-
-# Add labels for each point
-for idx, row in df_clean.iterrows():
-    ax.annotate(row['Job'], 
-                (row['Stress_Tolerance'], row['Salary']),
-                xytext=(5, 5), textcoords='offset points',
-                fontsize=9, fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.3))
-
-ax.set_xlabel('Stress Tolerance Score', fontsize=13, fontweight='bold')
-ax.set_ylabel('Average Annual Salary ($1000s)', fontsize=13, fontweight='bold')
-ax.set_title('Career Analysis: Does Higher Stress Mean Higher Pay?', 
-             fontsize=15, fontweight='bold', pad=20)
-ax.legend(fontsize=12, loc='best')
-ax.grid(True, alpha=0.3, linestyle='--')
-
-# Add colorbar
-cbar = plt.colorbar(scatter, ax=ax)
-cbar.set_label('Salary Level', fontsize=11, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('job_salary_stress_detailed.png', dpi=300, bbox_inches='tight')
-print("✓ Detailed visualization saved: job_salary_stress_detailed.png")
+# Resampling intervals, which do not assume normally distributed residuals
+if args.resamples:
+    workers = None if args.resample_workers < 0 else args.resample_workers
+    stress, salary = df_clean['Stress_Tolerance'], df_clean['Salary']
+    # Independent streams, so the two tests do not reuse each other's draws
+    boot_seed, perm_seed = np.random.SeedSequence(args.seed).spawn(2)
+    boot = bootstrap(stress, salary, args.resamples, seed=boot_seed, workers=workers)
+    perm = permutation_test(stress, salary, args.resamples, seed=perm_seed, workers=workers)
+
+    print("\n" + "="*80)
+    print(f"RESAMPLING ({args.resamples:,} resamples each)")
+    print("="*80)
+    for name, label in [('r', 'Correlation'), ('slope', 'Slope')]:
+        low, high = boot.intervals[name]
+        print(f"{label:<12} {boot.observed[name]:>9.4f}   95% bootstrap CI [{low:.4f}, {high:.4f}]   "
+              f"bootstrap SE {boot.standard_errors[name]:.4f}")
+    print(f"Permutation p-value (correlation and slope): {perm.p_value:.4f}")
+    print(f"Throughput: bootstrap {boot.resamples_per_second:,.0f} resamples/sec, "
+          f"permutation {perm.resamples_per_second:,.0f} resamples/sec")
+
+if args.no_plots:
+    print("\n💡 Skipped the charts (--no-plots)")
+else:
+    import job_salary_charts
+
+    # Create professional visualizations: the four panels are drawn in
+    # separate processes and tiled into one PNG
+    fitted = regression.predict(df_clean['Stress_Tolerance'])
+    residuals = df_clean['Salary'].to_numpy(dtype=float) - fitted
+    panels = [
+        Panel('salary_vs_stress', job_salary_charts.salary_vs_stress,
+              df_clean, fitted, intercept, slope, r_squared),
+        Panel('residuals', job_salary_charts.residuals_plot, fitted, residuals),
+        Panel('salaries_by_job', job_salary_charts.salaries_by_job, df_clean),
+        Panel('stress_by_job', job_salary_charts.stress_by_job, df_clean),
+    ]
+    # Each chart is only redrawn when the workbook, the regression or the
+    # drawing code changed
+    graph = BuildGraph(force=args.force)
+    timings = build_dashboard(graph, panels, 'job_salary_stress_analysis.png', inputs=[DATA_FILE],
+                              options=render_options(args), layout=(2, 2), figsize=(14, 10), dpi=300,
+                              title='Job Market Analysis: Salary vs Stress Tolerance',
+                              title_kwargs={'fontsize': 16, 'fontweight': 'bold'})
+    if timings is None:
+        print("\n✓ Up to date: job_salary_stress_analysis.png")
+    else:
+        print("\n✓ Visualization saved: job_salary_stress_analysis.png")
+        print(f"✓ {describe_render(timings, graph.results[-1].seconds)}")
+
+    # Create a second detailed plot
+    detailed = [Panel('labelled_scatter', job_salary_charts.labelled_salary_scatter, df_clean, fitted, r_squared)]
+    timings = build_dashboard(graph, detailed, 'job_salary_stress_detailed.png', inputs=[DATA_FILE],
+                              options=render_options(args), layout=(1, 1), figsize=(12, 8), dpi=300)
+    if timings is None:
+        print("✓ Up to date: job_salary_stress_detailed.png")
+    else:
+        print("✓ Detailed visualization saved: job_salary_stress_detailed.png")
+
+    print("\nBuild report:")
+    for line in graph.report():
+        print(f"   {line}")
 
 # Generate insights report
 print("\n" + "="*80)
@@ -157,6 +169,10 @@ else:
 print(f"\n2. Regression Model:")
 print(f"   - For every 1-point increase in stress tolerance, salary increases by ${slope:.2f}k")
 print(f"   - Model explains {r_squared*100:.1f}% of salary variance (R² = {r_squared:.4f})")
+print(f"   - Slope standard error {regression.slope_se:.2f}, p-value {regression.slope_p:.4f}")
+if args.resamples:
+    low, high = boot.intervals['slope']
+    print(f"   - Bootstrap 95% CI for the slope: [{low:.2f}, {high:.2f}]; permutation p-value {perm.p_value:.4f}")
 
 print(f"\n3. Top Paying Jobs:")
 top_3 = df_clean.nlargest(3, 'Salary')[['Job', 'Salary', 'Stress_Tolerance']]
@@ -0,0 +1,83 @@
+"""
+Job Salary Dashboard Panels
+One drawing function per chart of job_salary_stress_analysis.png
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def salary_vs_stress(ax, df_clean, fitted, intercept, slope, r_squared):
+    """1. Scatter plot with regression line"""
+    ax.scatter(df_clean['Stress_Tolerance'], df_clean['Salary'],
+               alpha=0.7, s=100, color='#2E86AB', edgecolor='black', linewidth=1.5)
+    ax.plot(df_clean['Stress_Tolerance'], fitted,
+            color='#A23B72', linewidth=2.5, label=f'y = {intercept:.1f} + {slope:.1f}x')
+    ax.set_xlabel('Stress Tolerance', fontsize=11, fontweight='bold')
+    ax.set_ylabel('Average Annual Salary ($1000s)', fontsize=11, fontweight='bold')
+    ax.set_title(f'Salary vs Stress Tolerance\nR² = {r_squared:.4f}', fontsize=12, fontweight='bold')
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+
+
+def residuals_plot(ax, fitted, residuals):
+    """2. Residual plot"""
+    ax.scatter(fitted, residuals, alpha=0.7, s=100,
+               color='#F18F01', edgecolor='black', linewidth=1.5)
+    ax.axhline(y=0, color='red', linestyle='--', linewidth=2)
+    ax.set_xlabel('Fitted Values', fontsize=11, fontweight='bold')
+    ax.set_ylabel('Residuals', fontsize=11, fontweight='bold')
+    ax.set_title('Residual Plot', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+
+def salaries_by_job(ax, df_clean):
+    """3. Bar chart of salaries"""
+    df_sorted = df_clean.sort_values('Salary', ascending=True)
+    colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(df_sorted)))
+    ax.barh(df_sorted['Job'], df_sorted['Salary'], color=colors, edgecolor='black', linewidth=1)
+    ax.set_xlabel('Average Annual Salary ($1000s)', fontsize=11, fontweight='bold')
+    ax.set_title('Average Salaries by Job Title', fontsize=12, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+
+
+def stress_by_job(ax, df_clean):
+    """4. Stress tolerance comparison"""
+    df_sorted_stress = df_clean.sort_values('Stress_Tolerance', ascending=True)
+    colors2 = plt.cm.coolwarm(np.linspace(0.2, 0.8, len(df_sorted_stress)))
+    ax.barh(df_sorted_stress['Job'], df_sorted_stress['Stress_Tolerance'],
+            color=colors2, edgecolor='black', linewidth=1)
+    ax.set_xlabel('Stress Tolerance Score', fontsize=11, fontweight='bold')
+    ax.set_title('Stress Tolerance by Job Title', fontsize=12, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+
+
+def labelled_salary_scatter(ax, df_clean, fitted, r_squared):
+    """Detailed plot: every job labelled on the salary vs stress scatter"""
+    # Enhanced scatter plot with labels
+    scatter = ax.scatter(df_clean['Stress_Tolerance'], df_clean['Salary'],
+                         s=200, alpha=0.6, c=df_clean['Salary'], cmap='RdYlGn',
+                         edgecolor='black', linewidth=2)
+
+    # Add regression line
+    ax.plot(df_clean['Stress_Tolerance'], fitted,
+            color='darkblue', linewidth=3, label=f'Linear fit: R² = {r_squared:.3f}', linestyle='--')
+
+    # Add labels for each point
+    for idx, row in df_clean.iterrows():
+        ax.annotate(row['Job'],
+                    (row['Stress_Tolerance'], row['Salary']),
+                    xytext=(5, 5), textcoords='offset points',
+                    fontsize=9, fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.3))
+
+    ax.set_xlabel('Stress Tolerance Score', fontsize=13, fontweight='bold')
+    ax.set_ylabel('Average Annual Salary ($1000s)', fontsize=13, fontweight='bold')
+    ax.set_title('Career Analysis: Does Higher Stress Mean Higher Pay?',
+                 fontsize=15, fontweight='bold', pad=20)
+    ax.legend(fontsize=12, loc='best')
+    ax.grid(True, alpha=0.3, linestyle='--')
+
+    # Add colorbar
+    cbar = ax.figure.colorbar(scatter, ax=ax)
+    cbar.set_label('Salary Level', fontsize=11, fontweight='bold')
@@ -0,0 +1,298 @@
+"""
+Simple Linear Regression
+Single-predictor OLS from running sufficient statistics, with t-test standard errors and p-values
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from common.render import pool_context
+
+# Rows handed to each pool task when fitting groups in parallel
+GROUP_CHUNK_ROWS = 2_000_000
+
+# Continued-fraction settings for the incomplete beta function
+BETA_MAX_ITERATIONS = 300
+BETA_EPSILON = 1e-15
+_TINY = 1e-300
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+
+# x counts as constant when its spread is within rounding of its mean:
+# sxx of identical values comes out as tiny noise, not exactly 0
+CONSTANT_X_TOLERANCE = np.finfo(float).eps
+
+
+def _nonzero(values):
+    return np.where(np.abs(values) > _TINY, values, _TINY)
+
+
+def _beta_continued_fraction(a, b, x):
+    """Continued fraction of the incomplete beta function (modified Lentz), elementwise"""
+    c = np.ones_like(x)
+    d = 1.0 / _nonzero(1.0 - (a + b) * x / (a + 1.0))
+    h = d.copy()
+    done = np.zeros(x.shape, dtype=bool)
+    for m in range(1, BETA_MAX_ITERATIONS + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 / _nonzero(1.0 + numerator * d)
+            c = _nonzero(1.0 + numerator / c)
+            h = np.where(done, h, h * d * c)
+        done |= np.abs(d * c - 1.0) < BETA_EPSILON
+        if done.all():
+            break
+    return h
+
+
+def regularized_beta(a, b, x):
+    """I_x(a, b), the regularized incomplete beta function, for scalars or arrays"""
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, x)))
+    inside = np.clip(x, _TINY, 1.0 - BETA_EPSILON)
+    front = np.exp(_lgamma(a + b) - _lgamma(a) - _lgamma(b) + a * np.log(inside) + b * np.log1p(-inside))
+    # The fraction converges fast below the mean of the distribution; use
+    # I_x(a, b) = 1 - I_(1-x)(b, a) above it
+    direct = inside < (a + 1.0) / (a + b + 2.0)
+    fraction = _beta_continued_fraction(np.where(direct, a, b), np.where(direct, b, a),
+                                        np.where(direct, inside, 1.0 - inside))
+    value = np.where(direct, front * fraction / a, 1.0 - front * fraction / b)
+    value = np.where(x <= 0.0, 0.0, np.where(x >= 1.0, 1.0, value))
+    return float(value) if value.ndim == 0 else value
+
+
+def t_pvalue(t, df):
+    """Two-sided p-value of Student's t statistics with df degrees of freedom (scalars or arrays)"""
+    t, df = np.broadcast_arrays(np.asarray(t, dtype=float), np.asarray(df, dtype=float))
+    valid = ~np.isnan(t) & (df > 0)
+    safe_df = np.where(valid, df, 1.0)
+    safe_t = np.where(valid, t, 0.0)
+    with np.errstate(over='ignore', invalid='ignore'):
+        p = regularized_beta(safe_df / 2.0, 0.5, safe_df / (safe_df + safe_t * safe_t))
+    p = np.where(valid, p, np.nan)
+    return float(p) if p.ndim == 0 else p
+
+
+def constant_x(n, mean_x, sxx):
+    """True where sxx is no more than rounding error, i.e. every x is the same value"""
+    return np.asarray(sxx) <= CONSTANT_X_TOLERANCE * np.asarray(n) * np.asarray(mean_x) ** 2
+
+
+def regression_statistics(n, mean_x, mean_y, sxx, syy, sxy):
+    """
+    Fit statistics of y = intercept + slope * x from the count, means and
+    centred sums of squares and cross-products. Works elementwise on
+    arrays (one fit per element); fits without two distinct x values
+    (see constant_x) give NaN throughout. Returns {name: value or array}.
+    """
+    n = np.asarray(n, dtype=float)
+    df_resid = n - 2
+    fitted = (n >= 2) & ~constant_x(n, mean_x, sxx)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(fitted, sxy / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+        r = sxy / np.sqrt(sxx * syy)
+        ssr = np.maximum(syy - slope * sxy, 0.0)
+        residual_se = np.where(df_resid > 0, np.sqrt(ssr / df_resid), np.nan)
+        slope_se = residual_se / np.sqrt(sxx)
+        intercept_se = residual_se * np.sqrt(1 / n + mean_x ** 2 / sxx)
+        slope_t = slope / slope_se
+        intercept_t = intercept / intercept_se
+        stats = {
+            'slope': slope,
+            'intercept': intercept,
+            'r': r,
+            'r_squared': r ** 2,
+            'adj_r_squared': np.where(df_resid > 0, 1 - (1 - r ** 2) * (n - 1) / df_resid, np.nan),
+            'ssr': ssr,
+            'residual_se': residual_se,
+            'slope_se': slope_se,
+            'intercept_se': intercept_se,
+            'slope_t': slope_t,
+            'intercept_t': intercept_t,
+            'slope_p': t_pvalue(slope_t, df_resid),
+            'intercept_p': t_pvalue(intercept_t, df_resid),
+        }
+    return {name: np.where(fitted, value, np.nan) for name, value in stats.items()}
+
+
+class RegressionResult:
+    """Coefficients and fit statistics of y = intercept + slope * x"""
+
+    def __init__(self, n, mean_x, mean_y, sxx, syy, sxy):
+        if n < 2 or constant_x(n, mean_x, sxx):
+            raise ValueError("Regression needs at least two rows with different x values")
+        self.n = n
+        self.df_resid = n - 2
+        for name, value in regression_statistics(n, mean_x, mean_y, sxx, syy, sxy).items():
+            setattr(self, name, float(value))
+        # With one predictor the F test is the slope's t test squared
+        self.f_statistic = self.slope_t ** 2
+        self.f_pvalue = self.slope_p
+
+    def predict(self, x):
+        return self.intercept + self.slope * np.asarray(x, dtype=float)
+
+    def summary_lines(self, x_name='x', y_name='y'):
+        """Compact coefficient table in the layout of the statsmodels summary"""
+        lines = [
+            f"Dep. Variable: {y_name}    No. Observations: {self.n}    Df Residuals: {self.df_resid}",
+            f"R-squared: {self.r_squared:.4f}    Adj. R-squared: {self.adj_r_squared:.4f}    "
+            f"F-statistic: {self.f_statistic:.3f}    Prob (F-statistic): {self.f_pvalue:.4g}",
+            "",
+            f"{'':<18} {'coef':>12} {'std err':>12} {'t':>10} {'P>|t|':>10}",
+        ]
+        for name, coef, se, t, p in [('const', self.intercept, self.intercept_se, self.intercept_t, self.intercept_p),
+                                     (x_name, self.slope, self.slope_se, self.slope_t, self.slope_p)]:
+            lines.append(f"{name:<18} {coef:>12.4f} {se:>12.4f} {t:>10.3f} {p:>10.4f}")
+        return lines
+
+
+class OnlineOLS:
+    """
+    Running sufficient statistics of (x, y) pairs for y = a + b*x.
+
+    Keeps the count, the means and the centred sums of squares and
+    cross-products (Welford's update, merged batch by batch with Chan's
+    formula) rather than raw sums like sum(x**2), which lose precision
+    for large values such as salaries. Memory is constant however many
+    rows are added, and accumulators of separate chunks can be merged.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+
+    def _combine(self, n, mean_x, mean_y, sxx, syy, sxy):
+        total = self.n + n
+        if n == 0:
+            return
+        dx = mean_x - self.mean_x
+        dy = mean_y - self.mean_y
+        weight = self.n * n / total
+        self.sxx += sxx + dx * dx * weight
+        self.syy += syy + dy * dy * weight
+        self.sxy += sxy + dx * dy * weight
+        self.mean_x += dx * n / total
+        self.mean_y += dy * n / total
+        self.n = total
+
+    def update(self, x, y):
+        """Add one pair or a batch of pairs (rows with a missing value are skipped)"""
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if not len(x):
+            return self
+        mean_x, mean_y = x.mean(), y.mean()
+        dx, dy = x - mean_x, y - mean_y
+        self._combine(len(x), mean_x, mean_y, float(dx @ dx), float(dy @ dy), float(dx @ dy))
+        return self
+
+    def merge(self, other):
+        """Fold in another accumulator, e.g. one filled from a different chunk"""
+        self._combine(other.n, other.mean_x, other.mean_y, other.sxx, other.syy, other.sxy)
+        return self
+
+    def result(self):
+        return RegressionResult(self.n, self.mean_x, self.mean_y, self.sxx, self.syy, self.sxy)
+
+
+def fit(x, y):
+    """RegressionResult of y on x in one call"""
+    return OnlineOLS().update(x, y).result()
+
+
+def segment_moments(codes, x, y, n_groups):
+    """
+    Count, means and centred sums of squares and cross-products of (x, y)
+    for every group code in 0..n_groups-1, from segmented sums
+    (np.bincount) over all rows at once. Two passes: means first, then
+    the centred products, which keeps large values precise.
+    """
+    n = np.bincount(codes, minlength=n_groups).astype(float)
+    with np.errstate(invalid='ignore'):
+        mean_x = np.bincount(codes, x, n_groups) / n
+        mean_y = np.bincount(codes, y, n_groups) / n
+    dx = x - mean_x[codes]
+    dy = y - mean_y[codes]
+    return (n, np.nan_to_num(mean_x), np.nan_to_num(mean_y), np.bincount(codes, dx * dx, n_groups),
+            np.bincount(codes, dy * dy, n_groups), np.bincount(codes, dx * dy, n_groups))
+
+
+def merge_moments(first, second):
+    """Elementwise Chan merge of two segment_moments() results over the same groups"""
+    n_a, mean_x_a, mean_y_a, sxx_a, syy_a, sxy_a = first
+    n_b, mean_x_b, mean_y_b, sxx_b, syy_b, sxy_b = second
+    n = n_a + n_b
+    with np.errstate(invalid='ignore'):
+        share = np.where(n > 0, n_b / n, 0.0)
+    dx = mean_x_b - mean_x_a
+    dy = mean_y_b - mean_y_a
+    weight = n_a * share
+    return (n, mean_x_a + dx * share, mean_y_a + dy * share, sxx_a + sxx_b + dx * dx * weight,
+            syy_a + syy_b + dy * dy * weight, sxy_a + sxy_b + dx * dy * weight)
+
+
+# Rows of the fit_groups() call in progress, inherited by forked workers
+# so that tasks only carry a row range
+_group_rows = {}
+
+
+def _chunk_moments(start, stop, n_groups):
+    codes, x, y = _group_rows['rows']
+    return segment_moments(codes[start:stop], x[start:stop], y[start:stop], n_groups)
+
+
+def fit_groups(df, by, x, y, workers=0, chunk_rows=GROUP_CHUNK_ROWS):
+    """
+    Regress column y on column x separately within every group of df
+    (by: a column name or list of names), without a Python loop over
+    groups: rows get a group code and every group's sums come out of
+    one np.bincount per statistic.
+
+    With workers > 1 (None: one per CPU) the rows are cut into chunks of
+    chunk_rows, summed on a fork process pool and merged; inputs smaller
+    than one chunk are always summed in-process.
+
+    Returns a DataFrame indexed by group: n, then the regression_statistics()
+    columns. Groups with fewer than two distinct x values get NaN fits.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    rows = df[keys + [x, y]].dropna()
+    grouped = rows.groupby(keys, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy(dtype=np.int64)
+    index = grouped.size().index
+    values_x = rows[x].to_numpy(dtype=float)
+    values_y = rows[y].to_numpy(dtype=float)
+
+    n_rows = len(codes)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    context = pool_context()
+    bounds = list(range(0, n_rows, chunk_rows)) + [n_rows]
+    if workers > 1 and len(bounds) > 2 and context is not None:
+        _group_rows['rows'] = (codes, values_x, values_y)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(_chunk_moments, start, stop, len(index))
+                           for start, stop in zip(bounds[:-1], bounds[1:])]
+                moments = futures[0].result()
+                for future in futures[1:]:
+                    moments = merge_moments(moments, future.result())
+        finally:
+            _group_rows.clear()
+    else:
+        moments = segment_moments(codes, values_x, values_y, len(index))
+
+    table = pd.DataFrame({'n': moments[0].astype(np.int64)}, index=index)
+    for name, values in regression_statistics(*moments).items():
+        table[name] = values
+    return table
@@ -0,0 +1,140 @@
+"""
+Resampling Tests
+Bootstrap confidence intervals and permutation tests for the correlation and slope of y on x
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from common.render import pool_context
+
+# Resamples per shard. Every shard has its own seed, so results depend on
+# the seed and shard size but not on how many workers run the shards
+SHARD_RESAMPLES = 5_000
+# Resampled values held in memory at once (resamples x rows) within a shard
+BATCH_ELEMENTS = 2_000_000
+
+STATISTICS = ('r', 'slope')
+
+
+def _statistics(xs, ys):
+    """Correlation and slope of every row of xs/ys (one resample per row); NaN where x is constant"""
+    dx = xs - xs.mean(axis=1, keepdims=True)
+    dy = ys - ys.mean(axis=1, keepdims=True)
+    sxx = np.einsum('ij,ij->i', dx, dx)
+    syy = np.einsum('ij,ij->i', dy, dy)
+    sxy = np.einsum('ij,ij->i', dx, dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {'r': sxy / np.sqrt(sxx * syy), 'slope': sxy / sxx}
+
+
+def _batches(count, n):
+    batch = max(1, BATCH_ELEMENTS // max(n, 1))
+    for start in range(0, count, batch):
+        yield min(batch, count - start)
+
+
+def _bootstrap_shard(x, y, count, seed):
+    """Statistics of `count` bootstrap resamples: rows drawn with replacement, pairs kept together"""
+    rng = np.random.default_rng(seed)
+    parts = {name: [] for name in STATISTICS}
+    for size in _batches(count, len(x)):
+        rows = rng.integers(0, len(x), (size, len(x)))
+        for name, values in _statistics(x[rows], y[rows]).items():
+            parts[name].append(values)
+    return {name: np.concatenate(values) for name, values in parts.items()}
+
+
+def _permutation_shard(x, y, count, seed):
+    """Statistics of `count` permutations of y against a fixed x"""
+    rng = np.random.default_rng(seed)
+    parts = {name: [] for name in STATISTICS}
+    for size in _batches(count, len(x)):
+        order = rng.permuted(np.tile(np.arange(len(y)), (size, 1)), axis=1)
+        for name, values in _statistics(np.broadcast_to(x, order.shape), y[order]).items():
+            parts[name].append(values)
+    return {name: np.concatenate(values) for name, values in parts.items()}
+
+
+def run_shards(task, x, y, n_resamples, seed=42, workers=0, shard_resamples=SHARD_RESAMPLES):
+    """
+    Run task over n_resamples split into shards, each seeded from its own
+    child of seed (an int or a SeedSequence). With workers > 1 (None: one
+    per CPU) the shards run on a fork process pool.
+    Returns ({statistic: array of n_resamples values}, seconds).
+    """
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be at least 1, got {n_resamples}")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    counts = [min(shard_resamples, n_resamples - start) for start in range(0, n_resamples, shard_resamples)]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(counts))
+
+    start = time.perf_counter()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    context = pool_context()
+    if workers > 1 and len(counts) > 1 and context is not None:
+        with ProcessPoolExecutor(max_workers=min(workers, len(counts)), mp_context=context) as pool:
+            shards = list(pool.map(task, *zip(*[(x, y, count, child) for count, child in zip(counts, seeds)])))
+    else:
+        shards = [task(x, y, count, child) for count, child in zip(counts, seeds)]
+    seconds = time.perf_counter() - start
+    return {name: np.concatenate([shard[name] for shard in shards]) for name in STATISTICS}, seconds
+
+
+class BootstrapResult:
+    """Percentile bootstrap intervals for the correlation and the slope"""
+
+    def __init__(self, observed, distributions, confidence, seconds):
+        self.observed = observed
+        self.distributions = distributions
+        self.confidence = confidence
+        self.seconds = seconds
+        self.n_resamples = len(distributions['r'])
+        self.resamples_per_second = self.n_resamples / seconds if seconds else float('inf')
+        # Resamples that drew a single distinct x have no slope and are left out
+        self.valid = {name: int(np.isfinite(values).sum()) for name, values in distributions.items()}
+        tail = (1 - confidence) / 2 * 100
+        self.intervals = {name: tuple(float(v) for v in np.nanpercentile(values, [tail, 100 - tail]))
+                          for name, values in distributions.items()}
+        self.standard_errors = {name: float(np.nanstd(values, ddof=1)) for name, values in distributions.items()}
+
+
+class PermutationResult:
+    """Two-sided permutation p-value for no association between x and y"""
+
+    def __init__(self, observed, distributions, seconds):
+        self.observed = observed
+        self.seconds = seconds
+        self.n_resamples = len(distributions['r'])
+        self.resamples_per_second = self.n_resamples / seconds if seconds else float('inf')
+        # Permuting y leaves both standard deviations unchanged, so the
+        # slope is the correlation times a constant and both give this p-value.
+        # A constant x has no correlation to test: NaN, not a tiny p-value
+        if np.isfinite(observed['r']):
+            extreme = np.abs(distributions['r']) >= abs(observed['r']) - 1e-12
+            self.p_value = (int(extreme.sum()) + 1) / (self.n_resamples + 1)
+        else:
+            self.p_value = float('nan')
+
+
+def observed_statistics(x, y):
+    values = _statistics(np.asarray(x, dtype=float)[None, :], np.asarray(y, dtype=float)[None, :])
+    return {name: float(value[0]) for name, value in values.items()}
+
+
+def bootstrap(x, y, n_resamples=10_000, confidence=0.95, seed=42, workers=0):
+    """Bootstrap distributions and percentile intervals of the correlation and slope of y on x"""
+    distributions, seconds = run_shards(_bootstrap_shard, x, y, n_resamples, seed, workers)
+    return BootstrapResult(observed_statistics(x, y), distributions, confidence, seconds)
+
+
+def permutation_test(x, y, n_resamples=10_000, seed=42, workers=0):
+    """Permutation test of the correlation (and so the slope) of y on x against zero"""
+    distributions, seconds = run_shards(_permutation_shard, x, y, n_resamples, seed, workers)
+    return PermutationResult(observed_statistics(x, y), distributions, seconds)
@@ -0,0 +1,135 @@
+"""
+Script Startup Benchmark
+Times interpreter start-up plus imports of the analysis scripts, optionally against an earlier git revision
+"""
+
+import argparse
+import ast
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+SCRIPTS = [
+    '03_python_data_cleaning/traffic_analysis.py',
+    '04_uk_website_traffic_analysis/analyze_uk_traffic.py',
+    '05_uk_ecommerce_dashboard/create_excel_dashboard.py',
+    '06_london_property_analysis/create_sql_analysis.py',
+    '08_job_market_analysis/job_salary_analysis.py',
+]
+
+# Libraries only needed for charts or the optional statsmodels summary
+PLOTTING_MODULES = ('matplotlib', 'seaborn', 'scipy.stats', 'statsmodels')
+
+
+def import_code(path):
+    """
+    The script's top-level imports (and its sys.path setup) as code to run
+    on their own. Unlike `--help` this needs no argparse, so it also works
+    on revisions whose scripts run the whole analysis when started.
+    """
+    tree = ast.parse(path.read_text(encoding='utf-8'))
+    keep = [node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom))
+            or (isinstance(node, ast.Expr) and 'sys.path' in ast.unparse(node))]
+    return '\n'.join([f'__file__ = {str(path)!r}'] + [ast.unparse(node) for node in keep])
+
+
+def _run_imports(script, tree, *options):
+    path = Path(tree) / script
+    return subprocess.run([sys.executable, *options, '-c', import_code(path)], cwd=path.parent,
+                          env={**os.environ, 'MPLBACKEND': 'Agg'}, capture_output=True, text=True)
+
+
+def startup_seconds(script, tree, repeat):
+    """
+    Median wall time of a fresh interpreter running the script's top-level
+    imports from its folder, or None if they fail (e.g. a missing module)
+    or the script does not exist in that tree
+    """
+    if not (Path(tree) / script).exists():
+        return None
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if _run_imports(script, tree).returncode != 0:
+            return None
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def heavy_imports(script, tree):
+    """Which of PLOTTING_MODULES the script's top-level imports load (from -X importtime)"""
+    result = _run_imports(script, tree, '-X', 'importtime')
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()
+                if line.startswith('import time:')}
+    return [name for name in PLOTTING_MODULES if name in imported]
+
+
+def _seconds(value):
+    return f"{value:>6.2f}s" if value is not None else f"{'failed':>7}"
+
+
+def export_revision(revision, directory):
+    """Extract the tracked files of revision into directory"""
+    archive = subprocess.run(['git', 'archive', '--format=tar', revision], cwd=ROOT,
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter='data')
+
+
+parser = argparse.ArgumentParser(description="Benchmark start-up time of the analysis scripts")
+parser.add_argument('--repeat', type=int, default=5, help="Runs per script (the median is reported)")
+parser.add_argument('--baseline', default=None,
+                    help="Git revision to compare against (e.g. a commit before the lazy imports)")
+args = parser.parse_args()
+
+print("\n" + "="*70)
+print("ANALYSIS SCRIPTS - STARTUP BENCHMARK")
+print("="*70 + "\n")
+print(f"Top-level imports of each script in a fresh interpreter, median of {args.repeat} runs\n")
+
+with tempfile.TemporaryDirectory() as baseline_tree:
+    if args.baseline:
+        export_revision(args.baseline, baseline_tree)
+        print(f"✅ Baseline: {args.baseline}\n")
+
+    header = f"{'Script':<52} {'Now':>7}"
+    if args.baseline:
+        header += f" {'Before':>7} {'Saved':>7}"
+    print(header + "  Plotting libraries at startup")
+    totals = [0.0, 0.0]
+    failed = 0
+    for script in SCRIPTS:
+        now = before = startup_seconds(script, ROOT, args.repeat)
+        line = f"{script:<52} {_seconds(now)}"
+        if args.baseline:
+            before = startup_seconds(script, baseline_tree, args.repeat)
+            saved = before - now if None not in (before, now) else None
+            line += f" {_seconds(before)} {_seconds(saved)}"
+        # Totals only cover scripts that imported in both trees
+        if None in (now, before):
+            failed += 1
+        else:
+            totals[0] += now
+            totals[1] += before
+        print(f"{line}  {', '.join(heavy_imports(script, ROOT)) or 'none'}")
+
+    total = f"{'Total':<52} {totals[0]:>6.2f}s"
+    if args.baseline:
+        total += f" {totals[1]:>6.2f}s {totals[1] - totals[0]:>6.2f}s"
+    print(total)
+    if failed:
+        print(f"❌ {failed} script(s) failed to import and are left out of the totals")
+
+print("\n💡 Add --no-plots to the dashboard scripts for report-only runs that never import matplotlib")
+print("\n" + "="*70)
+print("✅ BENCHMARK COMPLETE!")
+print("="*70 + "\n")
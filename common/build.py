@@ -0,0 +1,108 @@
+"""
+Artifact Build Graph
+A tiny make: rebuilds an output only when its input files or parameters change
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from common.cache import file_digest
+
+DEFAULT_MANIFEST = '.build_manifest.json'
+
+
+class BuildResult:
+    """What happened to one artifact in this run"""
+
+    def __init__(self, output, status, seconds, reason):
+        self.output = output
+        self.status = status
+        self.seconds = seconds
+        self.reason = reason
+
+
+class BuildGraph:
+    """
+    Records, per output artifact, the content hash of every input file and
+    a hash of its parameters (in DEFAULT_MANIFEST). build() runs the recipe
+    only when the output is missing, an input or the parameters changed,
+    or force is set. Input hashes are reused while a file's size and mtime
+    are unchanged, so an up-to-date check never re-reads big inputs.
+    """
+
+    def __init__(self, manifest=DEFAULT_MANIFEST, force=False):
+        self.manifest = manifest
+        self.force = force
+        self.results = []
+        try:
+            with open(manifest) as f:
+                self._state = json.load(f)
+        except (OSError, ValueError):
+            self._state = {'artifacts': {}, 'files': {}}
+
+    def _file_hash(self, path):
+        stat = os.stat(path)
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        key = os.path.abspath(path)
+        known = self._state['files'].get(key)
+        if known and known['stat'] == fingerprint:
+            return known['sha256']
+        digest = file_digest(path)
+        self._state['files'][key] = {'stat': fingerprint, 'sha256': digest}
+        return digest
+
+    def signature(self, inputs=(), params=None):
+        """{'inputs': {path: sha256}, 'params': sha256 of the JSON-encoded params}"""
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return {
+            'inputs': {os.path.relpath(path): self._file_hash(path) for path in inputs},
+            'params': hashlib.sha256(encoded.encode()).hexdigest(),
+        }
+
+    def stale_reason(self, output, signature):
+        """Why output needs rebuilding, or None if it is up to date"""
+        if self.force:
+            return 'forced'
+        if not os.path.exists(output):
+            return 'output missing'
+        previous = self._state['artifacts'].get(output)
+        if previous is None:
+            return 'no build record'
+        changed = [path for path, digest in signature['inputs'].items()
+                   if previous['inputs'].get(path) != digest]
+        if changed:
+            return 'changed: ' + ', '.join(changed)
+        if set(previous['inputs']) != set(signature['inputs']):
+            return 'inputs changed'
+        if previous['params'] != signature['params']:
+            return 'parameters changed'
+        return None
+
+    def build(self, output, recipe, inputs=(), params=None):
+        """Run recipe() if output is stale; returns True when it was rebuilt"""
+        start = time.perf_counter()
+        signature = self.signature(inputs, params)
+        reason = self.stale_reason(output, signature)
+        if reason is None:
+            self.results.append(BuildResult(output, 'skipped', time.perf_counter() - start, 'up to date'))
+            self._save()
+            return False
+
+        recipe()
+        self._state['artifacts'][output] = signature
+        self.results.append(BuildResult(output, 'built', time.perf_counter() - start, reason))
+        self._save()
+        return True
+
+    def _save(self):
+        partial = self.manifest + '.tmp'
+        with open(partial, 'w') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(partial, self.manifest)
+
+    def report(self):
+        """One line per artifact: name, built/skipped, seconds and reason"""
+        width = max((len(r.output) for r in self.results), default=0)
+        return [f"{r.output:<{width}}  {r.status:<7}  {r.seconds:6.2f}s  {r.reason}" for r in self.results]
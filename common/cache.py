@@ -0,0 +1,149 @@
+"""
+Analysis Cache
+Content-addressed on-disk store for intermediate DataFrames, with an LRU size limit
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = '.analysis_cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def select_columns(df, columns):
+    """df restricted to columns given by name or by position (None keeps all)"""
+    if columns is None:
+        return df
+    if all(isinstance(column, int) for column in columns):
+        return df.iloc[:, list(columns)]
+    return df[list(columns)]
+
+
+class AnalysisCache:
+    """
+    Stores DataFrames as zstd-compressed Feather (Arrow IPC) files named
+    by the hash of (input file contents, spec). Any change to the input
+    data gives new keys, so stale results are never read back; they age
+    out of the cache instead. Reading an entry touches its mtime and
+    put() evicts the least recently used entries beyond max_bytes.
+
+    Needs pyarrow; without it the cache is disabled and every lookup
+    misses, so callers always fall back to computing.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled and _pyarrow_available()
+        self.hits = 0
+        self.misses = 0
+        self._digests = None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def source_digest(self, path):
+        """
+        Content hash of path. Hashes are remembered per (size, mtime) in
+        digests.json so an unchanged file is only read once.
+        """
+        if self._digests is None:
+            try:
+                with open(self._path('digests.json')) as f:
+                    self._digests = json.load(f)
+            except (OSError, ValueError):
+                self._digests = {}
+
+        stat = os.stat(path)
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        key = os.path.abspath(path)
+        entry = self._digests.get(key)
+        if entry and entry['stat'] == fingerprint:
+            return entry['sha256']
+
+        digest = file_digest(path)
+        self._digests[key] = {'stat': fingerprint, 'sha256': digest}
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path('digests.json'), 'w') as f:
+            json.dump(self._digests, f)
+        return digest
+
+    def key(self, source, spec):
+        """Cache key for spec (any JSON-serialisable value) computed over the file source"""
+        payload = json.dumps([self.source_digest(source), spec], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key, columns=None):
+        """Return the cached DataFrame for key (only `columns`, by name or position, if given), or None"""
+        path = self._path(key + '.feather')
+        if not self.enabled or not os.path.exists(path):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return pd.read_feather(path, columns=columns)
+
+    def put(self, key, df):
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key + '.feather')
+        partial = path + '.tmp'
+        df.reset_index(drop=True).to_feather(partial, compression='zstd')
+        os.replace(partial, path)
+        self.evict()
+
+    def get_or_compute(self, source, spec, compute, columns=None):
+        """
+        Cached result of compute() for spec over source, computing and
+        storing all of it on a miss. With `columns`, only those columns
+        are read back. A miss returns the stored copy, so callers get the
+        same frame (down to dtypes and memory layout) either way.
+        """
+        if not self.enabled:
+            self.misses += 1
+            return select_columns(compute(), columns)
+        key = self.key(source, spec)
+        df = self.get(key, columns)
+        if df is None:
+            df = compute()
+            self.put(key, df)
+            path = self._path(key + '.feather')
+            # An entry larger than max_bytes is evicted as soon as it is stored
+            df = pd.read_feather(path, columns=columns) if os.path.exists(path) else select_columns(df, columns)
+        return df
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.feather'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
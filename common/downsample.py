@@ -0,0 +1,68 @@
+"""
+Plot Data Reduction
+Largest-triangle-three-buckets for long line series and hexbin aggregation for dense scatters
+"""
+
+import numpy as np
+import pandas as pd
+
+# Above these sizes the plot helpers reduce the data before matplotlib sees it
+LINE_POINT_LIMIT = 2_000
+SCATTER_POINT_LIMIT = 20_000
+HEXBIN_GRIDSIZE = 60
+
+
+def _numeric(values):
+    """Float view of numbers or datetimes, for the LTTB area computation"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def lttb(x, y, n_out):
+    """
+    Indices of the n_out points that largest-triangle-three-buckets keeps
+    from the series (x, y), x ascending. The first and last points are
+    always kept; each bucket in between contributes the point forming the
+    largest triangle with the previous pick and the next bucket's mean.
+    """
+    x, y = _numeric(x), _numeric(y)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def plot_series(ax, x, y, *args, max_points=LINE_POINT_LIMIT, **kwargs):
+    """ax.plot(x, y, ...) with x/y reduced by LTTB to at most max_points"""
+    x = x.to_numpy() if isinstance(x, pd.Series) else np.asarray(x)
+    y = y.to_numpy() if isinstance(y, pd.Series) else np.asarray(y)
+    keep = lttb(x, y, max_points)
+    return ax.plot(x[keep], y[keep], *args, **kwargs)
+
+
+def plot_scatter(ax, x, y, c=None, cmap=None, max_points=SCATTER_POINT_LIMIT,
+                 gridsize=HEXBIN_GRIDSIZE, **kwargs):
+    """
+    ax.scatter() for up to max_points points; above that a hexbin whose
+    cells are coloured by the mean of c (or the point count). Returns the
+    mappable, so either result can be handed to colorbar().
+    """
+    if len(x) <= max_points:
+        return ax.scatter(x, y, c=c, cmap=cmap, **kwargs)
+    return ax.hexbin(x, y, C=c, reduce_C_function=np.mean, gridsize=gridsize,
+                     cmap=cmap, mincnt=1, linewidths=0)
@@ -0,0 +1,235 @@
+"""
+Parallel Dashboard Renderer
+Draws each dashboard panel on its own Agg figure in a process pool and tiles them into one PNG
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from common import downsample
+
+TITLE_HEIGHT_INCHES = 0.9
+
+
+class Panel:
+    """
+    One dashboard panel: draw(ax, *args, **kwargs) fills a single Axes.
+    draw must be a module-level function (not defined in the script being
+    run) so that worker processes can import it.
+    """
+
+    def __init__(self, name, draw, *args, **kwargs):
+        self.name = name
+        self.draw = draw
+        self.args = args
+        self.kwargs = kwargs
+
+    def digest(self, size, dpi, style):
+        """Hash of everything that affects the panel image"""
+        payload = pickle.dumps((self.draw.__module__, self.draw.__qualname__,
+                                self.args, self.kwargs, size, dpi, style), protocol=5)
+        return hashlib.sha256(payload).hexdigest()
+
+
+def _render_panel(panel, size, dpi, style):
+    """Worker task: draw one panel and return it as PNG bytes"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    with plt.style.context(style) if style else contextlib.nullcontext():
+        fig = plt.figure(figsize=size, dpi=dpi)
+        ax = fig.add_subplot()
+        panel.draw(ax, *panel.args, **panel.kwargs)
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi)
+        plt.close(fig)
+    return buffer.getvalue(), time.perf_counter() - start
+
+
+def _title_strip(title, width, dpi, title_kwargs):
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(width, TITLE_HEIGHT_INCHES), dpi=dpi)
+    fig.text(0.5, 0.5, title, ha='center', va='center', **(title_kwargs or {}))
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _decode(png):
+    import matplotlib.image as mpimg
+    return mpimg.imread(io.BytesIO(png), format='png')
+
+
+def _tile(images, layout):
+    """Arrange equally sized RGBA arrays row by row; empty cells stay white"""
+    rows, cols = layout
+    height, width = images[0].shape[:2]
+    canvas = np.ones((rows * height, cols * width, 4), dtype=np.float32)
+    for i, image in enumerate(images):
+        r, c = divmod(i, cols)
+        h, w = min(height, image.shape[0]), min(width, image.shape[1])
+        canvas[r * height:r * height + h, c * width:c * width + w] = image[:h, :w]
+    return canvas
+
+
+def pool_context():
+    """
+    Fork keeps workers from re-running the calling script (these scripts
+    have no __main__ guard). Returns None where fork is unavailable, and
+    callers then do the work in-process instead.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def render_dashboard(panels, output, layout=(2, 3), figsize=(16, 10), dpi=200, title=None,
+                     title_kwargs=None, style=None, workers=None, panel_dir=None, skip_unchanged=False):
+    """
+    Render panels into a layout[0] x layout[1] grid PNG at `output`.
+
+    Each panel is drawn at figsize / layout on a process pool (workers=0
+    or 1 draws in-process). With panel_dir every panel is also written as
+    <output stem>_<panel name>.png; with skip_unchanged a panel whose
+    inputs hash the same as on the previous run reuses that image.
+
+    Returns {panel name: seconds spent drawing, or None if reused}.
+    """
+    import matplotlib.pyplot as plt
+
+    rows, cols = layout
+    if len(panels) > rows * cols:
+        raise ValueError(f"{len(panels)} panels do not fit a {rows}x{cols} layout")
+    size = (figsize[0] / cols, figsize[1] / rows)
+    stem = os.path.splitext(os.path.basename(output))[0]
+
+    manifest_path = manifest = None
+    if panel_dir:
+        os.makedirs(panel_dir, exist_ok=True)
+        manifest_path = os.path.join(panel_dir, f'{stem}_panels.json')
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+    images, timings, digests, todo = {}, {}, {}, []
+    for panel in panels:
+        if panel_dir:
+            digests[panel.name] = panel.digest(size, dpi, style)
+            path = os.path.join(panel_dir, f'{stem}_{panel.name}.png')
+            if skip_unchanged and manifest.get(panel.name) == digests[panel.name] and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    images[panel.name] = f.read()
+                timings[panel.name] = None
+                continue
+        todo.append(panel)
+
+    workers = min(len(todo), os.cpu_count() or 1) if workers is None else workers
+    context = pool_context()
+    if todo and workers > 1 and context is not None:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {panel.name: pool.submit(_render_panel, panel, size, dpi, style) for panel in todo}
+            for name, future in futures.items():
+                images[name], timings[name] = future.result()
+    else:
+        for panel in todo:
+            images[panel.name], timings[panel.name] = _render_panel(panel, size, dpi, style)
+
+    if panel_dir:
+        for panel in todo:
+            with open(os.path.join(panel_dir, f'{stem}_{panel.name}.png'), 'wb') as f:
+                f.write(images[panel.name])
+        manifest.update(digests)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    canvas = _tile([_decode(images[panel.name]) for panel in panels], layout)
+    if title:
+        strip = _decode(_title_strip(title, figsize[0], dpi, title_kwargs))[:, :canvas.shape[1]]
+        canvas = np.vstack([strip, canvas])
+    plt.imsave(output, canvas)
+    return timings
+
+
+def dashboard_signature(panels, layout=(2, 3), figsize=(16, 10), dpi=200, title=None,
+                        title_kwargs=None, style=None):
+    """Build parameters of a dashboard: every panel's input hash plus the layout"""
+    size = (figsize[0] / layout[1], figsize[1] / layout[0])
+    return {
+        'panels': {panel.name: panel.digest(size, dpi, style) for panel in panels},
+        'layout': list(layout),
+        'figsize': list(figsize),
+        'dpi': dpi,
+        'title': title,
+        'title_kwargs': title_kwargs,
+        'style': style,
+    }
+
+
+def build_dashboard(graph, panels, output, inputs=(), options=None, **dashboard):
+    """
+    render_dashboard() through a BuildGraph: the PNG is only redrawn when
+    an input file, the drawing code or a panel's data has changed.
+    Returns the panel timings, or None when the PNG was up to date.
+    """
+    timings = {}
+    modules = {panel.draw.__module__ for panel in panels}
+    code = [sys.modules[name].__file__ for name in sorted(modules)] + [downsample.__file__, __file__]
+
+    def recipe():
+        timings.update(render_dashboard(panels, output, **dashboard, **(options or {})))
+
+    built = graph.build(output, recipe, inputs=list(inputs) + code,
+                        params=dashboard_signature(panels, **dashboard))
+    return timings if built else None
+
+
+def add_render_arguments(parser):
+    """Add the shared --force/--render-workers/--panel-dir/--skip-unchanged-panels/--no-plots options"""
+    parser.add_argument('--force', action='store_true',
+                        help="Redraw every chart even if its inputs have not changed")
+    parser.add_argument('--render-workers', type=int,
+                        help="Processes used to draw dashboard panels (default: one per panel; 1 draws in-process)")
+    parser.add_argument('--panel-dir',
+                        help="Also write every dashboard panel as its own PNG into this folder")
+    parser.add_argument('--skip-unchanged-panels', action='store_true',
+                        help="With --panel-dir, reuse panel images whose input data has not changed")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="Report only: skip the charts, so matplotlib and seaborn are never imported")
+
+
+def render_options(args):
+    """render_dashboard() keyword arguments from the parsed add_render_arguments() options"""
+    return {
+        'workers': args.render_workers,
+        'panel_dir': args.panel_dir,
+        'skip_unchanged': args.skip_unchanged_panels and not args.force,
+    }
+
+
+def describe_render(timings, seconds):
+    """One-line summary of a render_dashboard() run"""
+    drawn = [t for t in timings.values() if t is not None]
+    reused = len(timings) - len(drawn)
+    text = f"{len(drawn)} panels drawn in {seconds:.2f}s"
+    if drawn:
+        text += f" (slowest {max(drawn):.2f}s)"
+    if reused:
+        text += f", {reused} unchanged panels reused"
+    return text
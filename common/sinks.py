@@ -0,0 +1,216 @@
+"""
+Data Sinks and Readers
+Streams DataFrame chunks to CSV, Parquet or Arrow IPC files and loads them back
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text columns stored with dictionary encoding
+CATEGORICAL_COLUMNS = ('Category', 'Region', 'Postcode', 'source')
+
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Parquet/Arrow output needs pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def output_path(stem, fmt):
+    """Return stem with the file extension for fmt ('csv', 'parquet' or 'arrow')"""
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unknown format {fmt!r}, choose from {sorted(FORMAT_EXTENSIONS)}")
+    return stem + FORMAT_EXTENSIONS[fmt]
+
+
+def format_from_path(path):
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, known in FORMAT_EXTENSIONS.items():
+        if ext == known:
+            return fmt
+    raise ValueError(f"Cannot infer format from {path!r}")
+
+
+class CsvSink:
+    """Appends chunks to one CSV file, writing the header once"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._started = False
+
+    def write(self, df):
+        df.to_csv(self.path, mode='a' if self._started else 'w',
+                  header=not self._started, index=False)
+        self._started = True
+        self.rows += len(df)
+
+    def close(self):
+        if not self._started:
+            open(self.path, 'w').close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ArrowSink:
+    """
+    Base class for the columnar sinks. Each write() becomes one row group
+    (Parquet) or record batch (Arrow). Categorical columns share a running
+    dictionary so later batches only ever extend it.
+    """
+
+    def __init__(self, path, categorical=CATEGORICAL_COLUMNS):
+        self.pa = _require_pyarrow()
+        self.path = path
+        self.categorical = tuple(categorical)
+        self.rows = 0
+        self.schema = None
+        self._writer = None
+        self._dictionaries = {}
+
+    def _encode(self, name, values):
+        pa = self.pa
+        lookup, labels = self._dictionaries.setdefault(name, ({}, []))
+        codes, uniques = pd.factorize(values)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, value in enumerate(uniques):
+            if value not in lookup:
+                lookup[value] = len(labels)
+                labels.append(value)
+            mapping[i] = lookup[value]
+        mask = codes < 0
+        indices = pa.array(np.where(mask, 0, mapping[codes] if len(mapping) else 0).astype(np.int32),
+                           mask=mask if mask.any() else None)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(labels, type=pa.string()))
+
+    def _to_batch(self, df):
+        pa = self.pa
+        arrays = []
+        for name in df.columns:
+            if name in self.categorical or isinstance(df[name].dtype, pd.CategoricalDtype):
+                arrays.append(self._encode(name, df[name]))
+            else:
+                field_type = self.schema.field(name).type if self.schema is not None else None
+                array = pa.array(df[name], type=field_type, from_pandas=True)
+                # Arrow-backed pandas columns convert to chunked arrays
+                if isinstance(array, pa.ChunkedArray):
+                    array = array.combine_chunks()
+                arrays.append(array)
+        if self.schema is None:
+            self.schema = pa.schema([pa.field(name, arr.type) for name, arr in zip(df.columns, arrays)])
+            self._writer = self._open_writer()
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def write(self, df):
+        batch = self._to_batch(df)
+        self._write_batch(batch)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetSink(_ArrowSink):
+    """Writes one Parquet row group per chunk"""
+
+    def _open_writer(self):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.path, self.schema, use_dictionary=list(self.categorical) or False)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+
+class ArrowSink(_ArrowSink):
+    """Writes one Arrow IPC record batch per chunk"""
+
+    def _open_writer(self):
+        import pyarrow.ipc as ipc
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        return ipc.new_file(self.path, self.schema, options=options)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+
+SINKS = {
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+    'arrow': ArrowSink,
+}
+
+
+def open_sink(path, fmt=None, categorical=CATEGORICAL_COLUMNS):
+    """Open a sink for path; the format is taken from the extension unless given"""
+    fmt = fmt or format_from_path(path)
+    if fmt == 'csv':
+        return CsvSink(path)
+    return SINKS[fmt](path, categorical=categorical)
+
+
+def write_table(df, path, fmt=None, categorical=CATEGORICAL_COLUMNS):
+    """Write a whole DataFrame through a sink"""
+    with open_sink(path, fmt, categorical) as sink:
+        sink.write(df)
+    return path
+
+
+def find_dataset(stem):
+    """
+    Return the newest existing file among stem.parquet, stem.arrow and
+    stem.csv, so a reader always picks up the latest generator run
+    """
+    candidates = [stem + ext for ext in FORMAT_EXTENSIONS.values() if os.path.exists(stem + ext)]
+    if not candidates:
+        raise FileNotFoundError(f"No {stem}.csv/.parquet/.arrow found - run the generator first")
+    return max(candidates, key=os.path.getmtime)
+
+
+def read_table(path, columns=None):
+    """
+    Load a CSV, Parquet or Arrow file into a DataFrame. Dictionary-encoded
+    columns come back as categoricals with sorted categories, so groupby
+    output keeps the same order as it had with plain strings.
+    """
+    fmt = format_from_path(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, usecols=columns)
+
+    _require_pyarrow()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns)
+    else:
+        import pyarrow.ipc as ipc
+        with ipc.open_file(path) as reader:
+            table = reader.read_all()
+        if columns is not None:
+            table = table.select(columns)
+
+    df = table.to_pandas()
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].cat.set_categories(sorted(df[name].cat.categories))
+    return df
@@ -0,0 +1,99 @@
+"""
+Workbook Reader
+Streams one Excel sheet into a DataFrame and caches it as Feather against the workbook's contents
+"""
+
+import numbers
+from datetime import date
+from itertools import zip_longest
+
+import pandas as pd
+
+from common.cache import AnalysisCache
+
+# Bump when the sheet conversion changes so older cache entries are ignored
+SHEET_VERSION = 1
+
+
+def iter_sheet_rows(path, sheet):
+    """
+    Cell values of one sheet, one tuple per row. The workbook is opened
+    read-only, so rows are parsed from the sheet's XML as they are
+    consumed and the other sheets are never loaded.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook[sheet].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def header_names(header, width):
+    """Column names as pandas.read_excel gives them: 'Unnamed: i' for blanks, '.1', '.2' on repeats"""
+    names = []
+    seen = {}
+    for i in range(width):
+        value = header[i] if i < len(header) else None
+        name = f'Unnamed: {i}' if value is None or str(value).strip() == '' else str(value)
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(f'{name}.{count}' if count else name)
+    return names
+
+
+def _column(values):
+    """
+    One sheet column as a Series Arrow can store: numbers, dates or
+    booleans when every cell agrees, otherwise text (None stays missing)
+    """
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return pd.Series(values, dtype='boolean')
+    if all(isinstance(value, numbers.Number) and not isinstance(value, bool) for value in present):
+        return pd.to_numeric(pd.Series(values, dtype=object))
+    if all(isinstance(value, date) for value in present):
+        return pd.to_datetime(pd.Series(values, dtype=object))
+    return pd.Series([None if value is None else str(value) for value in values])
+
+
+def convert_sheet(path, sheet):
+    """
+    Whole sheet as a DataFrame with the first row as the header; trailing
+    blank rows are dropped. Cells go straight into one list per column as
+    rows stream in, so the rows themselves are never held.
+    """
+    rows = iter_sheet_rows(path, sheet)
+    header = next(rows, ())
+    columns = [[] for _ in header]
+    count = last = 0
+    for row in rows:
+        for _ in range(len(columns), len(row)):
+            columns.append([None] * count)
+        for values, value in zip_longest(columns, row):
+            values.append(value)
+        count += 1
+        if any(value is not None for value in row):
+            last = count
+
+    data = {}
+    for name in header_names(header, len(columns)):
+        values = columns.pop(0)
+        del values[last:]
+        data[name] = _column(values)
+    return pd.DataFrame(data)
+
+
+def read_sheet(path, sheet, columns=None, cache=None):
+    """
+    Sheet of the workbook at path as a DataFrame, like
+    pd.read_excel(path, sheet_name=sheet, usecols=columns), with columns
+    given by name or position. The sheet is converted once and cached
+    as Feather for the workbook's current contents; later calls read
+    only the requested columns back from the cache.
+    """
+    cache = cache or AnalysisCache()
+    return cache.get_or_compute(path, ['sheet', SHEET_VERSION, sheet],
+                                lambda: convert_sheet(path, sheet), columns)
+